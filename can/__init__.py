@@ -23,6 +23,7 @@ __all__ = [
     "Bus",
     "BusABC",
     "BusState",
+    "BusStatistics",
     "CSVReader",
     "CSVWriter",
     "CanError",
@@ -34,6 +35,8 @@ __all__ = [
     "CanutilsLogReader",
     "CanutilsLogWriter",
     "CyclicSendTaskABC",
+    "FrameArray",
+    "FrameFlags",
     "LimitedDurationCyclicSendTaskABC",
     "Listener",
     "LogReader",
@@ -42,11 +45,13 @@ __all__ = [
     "MF4Writer",
     "Message",
     "MessageSync",
+    "MessageTable",
     "ModifiableCyclicTaskABC",
     "Notifier",
     "Printer",
     "RedirectReader",
     "RestartableCyclicTaskABC",
+    "RingBufferListener",
     "SizedRotatingLogger",
     "SqliteReader",
     "SqliteWriter",
@@ -57,9 +62,12 @@ __all__ = [
     "bit_timing",
     "broadcastmanager",
     "bus",
+    "bus_statistics",
     "ctypesutil",
     "detect_available_configs",
     "exceptions",
+    "filters",
+    "frame_array",
     "interface",
     "interfaces",
     "io",
@@ -68,8 +76,10 @@ __all__ = [
     "logconvert",
     "logger",
     "message",
+    "message_table",
     "notifier",
     "player",
+    "ring_buffer",
     "set_logging_level",
     "thread_safe_bus",
     "typechecking",
@@ -79,7 +89,7 @@ __all__ = [
 
 from . import typechecking  # isort:skip
 from . import util  # isort:skip
-from . import broadcastmanager, interface
+from . import broadcastmanager, filters, frame_array, interface
 from .bit_timing import BitTiming, BitTimingFd
 from .broadcastmanager import (
     CyclicSendTaskABC,
@@ -88,6 +98,7 @@ from .broadcastmanager import (
     RestartableCyclicTaskABC,
 )
 from .bus import BusABC, BusState, CanProtocol
+from .bus_statistics import BusStatistics
 from .exceptions import (
     CanError,
     CanInitializationError,
@@ -95,6 +106,7 @@ from .exceptions import (
     CanOperationError,
     CanTimeoutError,
 )
+from .frame_array import FrameArray, FrameFlags
 from .interface import Bus, detect_available_configs
 from .interfaces import VALID_INTERFACES
 from .io import (
@@ -121,7 +133,9 @@ from .io import (
 )
 from .listener import AsyncBufferedReader, BufferedReader, Listener, RedirectReader
 from .message import Message
+from .message_table import MessageTable
 from .notifier import Notifier
+from .ring_buffer import RingBufferListener
 from .thread_safe_bus import ThreadSafeBus
 from .util import set_logging_level
 
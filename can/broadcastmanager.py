@@ -6,6 +6,10 @@ The main entry point to these classes should be through
 """
 
 import abc
+import asyncio
+import bisect
+import heapq
+import itertools
 import logging
 import platform
 import sys
@@ -83,6 +87,123 @@ if sys.platform == "win32" and sys.version_info < (3, 11):
         pass
 
 
+#: The default upper bin edges of the lateness histograms in seconds
+DEFAULT_LATENESS_BINS: Final = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+
+class CyclicTimingStats:
+    """Timing statistics of the messages sent by a cyclic task.
+
+    The statistics are recorded with every sent message by the task
+    implementations running in Python, which costs a few operations per
+    message. Tasks executed by the kernel or the hardware, like the
+    SocketCAN broadcast manager, do not report individual transmissions,
+    so their ``timing_stats`` are ``None``.
+
+    The values are not synchronized with the sending thread, so they may be
+    inconsistent with each other while the task is running.
+    """
+
+    __slots__ = (
+        "_last_send_time",
+        "_period_sum",
+        "_periods",
+        "count",
+        "lateness_bins",
+        "lateness_histogram",
+        "max_lateness",
+        "max_period",
+        "min_period",
+        "missed_deadlines",
+        "period",
+    )
+
+    def __init__(
+        self, period: float, lateness_bins: Sequence[float] = DEFAULT_LATENESS_BINS
+    ) -> None:
+        """
+        :param period: the nominal period of the task in seconds
+        :param lateness_bins:
+            The ascending upper bin edges of the lateness histogram in seconds.
+        """
+        #: The nominal period of the task in seconds
+        self.period = period
+        #: The upper bin edges of :attr:`lateness_histogram` in seconds
+        self.lateness_bins = tuple(lateness_bins)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        #: The number of sent messages
+        self.count = 0
+        #: The shortest time between two sent messages
+        self.min_period: float | None = None
+        #: The longest time between two sent messages
+        self.max_period: float | None = None
+        #: The number of messages per lateness bin, the last bin counting
+        #: all messages later than the last bin edge
+        self.lateness_histogram = [0] * (len(self.lateness_bins) + 1)
+        #: The largest delay of a message after its due time
+        self.max_lateness = 0.0
+        #: The number of messages which were sent after the following
+        #: message was already due
+        self.missed_deadlines = 0
+        self._period_sum = 0.0
+        self._periods = 0
+        self._last_send_time: float | None = None
+
+    @property
+    def mean_period(self) -> float | None:
+        """The average time between two sent messages."""
+        if not self._periods:
+            return None
+        return self._period_sum / self._periods
+
+    def restart(self) -> None:
+        """Start a new sequence of messages, such that the time since the
+        last message is not counted as a period, e.g. when the task is
+        restarted."""
+        self._last_send_time = None
+
+    def record(self, send_time: float, due_time: float | None = None) -> None:
+        """Record a sent message.
+
+        :param send_time: the time the message was sent in seconds
+        :param due_time:
+            The time the message should have been sent, using the same clock
+            as *send_time*, or ``None`` if it is not known.
+        """
+        last_send_time = self._last_send_time
+        self._last_send_time = send_time
+        self.count += 1
+        if last_send_time is not None:
+            period = send_time - last_send_time
+            self._period_sum += period
+            self._periods += 1
+            if self.min_period is None or period < self.min_period:
+                self.min_period = period
+            if self.max_period is None or period > self.max_period:
+                self.max_period = period
+
+        if due_time is not None:
+            lateness = send_time - due_time
+            self.lateness_histogram[
+                bisect.bisect_left(self.lateness_bins, lateness)
+            ] += 1
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+            if lateness > self.period:
+                self.missed_deadlines += 1
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(count={self.count}, "
+            f"mean_period={self.mean_period}, min_period={self.min_period}, "
+            f"max_period={self.max_period}, "
+            f"missed_deadlines={self.missed_deadlines})"
+        )
+
+
 class CyclicTask(abc.ABC):
     """
     Abstract Base for all cyclic tasks.
@@ -117,6 +238,10 @@ class CyclicSendTaskABC(CyclicTask, abc.ABC):
         self.period = period
         self.period_ns = round(period * 1e9)
         self.messages = messages
+        #: The timing of the sent messages, or ``None`` if the task is
+        #: executed by the kernel or the hardware, which do not report the
+        #: individual transmissions
+        self.timing_stats: CyclicTimingStats | None = None
 
     @staticmethod
     def _check_and_convert_messages(
@@ -263,6 +388,8 @@ class ThreadBasedCyclicSendTask(
 ):
     """Fallback cyclic send task using daemon thread."""
 
+    timing_stats: CyclicTimingStats
+
     def __init__(
         self,
         bus: "BusABC",
@@ -290,6 +417,7 @@ class ThreadBasedCyclicSendTask(
         :raises ValueError: If the given messages are invalid
         """
         super().__init__(messages, period, duration)
+        self.timing_stats = CyclicTimingStats(period)
         self.bus = bus
         self.send_lock = lock
         self.stopped = True
@@ -345,6 +473,7 @@ class ThreadBasedCyclicSendTask(
     def _run(self) -> None:
         msg_index = 0
         msg_due_time_ns = time.perf_counter_ns()
+        self.timing_stats.restart()
 
         if self.event and PYWIN32:
             # Make sure the timer is non-signaled before entering the loop
@@ -373,6 +502,11 @@ class ThreadBasedCyclicSendTask(
                 if not self.on_error(exc):
                     self.stop()
                     break
+            else:
+                self.timing_stats.record(
+                    time.perf_counter_ns() / NANOSECONDS_IN_SECOND,
+                    None if self.event else msg_due_time_ns / NANOSECONDS_IN_SECOND,
+                )
 
             if not self.event:
                 msg_due_time_ns += self.period_ns
@@ -386,3 +520,349 @@ class ThreadBasedCyclicSendTask(
                 delay_ns = msg_due_time_ns - time.perf_counter_ns()
                 if delay_ns > 0:
                     time.sleep(delay_ns / NANOSECONDS_IN_SECOND)
+
+
+class CyclicScheduler:
+    """A single thread sending the messages of many cyclic tasks.
+
+    Instead of a thread per task, the due times of all tasks of a scheduler
+    are kept in a heap. When the scheduler wakes up, all messages which are
+    due are sent together, using :meth:`~can.BusABC.send_batch` per bus.
+    This reduces the number of threads and wake-ups considerably when many
+    messages are sent periodically.
+
+    A scheduler can be shared by several buses, or be created per bus by
+    :meth:`~can.BusABC.send_periodic` with ``scheduler=True``::
+
+        scheduler = can.broadcastmanager.CyclicScheduler()
+        for msg in restbus_messages:
+            bus.send_periodic(msg, period=0.1, scheduler=scheduler)
+
+    The thread is started with the first task and runs until :meth:`stop`
+    is called.
+    """
+
+    def __init__(self, name: str = "Cyclic send scheduler") -> None:
+        """
+        :param name: the name of the scheduler thread
+        """
+        self.name = name
+        self._heap: list[tuple[int, int, int, ScheduledCyclicSendTask]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def _schedule(
+        self, task: "ScheduledCyclicSendTask", due_time_ns: int, generation: int
+    ) -> None:
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The scheduler has been stopped")
+            heapq.heappush(
+                self._heap, (due_time_ns, next(self._sequence), generation, task)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+            # wake up the thread if the task is due before all others
+            if self._heap[0][3] is task:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay_ns = self._heap[0][0] - time.perf_counter_ns()
+                    if delay_ns <= 0:
+                        break
+                    self._condition.wait(delay_ns / NANOSECONDS_IN_SECOND)
+                if self._stopped:
+                    return
+
+                now_ns = time.perf_counter_ns()
+                due: list[tuple[int, int, ScheduledCyclicSendTask]] = []
+                while self._heap and self._heap[0][0] <= now_ns:
+                    due_time_ns, _, generation, task = heapq.heappop(self._heap)
+                    due.append((due_time_ns, generation, task))
+
+            self._send_due(due)
+
+    def _send_due(self, due: list[tuple[int, int, "ScheduledCyclicSendTask"]]) -> None:
+        # collect the messages per bus, keeping the order of their due times
+        batches: dict[int, list[tuple[ScheduledCyclicSendTask, Message, int]]] = {}
+        for due_time_ns, generation, task in due:
+            msg = task._next_message(generation)  # pylint: disable=protected-access
+            if msg is None:
+                continue
+            batches.setdefault(id(task.bus), []).append((task, msg, due_time_ns))
+            next_due_time_ns = due_time_ns + task.period_ns
+            with self._condition:
+                scheduler_stopped = self._stopped
+                if not scheduler_stopped:
+                    heapq.heappush(
+                        self._heap,
+                        (next_due_time_ns, next(self._sequence), generation, task),
+                    )
+            if scheduler_stopped:
+                task.stop()
+
+        for batch in batches.values():
+            bus = batch[0][0].bus
+            with batch[0][0].send_lock:
+                try:
+                    sent = bus.send_batch([msg for _, msg, _ in batch])
+                except Exception:  # pylint: disable=broad-except
+                    sent = 0
+                send_time = time.perf_counter_ns() / NANOSECONDS_IN_SECOND
+                for task, _, due_time_ns in batch[:sent]:
+                    task.timing_stats.record(
+                        send_time, due_time_ns / NANOSECONDS_IN_SECOND
+                    )
+                # send the remaining messages one by one to attribute the error
+                for task, msg, due_time_ns in batch[sent:]:
+                    try:
+                        bus.send(msg)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        task._handle_error(exc)  # pylint: disable=protected-access
+                    else:
+                        task.timing_stats.record(
+                            time.perf_counter_ns() / NANOSECONDS_IN_SECOND,
+                            due_time_ns / NANOSECONDS_IN_SECOND,
+                        )
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the scheduler thread. The tasks are not sent anymore and
+        are marked as stopped.
+
+        :param timeout: the maximum number of seconds to wait for the thread
+        """
+        with self._condition:
+            self._stopped = True
+            tasks = {id(task): task for _, _, _, task in self._heap}
+            self._heap.clear()
+            self._condition.notify()
+        for task in tasks.values():
+            task.stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+
+class ScheduledCyclicSendTask(
+    LimitedDurationCyclicSendTaskABC, ModifiableCyclicTaskABC, RestartableCyclicTaskABC
+):
+    """Cyclic send task run by a :class:`CyclicScheduler`.
+
+    This behaves like :class:`ThreadBasedCyclicSendTask`, but shares the
+    thread of the scheduler with other tasks. Errors never stop the
+    scheduler, a task without *on_error* callback is stopped instead.
+    """
+
+    timing_stats: CyclicTimingStats
+
+    def __init__(
+        self,
+        bus: "BusABC",
+        lock: threading.Lock,
+        messages: Sequence[Message] | Message,
+        period: float,
+        scheduler: CyclicScheduler,
+        duration: float | None = None,
+        on_error: Callable[[Exception], bool] | None = None,
+        autostart: bool = True,
+        modifier_callback: Callable[[Message], None] | None = None,
+    ) -> None:
+        """Transmits `messages` with a `period` seconds for `duration` seconds
+        on a `bus` using the thread of `scheduler`.
+
+        :param on_error:
+            The callable that accepts an exception if any error happened on
+            `bus` while sending `messages`. The task is stopped if it
+            returns ``False``.
+
+        :raises ValueError: If the given messages are invalid
+        """
+        super().__init__(messages, period, duration)
+        if self.period_ns <= 0:
+            raise ValueError("The period must be positive")
+        self.timing_stats = CyclicTimingStats(period)
+        self.bus = bus
+        self.send_lock = lock
+        self.scheduler = scheduler
+        self.stopped = True
+        self.on_error = on_error
+        self.modifier_callback = modifier_callback
+        self._msg_index = 0
+        # distinguishes the entries of a restarted task in the scheduler
+        self._generation = 0
+
+        if autostart:
+            self.start()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def start(self) -> None:
+        if not self.stopped:
+            return
+        self.stopped = False
+        self._generation += 1
+        self._msg_index = 0
+        self.timing_stats.restart()
+        self.end_time = time.perf_counter() + self.duration if self.duration else None
+        try:
+            self.scheduler._schedule(  # pylint: disable=protected-access
+                self, time.perf_counter_ns(), self._generation
+            )
+        except RuntimeError:
+            self.stopped = True
+            raise
+
+    def _next_message(self, generation: int) -> Message | None:
+        """Return the message to send now or ``None`` if the task ended."""
+        if self.stopped or generation != self._generation:
+            return None
+        if self.end_time is not None and time.perf_counter() >= self.end_time:
+            self.stop()
+            return None
+
+        msg = self.messages[self._msg_index]
+        self._msg_index = (self._msg_index + 1) % len(self.messages)
+        if self.modifier_callback is not None:
+            try:
+                self.modifier_callback(msg)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._handle_error(exc)
+                return None
+        return msg
+
+    def _handle_error(self, exc: Exception) -> None:
+        log.exception(exc)
+        # stop if `on_error` callback was not given or returns False
+        try:
+            handled = self.on_error is not None and self.on_error(exc)
+        except Exception:  # pylint: disable=broad-except
+            # never let the callback stop the scheduler and the other tasks
+            log.exception("The on_error callback of %r failed", self)
+            handled = False
+        if not handled:
+            self.stop()
+
+
+class AsyncCyclicSendTask(
+    LimitedDurationCyclicSendTaskABC, ModifiableCyclicTaskABC, RestartableCyclicTaskABC
+):
+    """Cyclic send task run by an :mod:`asyncio` event loop.
+
+    The messages are sent by callbacks scheduled with
+    :meth:`~asyncio.loop.call_at`, so that many tasks share the thread of the
+    event loop. The due times are advanced by the period from the start
+    of the task, such that the time spent for sending does not accumulate.
+
+    The messages are sent from the thread of the event loop without
+    acquiring the send lock of the bus.
+    """
+
+    timing_stats: CyclicTimingStats
+
+    def __init__(
+        self,
+        bus: "BusABC",
+        messages: Sequence[Message] | Message,
+        period: float,
+        loop: asyncio.AbstractEventLoop,
+        duration: float | None = None,
+        on_error: Callable[[Exception], bool] | None = None,
+        autostart: bool = True,
+        modifier_callback: Callable[[Message], None] | None = None,
+    ) -> None:
+        """Transmits `messages` with a `period` seconds for `duration` seconds
+        on a `bus` using the event loop `loop`.
+
+        :param on_error:
+            The callable that accepts an exception if any error happened on
+            `bus` while sending `messages`. The task is stopped if it
+            returns ``False`` or is not given.
+
+        :raises ValueError: If the given messages are invalid
+        """
+        super().__init__(messages, period, duration)
+        if period <= 0:
+            raise ValueError("The period must be positive")
+        self.timing_stats = CyclicTimingStats(period)
+        self.bus = bus
+        self.loop = loop
+        self.stopped = True
+        self.on_error = on_error
+        self.modifier_callback = modifier_callback
+        self._msg_index = 0
+        self._due_time = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+
+        if autostart:
+            self.start()
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def stop(self) -> None:
+        self.stopped = True
+        if self._handle is not None:
+            if self._in_loop():
+                self._handle.cancel()
+            else:
+                self.loop.call_soon_threadsafe(self._handle.cancel)
+
+    def start(self) -> None:
+        if not self.stopped:
+            return
+        self.stopped = False
+        self._msg_index = 0
+        if self._in_loop():
+            self._start()
+        else:
+            self.loop.call_soon_threadsafe(self._start)
+
+    def _start(self) -> None:
+        if self.stopped:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._due_time = self.loop.time()
+        self.end_time = self._due_time + self.duration if self.duration else None
+        self.timing_stats.restart()
+        self._handle = self.loop.call_at(self._due_time, self._send)
+
+    def _send(self) -> None:
+        if self.stopped:
+            return
+        if self.end_time is not None and self.loop.time() >= self.end_time:
+            self.stop()
+            return
+
+        msg = self.messages[self._msg_index]
+        self._msg_index = (self._msg_index + 1) % len(self.messages)
+        try:
+            if self.modifier_callback is not None:
+                self.modifier_callback(msg)
+            self.bus.send(msg)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.exception(exc)
+            # stop if `on_error` callback was not given or returns False
+            if self.on_error is None or not self.on_error(exc):
+                self.stop()
+                return
+        else:
+            self.timing_stats.record(self.loop.time(), self._due_time)
+
+        if not self.stopped:
+            self._due_time += self.period
+            self._handle = self.loop.call_at(self._due_time, self._send)
@@ -2,11 +2,12 @@
 Contains the ABC bus implementation and its documentation.
 """
 
+import asyncio
 import contextlib
 import logging
 import threading
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from enum import Enum, auto
 from time import time
 from types import TracebackType
@@ -17,7 +18,16 @@ from typing import (
 from typing_extensions import Self
 
 import can.typechecking
-from can.broadcastmanager import CyclicSendTaskABC, ThreadBasedCyclicSendTask
+from can.broadcastmanager import (
+    AsyncCyclicSendTask,
+    CyclicScheduler,
+    CyclicSendTaskABC,
+    ModifiableCyclicTaskABC,
+    ScheduledCyclicSendTask,
+    ThreadBasedCyclicSendTask,
+)
+from can.exceptions import CanError
+from can.filters import reduce_filters
 from can.message import Message
 
 LOG = logging.getLogger(__name__)
@@ -61,6 +71,19 @@ class BusABC(ABC):
     _is_shutdown: bool = True
     _can_protocol: CanProtocol = CanProtocol.CAN_20
 
+    #: The maximum number of filters the kernel or hardware of an interface
+    #: can apply, or None if there is no such limit. Longer filter lists are
+    #: reduced by :func:`can.filters.reduce_filters` before being passed
+    #: to :meth:`~can.BusABC._apply_filters`.
+    _max_hardware_filters: int | None = None
+
+    #: Whether the filters applied by the kernel or hardware only approximate
+    #: the filters of this bus, such that filtering in software is still needed
+    _filters_reduced: bool = False
+
+    #: The scheduler of this bus for ``send_periodic(..., scheduler=True)``
+    _cyclic_scheduler: CyclicScheduler | None = None
+
     @abstractmethod
     def __init__(
         self,
@@ -89,6 +112,9 @@ class BusABC(ABC):
             If the bus cannot be initialized
         """
         self._periodic_tasks: list[_SelfRemovingCyclicTask] = []
+        #: Counters of the messages accepted and rejected by the software
+        #: based filtering, see :meth:`~can.BusABC.set_filters`
+        self.filter_stats = FilterStats()
         self.set_filters(can_filters)
         # Flip the class default value when the constructor finishes.  That
         # usually means the derived class constructor was also successful,
@@ -118,7 +144,10 @@ class BusABC(ABC):
             msg, already_filtered = self._recv_internal(timeout=time_left)
 
             # return it, if it matches
-            if msg and (already_filtered or self._matches_filters(msg)):
+            if msg and (
+                (already_filtered and not self._filters_reduced)
+                or self._matches_filters(msg)
+            ):
                 LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
                 return msg
 
@@ -178,6 +207,113 @@ class BusABC(ABC):
         """
         raise NotImplementedError("Trying to read from a write only bus?")
 
+    def recv_batch(
+        self, max_messages: int = 100, timeout: float | None = None
+    ) -> list[Message]:
+        """Block waiting for messages from the Bus and return all that are available.
+
+        This behaves like :meth:`~can.BusABC.recv`, but instead of a single
+        message it returns every message that is already available (up to
+        *max_messages*) once the first one has arrived. Use this to reduce the
+        per-message call overhead on busy buses.
+
+        :param max_messages:
+            the maximum number of messages to return
+        :param timeout:
+            seconds to wait for the first message or None to wait indefinitely
+
+        :return:
+            A (possibly empty) list of :class:`~can.Message` objects. An empty
+            list is returned on timeout.
+
+        :raises ValueError:
+            If *max_messages* is smaller than one
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading
+        """
+        if max_messages < 1:
+            raise ValueError("max_messages must be at least 1")
+
+        start = time()
+        time_left = timeout
+
+        while True:
+            # try to get some messages
+            msgs, already_filtered = self._recv_internal_batch(
+                max_messages=max_messages, timeout=time_left
+            )
+
+            if msgs and (not already_filtered or self._filters_reduced):
+                msgs = [msg for msg in msgs if self._matches_filters(msg)]
+
+            # return them, if any of them matched
+            if msgs:
+                if LOG.isEnabledFor(self.RECV_LOGGING_LEVEL):
+                    for msg in msgs:
+                        LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
+                return msgs
+
+            # if not, and timeout is None, try indefinitely
+            elif timeout is None:
+                continue
+
+            # try again only if there still is time, and with
+            # reduced timeout
+            else:
+                time_left = timeout - (time() - start)
+
+                if time_left > 0:
+                    continue
+
+                return []
+
+    def _recv_internal_batch(
+        self, max_messages: int, timeout: float | None
+    ) -> tuple[list[Message], bool]:
+        """
+        Read all available messages from the bus (up to *max_messages*) and
+        tell whether they were filtered. This method is called by
+        :meth:`~can.BusABC.recv_batch`.
+
+        The default implementation waits up to *timeout* seconds for a first
+        message using :meth:`~can.BusABC._recv_internal` and then keeps
+        calling it with a timeout of zero until no more messages are available
+        or *max_messages* messages were read, including the ones rejected by
+        the filters.
+        Interfaces which buffer received messages internally or are able to
+        read multiple messages at once should override this method.
+
+        :param max_messages:
+            the maximum number of messages to read
+        :param timeout:
+            seconds to wait for the first message, see :meth:`~can.BusABC.recv`
+
+        :return:
+            1.  a list of the messages that were read, which is empty on timeout
+            2.  a bool that is True if message filtering has already
+                been done for all of them and else False
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading
+        """
+        msgs: list[Message] = []
+        msg, already_filtered = self._recv_internal(timeout=timeout)
+        read = 1
+
+        while msg is not None:
+            # the filtering state may change between calls, so unify it here
+            if (
+                already_filtered and not self._filters_reduced
+            ) or self._matches_filters(msg):
+                msgs.append(msg)
+            # count the rejected messages as well to not spin on a busy bus
+            if read >= max_messages:
+                break
+            msg, already_filtered = self._recv_internal(timeout=0.0)
+            read += 1
+
+        return msgs, True
+
     @abstractmethod
     def send(self, msg: Message, timeout: float | None = None) -> None:
         """Transmit a message to the CAN bus.
@@ -198,6 +334,48 @@ class BusABC(ABC):
         """
         raise NotImplementedError("Trying to write to a readonly bus?")
 
+    def send_batch(self, msgs: Sequence[Message], timeout: float | None = None) -> int:
+        """Transmit multiple messages to the CAN bus, preserving their order.
+
+        The default implementation calls :meth:`~can.BusABC.send` for every
+        message. Interfaces which are able to submit several messages at once
+        override this method to reduce the per-message overhead.
+
+        :param msgs: The messages to transmit.
+
+        :param timeout:
+            The time in seconds to wait for the whole batch, with the same
+            meaning as for :meth:`~can.BusABC.send`. None blocks indefinitely.
+
+        :return:
+            The number of messages that were accepted for transmission. Like with
+            :manpage:`sendmmsg(2)`, this may be less than ``len(msgs)`` if an
+            error occurred after the first message was accepted. The caller
+            may then retry with the remaining messages.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred before the first message could be sent
+        """
+        start = time()
+        sent = 0
+
+        for msg in msgs:
+            if timeout is None:
+                time_left = None
+            else:
+                time_left = max(0.0, timeout - (time() - start))
+
+            try:
+                self.send(msg, timeout=time_left)
+            except CanError:
+                if sent == 0:
+                    raise
+                LOG.debug("Stopped batch transmission after %d messages", sent)
+                break
+            sent += 1
+
+        return sent
+
     def send_periodic(
         self,
         msgs: Message | Sequence[Message],
@@ -206,6 +384,8 @@ class BusABC(ABC):
         store_task: bool = True,
         autostart: bool = True,
         modifier_callback: Callable[[Message], None] | None = None,
+        scheduler: CyclicScheduler | bool = False,
+        loop: asyncio.AbstractEventLoop | None = None,
     ) -> can.broadcastmanager.CyclicSendTaskABC:
         """Start sending messages at a given period on this bus.
 
@@ -235,6 +415,17 @@ class BusABC(ABC):
             Function which should be used to modify each message's data before
             sending. The callback modifies the :attr:`~can.Message.data` of the
             message and returns ``None``.
+        :param scheduler:
+            Send the messages using the thread of a
+            :class:`~can.broadcastmanager.CyclicScheduler` instead of a
+            thread per task or the periodic sending of the backend. Either
+            the scheduler to use, which may be shared by several buses, or
+            ``True`` to use a scheduler created for this bus.
+        :param loop:
+            Send the messages from callbacks of this :mod:`asyncio` event loop
+            using an :class:`~can.broadcastmanager.AsyncCyclicSendTask`
+            instead of a thread per task or the periodic sending of the
+            backend.
         :return:
             A started task instance. Note the task can be stopped (and depending on
             the backend modified) by calling the task's
@@ -263,13 +454,37 @@ class BusABC(ABC):
         else:
             raise ValueError("Must be either a message or a sequence of messages")
 
+        if scheduler is not False and loop is not None:
+            raise ValueError("Only one of scheduler and loop can be given")
+
         # Create a backend specific task; will be patched to a _SelfRemovingCyclicTask later
-        task = cast(
-            "_SelfRemovingCyclicTask",
-            self._send_periodic_internal(
-                msgs, period, duration, autostart, modifier_callback
-            ),
-        )
+        if loop is not None:
+            task = cast(
+                "_SelfRemovingCyclicTask",
+                AsyncCyclicSendTask(
+                    bus=self,
+                    messages=msgs,
+                    period=period,
+                    loop=loop,
+                    duration=duration,
+                    autostart=autostart,
+                    modifier_callback=modifier_callback,
+                ),
+            )
+        elif scheduler is not False:
+            task = cast(
+                "_SelfRemovingCyclicTask",
+                self._send_periodic_scheduled(
+                    msgs, period, scheduler, duration, autostart, modifier_callback
+                ),
+            )
+        else:
+            task = cast(
+                "_SelfRemovingCyclicTask",
+                self._send_periodic_internal(
+                    msgs, period, duration, autostart, modifier_callback
+                ),
+            )
         # we wrap the task's stop method to also remove it from the Bus's list of tasks
         periodic_tasks = self._periodic_tasks
         original_stop_method = task.stop
@@ -334,6 +549,66 @@ class BusABC(ABC):
         )
         return task
 
+    def _send_periodic_scheduled(
+        self,
+        msgs: Sequence[Message],
+        period: float,
+        scheduler: CyclicScheduler | bool,
+        duration: float | None,
+        autostart: bool,
+        modifier_callback: Callable[[Message], None] | None,
+    ) -> can.broadcastmanager.CyclicSendTaskABC:
+        """Create a task run by a :class:`~can.broadcastmanager.CyclicScheduler`."""
+        if not isinstance(scheduler, CyclicScheduler):
+            if self._cyclic_scheduler is None:
+                self._cyclic_scheduler = CyclicScheduler(
+                    name=f"Cyclic send scheduler for {self.channel_info}"
+                )
+            scheduler = self._cyclic_scheduler
+        if not hasattr(self, "_lock_send_periodic"):
+            self._lock_send_periodic = (  # pylint: disable=attribute-defined-outside-init
+                threading.Lock()
+            )
+        return ScheduledCyclicSendTask(
+            bus=self,
+            lock=self._lock_send_periodic,
+            messages=msgs,
+            period=period,
+            scheduler=scheduler,
+            duration=duration,
+            autostart=autostart,
+            modifier_callback=modifier_callback,
+        )
+
+    def modify_periodic_tasks(
+        self, updates: Mapping[ModifiableCyclicTaskABC, Message | Sequence[Message]]
+    ) -> dict[ModifiableCyclicTaskABC, Exception]:
+        """Update the contents of several periodic tasks at once.
+
+        The default implementation calls
+        :meth:`~can.broadcastmanager.ModifiableCyclicTaskABC.modify_data` for
+        every task. Interfaces which are able to submit several updates at
+        once override this method to reduce the per-task overhead.
+
+        An invalid update only affects its own task, all other tasks are
+        still updated.
+
+        :param updates:
+            The new messages of each task, with the same constraints as for
+            :meth:`~can.broadcastmanager.ModifiableCyclicTaskABC.modify_data`.
+
+        :return:
+            The exception of each task which could not be updated. The
+            mapping is empty if all tasks were updated.
+        """
+        errors: dict[ModifiableCyclicTaskABC, Exception] = {}
+        for task, messages in updates.items():
+            try:
+                task.modify_data(messages)
+            except (CanError, TypeError, ValueError) as error:
+                errors[task] = error
+        return errors
+
     def stop_all_periodic_tasks(self, remove_tasks: bool = True) -> None:
         """Stop sending any messages that were started using :meth:`send_periodic`.
 
@@ -405,10 +680,37 @@ class BusABC(ABC):
             If ``extended`` is set as well, it only matches messages where
             ``<received_is_extended> == extended``. Else it matches every
             messages based only on the arbitration ID and mask.
+
+        If the filtering has to be done in software, the filters are compiled
+        into lookup tables once: all filters sharing the same mask are merged
+        into a single set of identifiers, so a message is checked with one
+        hash lookup per distinct mask instead of one comparison per filter.
+        The number of accepted and rejected messages is counted in
+        :attr:`filter_stats`.
+
+        If the interface supports fewer kernel or hardware filters than given,
+        they are reduced to a covering set with :func:`can.filters.reduce_filters`.
+        Most unwanted messages are then still dropped before reaching Python,
+        while the few false positives are removed in software.
         """
         self._filters = filters or None
+        self._compiled_filters = (
+            _compile_filters(self._filters) if self._filters is not None else ((), ())
+        )
+
+        hardware_filters = self._filters
+        self._filters_reduced = False
+        if (
+            self._filters is not None
+            and self._max_hardware_filters is not None
+            and len(self._filters) > self._max_hardware_filters
+        ):
+            reduced = reduce_filters(self._filters, self._max_hardware_filters)
+            hardware_filters = reduced.hardware
+            self._filters_reduced = reduced.software is not None
+
         with contextlib.suppress(NotImplementedError):
-            self._apply_filters(self._filters)
+            self._apply_filters(hardware_filters)
 
     def _apply_filters(self, filters: can.typechecking.CanFilters | None) -> None:
         """
@@ -436,23 +738,17 @@ class BusABC(ABC):
         if self._filters is None:
             return True
 
-        for _filter in self._filters:
-            # check if this filter even applies to the message
-            if "extended" in _filter:
-                if _filter["extended"] != msg.is_extended_id:
-                    continue
-
-            # then check for the mask and id
-            can_id = _filter["can_id"]
-            can_mask = _filter["can_mask"]
-
-            # basically, we compute
-            # `msg.arbitration_id & can_mask == can_id & can_mask`
-            # by using the shorter, but equivalent from below:
-            if (can_id ^ msg.arbitration_id) & can_mask == 0:
+        # only check the filters which apply to this kind of identifier;
+        # basically, we compute `msg.arbitration_id & can_mask == can_id & can_mask`
+        # for all filters with the same mask at once
+        arbitration_id = msg.arbitration_id
+        for can_mask, masked_can_ids in self._compiled_filters[msg.is_extended_id]:
+            if (arbitration_id & can_mask) in masked_can_ids:
+                self.filter_stats.accepted += 1
                 return True
 
         # nothing matched
+        self.filter_stats.rejected += 1
         return False
 
     def flush_tx_buffer(self) -> None:
@@ -471,6 +767,8 @@ class BusABC(ABC):
 
         self._is_shutdown = True
         self.stop_all_periodic_tasks()
+        if self._cyclic_scheduler is not None:
+            self._cyclic_scheduler.stop()
 
     def __enter__(self) -> Self:
         return self
@@ -532,6 +830,64 @@ class BusABC(ABC):
         raise NotImplementedError("fileno is not implemented using current CAN bus")
 
 
+class FilterStats:
+    """Counts the messages checked by the software based filtering of a bus.
+
+    Messages that were already filtered by the kernel or the hardware
+    are not counted, and neither are messages received while no filters
+    are set.
+    """
+
+    __slots__ = ("accepted", "rejected")
+
+    def __init__(self) -> None:
+        #: The number of messages that matched at least one filter
+        self.accepted = 0
+        #: The number of messages that were discarded
+        self.rejected = 0
+
+    def reset(self) -> None:
+        """Set all counters back to zero."""
+        self.accepted = 0
+        self.rejected = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(accepted={self.accepted}, rejected={self.rejected})"
+
+
+#: The compiled filters for standard and extended identifiers (in that order),
+#: each being a sequence of ``(can_mask, masked_can_ids)`` pairs
+_CompiledFilters = tuple[
+    tuple[tuple[int, frozenset[int]], ...], tuple[tuple[int, frozenset[int]], ...]
+]
+
+
+def _compile_filters(filters: can.typechecking.CanFilters) -> _CompiledFilters:
+    """Merge all filters with the same mask into a set of masked identifiers.
+
+    Filters without the ``extended`` key apply to both standard and extended
+    identifiers. The result is indexed by :attr:`~can.Message.is_extended_id`.
+    """
+    groups: tuple[dict[int, set[int]], dict[int, set[int]]] = ({}, {})
+    for _filter in filters:
+        can_mask = _filter["can_mask"]
+        masked_can_id = _filter["can_id"] & can_mask
+        if "extended" in _filter:
+            groups[bool(_filter["extended"])].setdefault(can_mask, set()).add(
+                masked_can_id
+            )
+        else:
+            for group in groups:
+                group.setdefault(can_mask, set()).add(masked_can_id)
+
+    def freeze(group: dict[int, set[int]]) -> tuple[tuple[int, frozenset[int]], ...]:
+        # check the masks covering the most identifiers first
+        by_size = sorted(group.items(), key=lambda item: len(item[1]), reverse=True)
+        return tuple((can_mask, frozenset(ids)) for can_mask, ids in by_size)
+
+    return freeze(groups[0]), freeze(groups[1])
+
+
 class _SelfRemovingCyclicTask(CyclicSendTaskABC, ABC):
     """Removes itself from a bus.
 
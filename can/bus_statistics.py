@@ -0,0 +1,503 @@
+"""
+This module contains the implementation of :class:`~can.BusStatistics`, a
+listener estimating the bus load and the timing of the received arbitration
+IDs from the on-wire length of the frames.
+"""
+
+import bisect
+import functools
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+from .bit_timing import BitTiming, BitTimingFd
+from .listener import Listener
+from .message import Message
+from .util import len2dlc
+
+#: The default upper bin edges of the period histograms in seconds
+DEFAULT_PERIOD_BINS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+)
+
+#: The default upper bin edges of the jitter histograms in seconds
+DEFAULT_JITTER_BINS = (-0.01, -0.001, -0.0001, -0.00001, 0.00001, 0.0001, 0.001, 0.01)
+
+# CRC delimiter, ACK slot, ACK delimiter, end of frame and interframe space
+_FRAME_TAIL_BITS = 1 + 1 + 1 + 7 + 3
+# error flag, error delimiter and interframe space
+_ERROR_FRAME_BITS = 6 + 8 + 3
+_CRC15_POLYNOMIAL = 0x4599
+_MAX_CLASSIC_DATA_LENGTH = 8
+# the length of the stuff count and CRC sequence of CAN FD frames including
+# the fixed stuff bits, for payloads of up to 16 and more than 16 bytes
+_FD_CRC_FIELD_BITS = (4 + 17 + 6, 4 + 21 + 7)
+# the number of outdated frames of the window history to remove at once
+_COMPACT_THRESHOLD = 4096
+
+
+def _crc15_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 7
+        for _ in range(8):
+            crc = (crc << 1) ^ _CRC15_POLYNOMIAL if crc & 0x4000 else crc << 1
+        table.append(crc & 0x7FFF)
+    return table
+
+
+def _stuff_step(state: int, bit: int) -> tuple[int, int]:
+    """Advance the bit stuffing by a single bit.
+
+    The state encodes the value of the preceding bit and the number of
+    preceding bits with this value as ``5 * value + count``. A stuff bit of
+    the opposite value is inserted after five consecutive bits of the same
+    value and counts as the first bit of the next run.
+
+    :return: the number of inserted stuff bits and the new state
+    """
+    last, run = divmod(state, 5)
+    if run and last == bit:
+        run += 1
+    else:
+        last, run = bit, 1
+    if run == 5:
+        return 1, 5 * (1 - bit) + 1
+    return 0, 5 * last + run
+
+
+def _stuff_table() -> list[tuple[int, int]]:
+    """The stuff bits and the new state per state and byte."""
+    table = []
+    for state in range(10):
+        for byte in range(256):
+            count, new_state = 0, state
+            for shift in range(7, -1, -1):
+                stuffed, new_state = _stuff_step(new_state, (byte >> shift) & 1)
+                count += stuffed
+            table.append((count, new_state))
+    return table
+
+
+_CRC15_TABLE = _crc15_table()
+_STUFF_TABLE = _stuff_table()
+
+
+def _crc15(value: int, length: int) -> int:
+    """The CRC sequence of the *length* bits of *value* in classical frames."""
+    crc = 0
+    # the leading bits which do not fill a byte are processed one by one
+    head = length % 8
+    for shift in range(length - 1, length - head - 1, -1):
+        feedback = ((value >> shift) & 1) ^ (crc >> 14)
+        crc = (crc << 1) & 0x7FFF
+        if feedback:
+            crc ^= _CRC15_POLYNOMIAL
+    body = length - head
+    for byte in (value & ((1 << body) - 1)).to_bytes(body // 8, "big"):
+        crc = ((crc << 8) & 0x7FFF) ^ _CRC15_TABLE[((crc >> 7) ^ byte) & 0xFF]
+    return crc
+
+
+def _stuff_bits(value: int, length: int, state: int = 0) -> tuple[int, int]:
+    """Count the stuff bits which are inserted into the *length* bits of
+    *value*, see :func:`_stuff_step`.
+
+    :return: the number of stuff bits and the state after the bits
+    """
+    count = 0
+    head = length % 8
+    for shift in range(length - 1, length - head - 1, -1):
+        stuffed, state = _stuff_step(state, (value >> shift) & 1)
+        count += stuffed
+    body = length - head
+    for byte in (value & ((1 << body) - 1)).to_bytes(body // 8, "big"):
+        stuffed, state = _STUFF_TABLE[256 * state + byte]
+        count += stuffed
+    return count, state
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_bit_length(
+    arbitration_id: int,
+    is_extended_id: bool,
+    is_remote_frame: bool,
+    is_fd: bool,
+    bitrate_switch: bool,
+    error_state_indicator: bool,
+    dlc: int,
+    data: bytes,
+) -> tuple[int, int]:
+    # the bits are collected MSB first in an integer starting with SOF
+    if is_extended_id:
+        # base identifier, SRR, IDE and identifier extension
+        value = (((arbitration_id >> 18) & 0x7FF) << 20) | (0b11 << 18)
+        value |= arbitration_id & 0x3FFFF
+        length = 1 + 31
+    else:
+        value = arbitration_id & 0x7FF
+        length = 1 + 11
+
+    if not is_fd:
+        # RTR, IDE and r0 or r1 and r0 followed by the DLC
+        value = (value << 7) | (int(is_remote_frame) << 6) | (dlc & 0xF)
+        value = (value << 8 * len(data)) | int.from_bytes(data, "big")
+        length += 7 + 8 * len(data)
+        value = (value << 15) | _crc15(value, length)
+        length += 15
+        return length + _stuff_bits(value, length)[0] + _FRAME_TAIL_BITS, 0
+
+    # RRS, IDE for standard frames, FDF and res
+    if is_extended_id:
+        value, length = (value << 3) | 0b010, length + 3
+    else:
+        value, length = (value << 4) | 0b0010, length + 4
+    arbitration_stuff_bits, state = _stuff_bits(value, length)
+
+    # BRS, ESI, DLC and data, where the stuff bits following the BRS bit
+    # belong to the data phase
+    data_bits = 6 + 8 * len(data)
+    value = (
+        (int(bitrate_switch) << 5) | (int(error_state_indicator) << 4) | len2dlc(dlc)
+    )
+    value = (value << 8 * len(data)) | int.from_bytes(data, "big")
+    data_stuff_bits = _stuff_bits(value, data_bits, state)[0]
+
+    arbitration_bits = length + 1 + arbitration_stuff_bits
+    data_bits += data_stuff_bits + _FD_CRC_FIELD_BITS[len(data) > 16] - 1
+    if not bitrate_switch:
+        return arbitration_bits + data_bits + _FRAME_TAIL_BITS, 0
+    return arbitration_bits + _FRAME_TAIL_BITS, data_bits
+
+
+def frame_bit_length(msg: Message) -> tuple[int, int]:
+    """Calculate the number of bits a frame occupies on the bus.
+
+    This includes the stuff bits, the CRC, the acknowledge and end of frame
+    fields and the interframe space. The stuff bits of classical frames
+    depend on the CRC, which is calculated for this purpose.
+
+    Error frames are counted with the minimal length of an error flag, the
+    error delimiter and the interframe space.
+
+    :param msg: the frame to measure
+    :return:
+        The number of bits transmitted with the nominal bitrate and the
+        number of bits transmitted with the data bitrate. The latter is
+        only nonzero for CAN FD frames with the bitrate switch set.
+    """
+    if msg.is_error_frame:
+        return _ERROR_FRAME_BITS, 0
+    if msg.is_fd:
+        data = bytes(msg.data)
+    elif msg.is_remote_frame:
+        data = b""
+    else:
+        data = bytes(msg.data[:_MAX_CLASSIC_DATA_LENGTH])
+    return _frame_bit_length(
+        msg.arbitration_id,
+        msg.is_extended_id,
+        msg.is_remote_frame and not msg.is_fd,
+        msg.is_fd,
+        msg.is_fd and msg.bitrate_switch,
+        msg.is_fd and msg.error_state_indicator,
+        msg.dlc,
+        data,
+    )
+
+
+class IdStatistics(NamedTuple):
+    """The timing of a single arbitration ID in a
+    :class:`~can.bus_statistics.BusStatisticsSnapshot`.
+
+    The histograms contain one more bin than the corresponding bin edges of
+    the :class:`~can.BusStatistics`, the last one counting all larger values.
+    """
+
+    #: The number of received frames
+    frame_count: int
+    #: The average time between two frames or ``None`` for a single frame
+    mean_period: float | None
+    #: The shortest time between two frames or ``None`` for a single frame
+    min_period: float | None
+    #: The longest time between two frames or ``None`` for a single frame
+    max_period: float | None
+    #: The number of periods per bin
+    period_histogram: tuple[int, ...]
+    #: The number of deviations from the average period per bin
+    jitter_histogram: tuple[int, ...]
+
+
+class BusStatisticsSnapshot(NamedTuple):
+    """The state of a :class:`~can.BusStatistics` at a certain time."""
+
+    #: The timestamp of the latest frame
+    timestamp: float
+    #: The number of received frames
+    frame_count: int
+    #: The fraction of time the bus was occupied, per window length
+    bus_load: dict[float, float]
+    #: The frames per second, per window length
+    frame_rate: dict[float, float]
+    #: The timing per arbitration ID
+    ids: dict[int, IdStatistics]
+
+
+class _IdTiming:
+    __slots__ = (
+        "count",
+        "jitter_histogram",
+        "last_timestamp",
+        "max_period",
+        "min_period",
+        "period_histogram",
+        "period_sum",
+    )
+
+    def __init__(self, timestamp: float, period_bins: int, jitter_bins: int) -> None:
+        self.count = 1
+        self.last_timestamp = timestamp
+        self.period_sum = 0.0
+        self.min_period = float("inf")
+        self.max_period = float("-inf")
+        self.period_histogram = [0] * (period_bins + 1)
+        self.jitter_histogram = [0] * (jitter_bins + 1)
+
+    def statistics(self) -> IdStatistics:
+        periods = self.count - 1
+        return IdStatistics(
+            frame_count=self.count,
+            mean_period=self.period_sum / periods if periods else None,
+            min_period=self.min_period if periods else None,
+            max_period=self.max_period if periods else None,
+            period_histogram=tuple(self.period_histogram),
+            jitter_histogram=tuple(self.jitter_histogram),
+        )
+
+
+class _Window:
+    __slots__ = ("frames", "length", "seconds", "start")
+
+    def __init__(self, length: float) -> None:
+        self.length = length
+        self.start = 0
+        self.frames = 0
+        self.seconds = 0.0
+
+
+class BusStatistics(Listener):
+    """A listener calculating the bus load and the timing of every
+    arbitration ID.
+
+    The bus load is the fraction of time the bus was occupied by the received
+    frames within sliding windows of the given lengths, based on the exact
+    length of the frames on the wire as given by :func:`frame_bit_length`.
+    The windows are based on the message timestamps, so that log files can
+    be analyzed as well::
+
+        statistics = can.BusStatistics(
+            timing=can.BitTimingFd.from_sample_point(...),
+            windows=(0.1, 1.0),
+            snapshot_interval=1.0,
+            on_snapshot=lambda snapshot: print(snapshot.bus_load),
+        )
+        notifier = can.Notifier(bus, [statistics])
+
+    Note that the load is calculated relative to the full window length
+    even before that much time has passed.
+
+    The cost per frame is constant on average. The frame lengths of
+    recurring frames are cached.
+    """
+
+    def __init__(
+        self,
+        bitrate: int | None = None,
+        data_bitrate: int | None = None,
+        timing: BitTiming | BitTimingFd | None = None,
+        windows: Iterable[float] = (1.0,),
+        snapshot_interval: float | None = None,
+        on_snapshot: Callable[[BusStatisticsSnapshot], None] | None = None,
+        period_bins: Sequence[float] = DEFAULT_PERIOD_BINS,
+        jitter_bins: Sequence[float] = DEFAULT_JITTER_BINS,
+    ) -> None:
+        """
+        :param bitrate:
+            The nominal bitrate in bits per second. Required unless
+            *timing* is given.
+        :param data_bitrate:
+            The bitrate of the data phase of CAN FD frames, which defaults
+            to the nominal bitrate.
+        :param timing:
+            The bit timing of the bus, taking precedence over *bitrate*
+            and *data_bitrate*.
+        :param windows:
+            The lengths of the sliding windows in seconds.
+        :param snapshot_interval:
+            The number of seconds between snapshots passed to *on_snapshot*.
+        :param on_snapshot:
+            A callable called with a :class:`BusStatisticsSnapshot` every
+            *snapshot_interval* seconds as given by the message timestamps.
+        :param period_bins:
+            The ascending upper bin edges of the period histograms in seconds.
+        :param jitter_bins:
+            The ascending upper bin edges of the jitter histograms in seconds.
+            The jitter of a frame is the difference of its period to the
+            average period before.
+        :raises ValueError: if no bitrate is given or the arguments are invalid
+        """
+        if isinstance(timing, BitTimingFd):
+            bitrate, data_bitrate = timing.nom_bitrate, timing.data_bitrate
+        elif isinstance(timing, BitTiming):
+            bitrate = timing.bitrate
+        if not bitrate or bitrate <= 0:
+            raise ValueError("a positive bitrate or a bit timing is required")
+        if data_bitrate is not None and data_bitrate <= 0:
+            raise ValueError("data_bitrate must be positive")
+        self.windows = sorted(set(windows))
+        if not self.windows or self.windows[0] <= 0:
+            raise ValueError("at least one positive window length is required")
+        if snapshot_interval is not None and snapshot_interval <= 0:
+            raise ValueError("snapshot_interval must be positive")
+        if list(period_bins) != sorted(period_bins) or list(jitter_bins) != sorted(
+            jitter_bins
+        ):
+            raise ValueError("the bin edges must be ascending")
+
+        #: The nominal bitrate in bits per second
+        self.bitrate = bitrate
+        #: The bitrate of the data phase in bits per second
+        self.data_bitrate = data_bitrate or bitrate
+        self.snapshot_interval = snapshot_interval
+        self.on_snapshot = on_snapshot
+        self.period_bins = tuple(period_bins)
+        self.jitter_bins = tuple(jitter_bins)
+
+        #: The number of received frames
+        self.frame_count = 0
+        self._last_timestamp = 0.0
+        self._next_snapshot: float | None = None
+        self._ids: dict[int, _IdTiming] = {}
+        # the history of frame timestamps and durations shared by the windows
+        self._timestamps: list[float] = []
+        self._durations: list[float] = []
+        self._windows = [_Window(length) for length in self.windows]
+        self._lock = threading.Lock()
+
+    def frame_duration(self, msg: Message) -> float:
+        """The number of seconds the frame occupies the bus."""
+        nominal_bits, data_bits = frame_bit_length(msg)
+        return nominal_bits / self.bitrate + data_bits / self.data_bitrate
+
+    def on_message_received(self, msg: Message) -> None:
+        duration = self.frame_duration(msg)
+        timestamp = msg.timestamp
+        with self._lock:
+            self._add_frame(timestamp, duration)
+            if not msg.is_error_frame:
+                self._add_period(msg.arbitration_id, timestamp)
+            snapshot = self._check_snapshot(timestamp)
+        if snapshot is not None and self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
+
+    def _add_frame(self, timestamp: float, duration: float) -> None:
+        self.frame_count += 1
+        self._last_timestamp = timestamp
+        timestamps, durations = self._timestamps, self._durations
+        timestamps.append(timestamp)
+        durations.append(duration)
+        end = len(timestamps)
+        for window in self._windows:
+            window.frames += 1
+            window.seconds += duration
+            start = window.start
+            earliest = timestamp - window.length
+            while start < end and timestamps[start] <= earliest:
+                window.frames -= 1
+                window.seconds -= durations[start]
+                start += 1
+            window.start = start
+
+        # the longest window has the smallest start index
+        start = self._windows[-1].start
+        if start > _COMPACT_THRESHOLD and start > end // 2:
+            del timestamps[:start]
+            del durations[:start]
+            for window in self._windows:
+                window.start -= start
+                # prevent the accumulation of rounding errors
+                window.seconds = sum(durations[window.start :])
+
+    def _add_period(self, arbitration_id: int, timestamp: float) -> None:
+        timing = self._ids.get(arbitration_id)
+        if timing is None:
+            self._ids[arbitration_id] = _IdTiming(
+                timestamp, len(self.period_bins), len(self.jitter_bins)
+            )
+            return
+        period = timestamp - timing.last_timestamp
+        timing.last_timestamp = timestamp
+        if timing.count > 1:
+            jitter = period - timing.period_sum / (timing.count - 1)
+            timing.jitter_histogram[bisect.bisect_left(self.jitter_bins, jitter)] += 1
+        timing.count += 1
+        timing.period_sum += period
+        timing.min_period = min(timing.min_period, period)
+        timing.max_period = max(timing.max_period, period)
+        timing.period_histogram[bisect.bisect_left(self.period_bins, period)] += 1
+
+    def _check_snapshot(self, timestamp: float) -> BusStatisticsSnapshot | None:
+        if self.snapshot_interval is None:
+            return None
+        if self._next_snapshot is None:
+            self._next_snapshot = timestamp + self.snapshot_interval
+            return None
+        if timestamp < self._next_snapshot:
+            return None
+        # skip the snapshots of longer pauses
+        while self._next_snapshot <= timestamp:
+            self._next_snapshot += self.snapshot_interval
+        return self._snapshot()
+
+    def snapshot(self) -> BusStatisticsSnapshot:
+        """Return the current statistics."""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> BusStatisticsSnapshot:
+        return BusStatisticsSnapshot(
+            timestamp=self._last_timestamp,
+            frame_count=self.frame_count,
+            bus_load={
+                window.length: max(window.seconds, 0.0) / window.length
+                for window in self._windows
+            },
+            frame_rate={
+                window.length: window.frames / window.length for window in self._windows
+            },
+            ids={
+                arbitration_id: timing.statistics()
+                for arbitration_id, timing in self._ids.items()
+            },
+        )
+
+    def reset(self) -> None:
+        """Discard all statistics."""
+        with self._lock:
+            self.frame_count = 0
+            self._next_snapshot = None
+            self._ids.clear()
+            self._timestamps.clear()
+            self._durations.clear()
+            self._windows = [_Window(length) for length in self.windows]
@@ -0,0 +1,255 @@
+"""
+Utilities for working with message filters as used by :meth:`can.BusABC.set_filters`.
+
+Many interfaces can only apply a limited number of acceptance filters in
+the kernel or the hardware. :func:`reduce_filters` computes a smaller set of
+filters that lets through at least all wanted messages, so that most of the
+unwanted traffic can still be dropped before it reaches Python. The few
+false positives are then removed by the software based filtering of the bus.
+"""
+
+import functools
+import heapq
+from typing import NamedTuple
+
+from can.typechecking import CanFilter, CanFilters
+
+__all__ = [
+    "ReducedFilters",
+    "filter_covers",
+    "merge_filters",
+    "reduce_filters",
+]
+
+_STANDARD_ID_BITS = 11
+_EXTENDED_ID_BITS = 29
+_STANDARD_ID_MASK = (1 << _STANDARD_ID_BITS) - 1
+_EXTENDED_ID_MASK = (1 << _EXTENDED_ID_BITS) - 1
+
+#: Longer lists of filters are not reduced with care, see :func:`reduce_filters`
+_MAX_REDUCIBLE_FILTERS = 10_000
+#: The maximum number of set lookups to find redundant filters
+_MAX_COVER_CHECKS = 1_000_000
+
+
+class ReducedFilters(NamedTuple):
+    """The result of :func:`reduce_filters`."""
+
+    #: The filters to be applied by the kernel or hardware. They match at
+    #: least all messages matched by the original filters.
+    hardware: CanFilters
+
+    #: The filters which need to be applied in software afterwards to remove
+    #: the false positives of the hardware filters, or :obj:`None` if the
+    #: hardware filters are exactly equivalent to the original filters.
+    software: CanFilters | None
+
+
+def _normalize(can_filter: CanFilter) -> CanFilter:
+    """Clear all identifier bits that are ignored by the mask."""
+    can_mask = can_filter["can_mask"]
+    normalized: CanFilter = {
+        "can_id": can_filter["can_id"] & can_mask,
+        "can_mask": can_mask,
+    }
+    if "extended" in can_filter:
+        normalized["extended"] = bool(can_filter["extended"])
+    return normalized
+
+
+def filter_covers(outer: CanFilter, inner: CanFilter) -> bool:
+    """Check whether every message matched by *inner* is also matched by *outer*.
+
+    :param outer: the potentially more general filter
+    :param inner: the potentially more specific filter
+    """
+    if "extended" in outer and outer["extended"] != inner.get("extended"):
+        return False
+    outer_mask = outer["can_mask"]
+    return (
+        outer_mask & ~inner["can_mask"] == 0
+        and (outer["can_id"] ^ inner["can_id"]) & outer_mask == 0
+    )
+
+
+def merge_filters(first: CanFilter, second: CanFilter) -> CanFilter:
+    """Compute the most specific single filter matching the messages of both filters.
+
+    The mask of the result only keeps the bits which are part of both masks
+    and for which both identifiers agree.
+    """
+    can_mask = (
+        first["can_mask"] & second["can_mask"] & ~(first["can_id"] ^ second["can_id"])
+    )
+    merged: CanFilter = {"can_id": first["can_id"] & can_mask, "can_mask": can_mask}
+    if "extended" in first and first["extended"] == second.get("extended"):
+        merged["extended"] = first["extended"]
+    return merged
+
+
+def _coverage(can_filter: CanFilter) -> int:
+    """Estimate the number of identifiers matched by a filter."""
+    can_mask = can_filter["can_mask"]
+    extended = can_filter.get("extended")
+    coverage = 0
+    if extended is not True:
+        coverage += 1 << (
+            _STANDARD_ID_BITS - (can_mask & _STANDARD_ID_MASK).bit_count()
+        )
+    if extended is not False:
+        coverage += 1 << (
+            _EXTENDED_ID_BITS - (can_mask & _EXTENDED_ID_MASK).bit_count()
+        )
+    return coverage
+
+
+def _merge_cost(first: CanFilter, second: CanFilter) -> int:
+    """Estimate the number of identifiers wrongly matched after merging two filters."""
+    return (
+        _coverage(merge_filters(first, second)) - _coverage(first) - _coverage(second)
+    )
+
+
+def _remove_covered(filters: list[CanFilter]) -> list[CanFilter]:
+    """Drop filters which are made redundant by another filter of the list.
+
+    Identical filters are found with a single dictionary lookup. Every other
+    filter is only checked against the distinct masks which are a subset of
+    its own mask, with one set lookup per mask. That check is skipped if
+    there are too many distinct masks, as dropping the covered filters is
+    just an optimization.
+    """
+    identical: dict[tuple[int, int, bool | None], CanFilter] = {}
+    for can_filter in filters:
+        key = (can_filter["can_id"], can_filter["can_mask"], can_filter.get("extended"))
+        identical.setdefault(key, can_filter)
+    unique = list(identical.values())
+
+    groups: dict[tuple[int, bool | None], set[int]] = {}
+    for can_filter in unique:
+        group = (can_filter["can_mask"], can_filter.get("extended"))
+        groups.setdefault(group, set()).add(can_filter["can_id"])
+    if len(groups) * len(unique) > _MAX_COVER_CHECKS:
+        return unique
+
+    result: list[CanFilter] = []
+    for can_filter in unique:
+        can_id = can_filter["can_id"]
+        can_mask = can_filter["can_mask"]
+        extended = can_filter.get("extended")
+        if not any(
+            outer_mask & ~can_mask == 0
+            and (outer_extended is None or outer_extended == extended)
+            and (outer_mask, outer_extended) != (can_mask, extended)
+            and can_id & outer_mask in can_ids
+            for (outer_mask, outer_extended), can_ids in groups.items()
+        ):
+            result.append(can_filter)
+    return result
+
+
+def _merge_all(filters: list[CanFilter]) -> CanFilter:
+    """Merge all filters into a single one matching every message of them."""
+    return functools.reduce(merge_filters, filters)
+
+
+def _id_order(can_filter: CanFilter) -> tuple[int, int]:
+    """Sort key placing filters with a common identifier prefix next to each other."""
+    extended = can_filter.get("extended")
+    return (1 if extended is None else 2 if extended else 0, can_filter["can_id"])
+
+
+def reduce_filters(filters: CanFilters, max_filters: int) -> ReducedFilters:
+    """Reduce a list of filters to fit a limited number of hardware filters.
+
+    If there are more filters than *max_filters* (after dropping redundant
+    ones), the filters are sorted by their identifier. Neighbouring filters
+    which add the fewest wrongly matched identifiers when being merged into
+    one are then merged greedily until the limit is met. This only takes
+    ``O(n log n)`` steps for *n* filters. Lists of more than 10000 filters
+    are simply merged into a single filter instead.
+
+    The resulting filters match a superset of the messages matched by the
+    original ones, so the original filters need to be applied in software
+    afterwards.
+
+    .. code-block:: python
+
+        reduced = can.filters.reduce_filters(many_filters, max_filters=1)
+        apply_in_hardware(reduced.hardware)
+        if reduced.software is not None:
+            apply_in_software(reduced.software)
+
+    :param filters:
+        The filters to reduce, see :meth:`can.BusABC.set_filters`.
+    :param max_filters:
+        The maximum number of filters the hardware supports.
+
+    :return:
+        The hardware filters and the residual software filters.
+
+    :raises ValueError:
+        If *max_filters* is smaller than one.
+    """
+    if max_filters < 1:
+        raise ValueError("At least a single filter must be supported")
+
+    if len(filters) <= max_filters:
+        return ReducedFilters(hardware=filters, software=None)
+
+    normalized = [_normalize(can_filter) for can_filter in filters]
+    if len(normalized) > _MAX_REDUCIBLE_FILTERS:
+        # leave the bulk of the work to the software filtering
+        return ReducedFilters(hardware=[_merge_all(normalized)], software=filters)
+
+    normalized = _remove_covered(normalized)
+    if len(normalized) <= max_filters:
+        # nothing was lost by dropping redundant filters
+        return ReducedFilters(hardware=normalized, software=None)
+
+    # a doubly linked list of the filters sorted by identifier, only
+    # neighbours in this list are considered for merging
+    alive = dict(enumerate(sorted(normalized, key=_id_order)))
+    previous: dict[int, int | None] = {key: key - 1 for key in alive}
+    following: dict[int, int | None] = {key: key + 1 for key in alive}
+    previous[0] = None
+    following[len(alive) - 1] = None
+    next_key = len(alive)
+    heap = [
+        (_merge_cost(alive[key], alive[key + 1]), key, key + 1)
+        for key in range(len(alive) - 1)
+    ]
+    heapq.heapify(heap)
+
+    while len(alive) > max_filters:
+        _, first, second = heapq.heappop(heap)
+        if first not in alive or following[first] != second:
+            # one of them was already merged into another filter
+            continue
+
+        merged = merge_filters(alive.pop(first), alive.pop(second))
+        before = previous.pop(first)
+        after = following.pop(second)
+        del following[first], previous[second]
+
+        # the merged filter may also cover further neighbours
+        while before is not None and filter_covers(merged, alive[before]):
+            del alive[before], following[before]
+            before = previous.pop(before)
+        while after is not None and filter_covers(merged, alive[after]):
+            del alive[after], previous[after]
+            after = following.pop(after)
+
+        key = next_key
+        next_key += 1
+        alive[key] = merged
+        previous[key] = before
+        following[key] = after
+        if before is not None:
+            following[before] = key
+            heapq.heappush(heap, (_merge_cost(alive[before], merged), before, key))
+        if after is not None:
+            previous[after] = key
+            heapq.heappush(heap, (_merge_cost(merged, alive[after]), key, after))
+
+    return ReducedFilters(hardware=list(alive.values()), software=filters)
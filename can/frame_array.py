@@ -0,0 +1,498 @@
+"""
+This module contains the :class:`~can.FrameArray`, a compact columnar container
+for large amounts of CAN frames backed by NumPy arrays.
+"""
+
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from enum import IntFlag
+from typing import TYPE_CHECKING, Any, overload
+
+from typing_extensions import Self
+
+from .message import Message
+from .typechecking import Channel
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+#: The number of data bytes stored per frame, i.e. the maximum CAN FD payload
+MAX_DATA_LENGTH = 64
+
+_MAX_CLASSIC_DATA_LENGTH = 8
+_INITIAL_CAPACITY = 64
+
+
+class FrameFlags(IntFlag):
+    """The bits of :attr:`FrameArray.flags` mapping to the boolean
+    attributes of :class:`~can.Message`."""
+
+    EXTENDED_ID = 0x01
+    REMOTE_FRAME = 0x02
+    ERROR_FRAME = 0x04
+    FD = 0x08
+    BITRATE_SWITCH = 0x10
+    ERROR_STATE_INDICATOR = 0x20
+    RX = 0x40
+
+
+def message_flags(msg: Message) -> int:
+    """Compute the :class:`FrameFlags` bitfield of a message."""
+    flags = 0
+    if msg.is_extended_id:
+        flags |= FrameFlags.EXTENDED_ID
+    if msg.is_remote_frame:
+        flags |= FrameFlags.REMOTE_FRAME
+    if msg.is_error_frame:
+        flags |= FrameFlags.ERROR_FRAME
+    if msg.is_fd:
+        flags |= FrameFlags.FD
+    if msg.bitrate_switch:
+        flags |= FrameFlags.BITRATE_SWITCH
+    if msg.error_state_indicator:
+        flags |= FrameFlags.ERROR_STATE_INDICATOR
+    if msg.is_rx:
+        flags |= FrameFlags.RX
+    return flags
+
+
+def _data_length(dlc: int, flags: int) -> int:
+    """The number of valid data bytes of a frame with the given DLC and flags."""
+    if flags & FrameFlags.REMOTE_FRAME:
+        return 0
+    if flags & FrameFlags.FD:
+        return min(dlc, MAX_DATA_LENGTH)
+    return min(dlc, _MAX_CLASSIC_DATA_LENGTH)
+
+
+def _channel_key(channel: Channel | None) -> Hashable:
+    # channels given as a list of integers are not hashable
+    return tuple(channel) if isinstance(channel, list) else channel
+
+
+class FrameArray:
+    """A growable container of CAN frames stored in parallel NumPy arrays.
+
+    Compared to a list of :class:`~can.Message` objects, this takes only
+    about 80 bytes per frame and allows vectorized analysis of the frames,
+    e.g. selecting all frames of some identifiers within a time window::
+
+        frames = can.FrameArray.from_messages(can.LogReader("capture.blf"))
+        window = frames.select_time(10.0, 20.0).select_ids([0x123, 0x456])
+        print(window.timestamp, window.data[:, :8])
+
+    The columns are available as the following attributes, each being an
+    array with one entry per frame:
+
+    * :attr:`timestamp` (``float64``)
+    * :attr:`arbitration_id` (``uint32``)
+    * :attr:`dlc` (``uint8``)
+    * :attr:`flags` (``uint8``, see :class:`FrameFlags`)
+    * :attr:`channel` (``uint16``, an index into :attr:`channels`)
+    * :attr:`data` (``uint8``, a matrix of 64 bytes per frame padded with zeros)
+
+    Indexing with an integer returns a :class:`~can.Message`, while slices,
+    boolean masks and integer arrays return a new :class:`FrameArray`.
+
+    Producers like log readers can fill a frame array without creating
+    :class:`~can.Message` objects by calling :meth:`append_frame`.
+
+    This class requires the optional *numpy* dependency.
+    """
+
+    __slots__ = (
+        "_arbitration_id",
+        "_channel",
+        "_channel_codes",
+        "_data",
+        "_dlc",
+        "_flags",
+        "_length",
+        "_timestamp",
+        "channels",
+    )
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY) -> None:
+        """Create an empty frame array.
+
+        :param capacity:
+            The number of frames to allocate memory for. The array grows
+            automatically if more frames are appended.
+
+        :raises NotImplementedError:
+            If the *numpy* package is not installed.
+        """
+        if np is None:
+            raise NotImplementedError(
+                "The numpy package was not found. Install python-can with "
+                "the optional dependency [numpy] to use the FrameArray."
+            )
+
+        capacity = max(capacity, 1)
+        self._timestamp: npt.NDArray[Any] = np.zeros(capacity, dtype=np.float64)
+        self._arbitration_id: npt.NDArray[Any] = np.zeros(capacity, dtype=np.uint32)
+        self._dlc: npt.NDArray[Any] = np.zeros(capacity, dtype=np.uint8)
+        self._flags: npt.NDArray[Any] = np.zeros(capacity, dtype=np.uint8)
+        self._channel: npt.NDArray[Any] = np.zeros(capacity, dtype=np.uint16)
+        self._data: npt.NDArray[Any] = np.zeros(
+            (capacity, MAX_DATA_LENGTH), dtype=np.uint8
+        )
+        self._length = 0
+
+        #: The distinct channels of the frames, indexed by :attr:`channel`
+        self.channels: list[Channel | None] = []
+        self._channel_codes: dict[Hashable, int] = {}
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message]) -> Self:
+        """Create a frame array holding a copy of the given messages."""
+        capacity = len(messages) if isinstance(messages, Sequence) else 0
+        frames = cls(capacity or _INITIAL_CAPACITY)
+        frames.extend(messages)
+        return frames
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamp: "npt.ArrayLike",
+        arbitration_id: "npt.ArrayLike",
+        dlc: "npt.ArrayLike",
+        flags: "npt.ArrayLike",
+        data: "npt.ArrayLike",
+        channel: "npt.ArrayLike | None" = None,
+        channels: Sequence[Channel | None] = (None,),
+    ) -> Self:
+        """Create a frame array from existing columns.
+
+        :param data:
+            A matrix with one row per frame and up to 64 columns. Shorter rows
+            are padded with zeros.
+        :param channel:
+            The indices into *channels*. Defaults to the first channel for
+            all frames.
+        :param channels:
+            The distinct channels of the frames.
+        """
+        timestamp = np.asarray(timestamp, dtype=np.float64)
+        length = len(timestamp)
+        frames = cls(length)
+        frames._length = length
+        frames._timestamp[:length] = timestamp
+        frames._arbitration_id[:length] = arbitration_id
+        frames._dlc[:length] = dlc
+        frames._flags[:length] = flags
+        if channel is not None:
+            frames._channel[:length] = channel
+        data = np.asarray(data, dtype=np.uint8)
+        if data.size:
+            data = data.reshape(length, -1)
+            frames._data[:length, : data.shape[1]] = data
+        for index, value in enumerate(channels):
+            frames.channels.append(value)
+            frames._channel_codes.setdefault(_channel_key(value), index)
+        return frames
+
+    @classmethod
+    def concatenate(cls, arrays: Iterable["FrameArray"]) -> Self:
+        """Join multiple frame arrays into a new one, preserving their order."""
+        arrays = list(arrays)
+        result = cls(sum(len(array) for array in arrays))
+        for array in arrays:
+            result._extend_frames(array)
+        return result
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        """The number of frames that fit into the allocated memory."""
+        return len(self._timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the columns of this frame array."""
+        return sum(
+            column.nbytes
+            for column in (
+                self._timestamp,
+                self._arbitration_id,
+                self._dlc,
+                self._flags,
+                self._channel,
+                self._data,
+            )
+        )
+
+    @property
+    def timestamp(self) -> "npt.NDArray[Any]":
+        return self._timestamp[: self._length]
+
+    @property
+    def arbitration_id(self) -> "npt.NDArray[Any]":
+        return self._arbitration_id[: self._length]
+
+    @property
+    def dlc(self) -> "npt.NDArray[Any]":
+        return self._dlc[: self._length]
+
+    @property
+    def flags(self) -> "npt.NDArray[Any]":
+        return self._flags[: self._length]
+
+    @property
+    def channel(self) -> "npt.NDArray[Any]":
+        return self._channel[: self._length]
+
+    @property
+    def data(self) -> "npt.NDArray[Any]":
+        return self._data[: self._length]
+
+    @property
+    def is_extended_id(self) -> "npt.NDArray[Any]":
+        """A boolean array telling which frames have an extended identifier."""
+        return np.asarray((self.flags & FrameFlags.EXTENDED_ID) != 0)
+
+    @property
+    def is_fd(self) -> "npt.NDArray[Any]":
+        """A boolean array telling which frames are CAN FD frames."""
+        return np.asarray((self.flags & FrameFlags.FD) != 0)
+
+    @property
+    def is_error_frame(self) -> "npt.NDArray[Any]":
+        """A boolean array telling which frames are error frames."""
+        return np.asarray((self.flags & FrameFlags.ERROR_FRAME) != 0)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the allocated memory to hold at least *capacity* frames."""
+        if capacity <= self.capacity:
+            return
+        # grow geometrically to make appending amortized O(1)
+        capacity = max(capacity, 2 * self.capacity)
+        for name in (
+            "_timestamp",
+            "_arbitration_id",
+            "_dlc",
+            "_flags",
+            "_channel",
+            "_data",
+        ):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: self._length] = old[: self._length]
+            setattr(self, name, new)
+
+    def _channel_code(self, channel: Channel | None) -> int:
+        key = _channel_key(channel)
+        code = self._channel_codes.get(key)
+        if code is None:
+            code = self._channel_codes[key] = len(self.channels)
+            self.channels.append(channel)
+        return code
+
+    def append_frame(
+        self,
+        timestamp: float,
+        arbitration_id: int,
+        dlc: int,
+        flags: int,
+        data: bytes | bytearray | memoryview = b"",
+        channel: Channel | None = None,
+    ) -> None:
+        """Append a single frame given by its raw values.
+
+        This allows producers to fill a frame array without creating
+        :class:`~can.Message` objects.
+
+        :param flags: the bitfield of :class:`FrameFlags`
+        :param data: the payload of up to 64 bytes
+        """
+        index = self._length
+        if index == self.capacity:
+            self._reserve(index + 1)
+        self._timestamp[index] = timestamp
+        self._arbitration_id[index] = arbitration_id
+        self._dlc[index] = dlc
+        self._flags[index] = flags
+        self._channel[index] = self._channel_code(channel)
+        if data:
+            self._data[index, : len(data)] = np.frombuffer(data, dtype=np.uint8)
+        self._length = index + 1
+
+    def append(self, msg: Message) -> None:
+        """Append a copy of a message."""
+        self.append_frame(
+            msg.timestamp,
+            msg.arbitration_id,
+            msg.dlc,
+            message_flags(msg),
+            msg.data,
+            msg.channel,
+        )
+
+    def extend(self, messages: "Iterable[Message] | FrameArray") -> None:
+        """Append copies of the given messages or of all frames of another array."""
+        if isinstance(messages, FrameArray):
+            self._extend_frames(messages)
+            return
+        if isinstance(messages, Sequence):
+            self._reserve(self._length + len(messages))
+        for msg in messages:
+            self.append(msg)
+
+    def extend_columns(
+        self,
+        timestamp: "npt.ArrayLike",
+        arbitration_id: "npt.ArrayLike",
+        dlc: "npt.ArrayLike",
+        flags: "npt.ArrayLike",
+        data: "npt.ArrayLike",
+        channel: "Channel | npt.NDArray[Any] | None" = None,
+    ) -> None:
+        """Append many frames given by their raw values at once.
+
+        :param data:
+            A matrix with one row per frame and up to 64 columns. Shorter rows
+            are padded with zeros.
+        :param channel:
+            Either a single channel for all frames or a NumPy array holding
+            the channel of each frame.
+        """
+        timestamp = np.asarray(timestamp, dtype=np.float64)
+        start = self._length
+        stop = start + len(timestamp)
+        self._reserve(stop)
+        self._timestamp[start:stop] = timestamp
+        self._arbitration_id[start:stop] = arbitration_id
+        self._dlc[start:stop] = dlc
+        self._flags[start:stop] = flags
+        data = np.asarray(data, dtype=np.uint8)
+        if data.size:
+            data = data.reshape(stop - start, -1)
+            self._data[start:stop, : data.shape[1]] = data
+        if isinstance(channel, np.ndarray):
+            values, inverse = np.unique(channel, return_inverse=True)
+            codes = np.array(
+                [self._channel_code(value.item()) for value in values] or [0],
+                dtype=np.uint16,
+            )
+            self._channel[start:stop] = codes[inverse]
+        else:
+            self._channel[start:stop] = self._channel_code(channel)
+        self._length = stop
+
+    def _extend_frames(self, other: "FrameArray") -> None:
+        start = self._length
+        stop = start + len(other)
+        self._reserve(stop)
+        self._timestamp[start:stop] = other.timestamp
+        self._arbitration_id[start:stop] = other.arbitration_id
+        self._dlc[start:stop] = other.dlc
+        self._flags[start:stop] = other.flags
+        self._data[start:stop] = other.data
+        # map the channel indices of the other array to the ones of this array
+        codes = np.array(
+            [self._channel_code(channel) for channel in other.channels] or [0],
+            dtype=np.uint16,
+        )
+        self._channel[start:stop] = codes[other.channel]
+        self._length = stop
+
+    def _message(self, index: int) -> Message:
+        flags = int(self._flags[index])
+        dlc = int(self._dlc[index])
+        return Message(
+            timestamp=float(self._timestamp[index]),
+            arbitration_id=int(self._arbitration_id[index]),
+            is_extended_id=bool(flags & FrameFlags.EXTENDED_ID),
+            is_remote_frame=bool(flags & FrameFlags.REMOTE_FRAME),
+            is_error_frame=bool(flags & FrameFlags.ERROR_FRAME),
+            channel=self.channels[self._channel[index]] if self.channels else None,
+            dlc=dlc,
+            data=self._data[index, : _data_length(dlc, flags)].tobytes(),
+            is_fd=bool(flags & FrameFlags.FD),
+            is_rx=bool(flags & FrameFlags.RX),
+            bitrate_switch=bool(flags & FrameFlags.BITRATE_SWITCH),
+            error_state_indicator=bool(flags & FrameFlags.ERROR_STATE_INDICATOR),
+        )
+
+    def __iter__(self) -> Iterator[Message]:
+        """Create a new :class:`~can.Message` for every frame."""
+        for index in range(self._length):
+            yield self._message(index)
+
+    def to_messages(self) -> list[Message]:
+        """Convert all frames into a list of new :class:`~can.Message` objects."""
+        return list(self)
+
+    @overload
+    def __getitem__(self, key: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, key: "slice | npt.NDArray[Any] | Sequence[int]") -> Self: ...
+
+    def __getitem__(
+        self, key: "int | slice | npt.NDArray[Any] | Sequence[int]"
+    ) -> "Message | Self":
+        if isinstance(key, int | np.integer):
+            index = int(key)
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("frame index out of range")
+            return self._message(index)
+
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+            if key.dtype == np.bool_ and len(key) != self._length:
+                raise IndexError("boolean mask does not match the number of frames")
+
+        timestamp = self.timestamp[key]
+        result = type(self)(len(timestamp))
+        result._length = len(timestamp)
+        result._timestamp[: result._length] = timestamp
+        result._arbitration_id[: result._length] = self.arbitration_id[key]
+        result._dlc[: result._length] = self.dlc[key]
+        result._flags[: result._length] = self.flags[key]
+        result._channel[: result._length] = self.channel[key]
+        result._data[: result._length] = self.data[key]
+        result.channels = list(self.channels)
+        result._channel_codes = dict(self._channel_codes)
+        return result
+
+    def select_ids(
+        self, arbitration_ids: Iterable[int], is_extended_id: bool | None = None
+    ) -> Self:
+        """Select all frames with one of the given identifiers.
+
+        :param arbitration_ids: the identifiers to select
+        :param is_extended_id:
+            If given, only select frames with this kind of identifier.
+        """
+        mask = np.isin(self.arbitration_id, np.fromiter(arbitration_ids, np.uint32))
+        if is_extended_id is not None:
+            mask &= self.is_extended_id == is_extended_id
+        return self[mask]
+
+    def select_time(
+        self, start: float | None = None, stop: float | None = None
+    ) -> Self:
+        """Select all frames with ``start <= timestamp < stop``.
+
+        :param start: the first timestamp to include, unbounded if None
+        :param stop: the first timestamp to exclude, unbounded if None
+        """
+        mask = np.ones(self._length, dtype=np.bool_)
+        if start is not None:
+            mask &= self.timestamp >= start
+        if stop is not None:
+            mask &= self.timestamp < stop
+        return self[mask]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{self._length} frames>)"
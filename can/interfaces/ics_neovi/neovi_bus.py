@@ -436,6 +436,15 @@ class NeoViBus(BusABC):
             return None, False
         return msg, False
 
+    def _recv_internal_batch(self, max_messages, timeout=0.1):
+        if not self.rx_buffer:
+            self._process_msg_queue(timeout=timeout)
+        messages = []
+        while self.rx_buffer and len(messages) < max_messages:
+            ics_msg = self.rx_buffer.popleft()
+            messages.append(self._ics_msg_to_message(ics_msg))
+        return messages, False
+
     @check_if_bus_open
     def send(self, msg, timeout=0):
         """Transmit a message to the CAN bus.
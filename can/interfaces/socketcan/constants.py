@@ -13,6 +13,15 @@ CAN_EFF_FLAG = 0x80000000
 CAN_BCM_TX_SETUP = 1
 CAN_BCM_TX_DELETE = 2
 CAN_BCM_TX_READ = 3
+CAN_BCM_TX_SEND = 4
+CAN_BCM_RX_SETUP = 5
+CAN_BCM_RX_DELETE = 6
+CAN_BCM_RX_READ = 7
+CAN_BCM_TX_STATUS = 8
+CAN_BCM_TX_EXPIRED = 9
+CAN_BCM_RX_STATUS = 10
+CAN_BCM_RX_TIMEOUT = 11
+CAN_BCM_RX_CHANGED = 12
 
 # BCM flags
 SETTIMER = 0x0001
@@ -40,6 +49,9 @@ CAN_RAW_LOOPBACK = 3
 CAN_RAW_RECV_OWN_MSGS = 4
 CAN_RAW_FD_FRAMES = 5
 
+# the maximum number of filters accepted by the CAN_RAW_FILTER socket option
+CAN_RAW_FILTER_MAX = 512
+
 MSK_ARBID = 0x1FFFFFFF
 MSK_FLAGS = 0xE0000000
 
@@ -9,13 +9,15 @@ import ctypes
 import ctypes.util
 import errno
 import logging
+import os
 import select
 import socket
 import struct
 import threading
 import time
 import warnings
-from collections.abc import Callable, Sequence
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
 
 import can
 from can import BusABC, CanProtocol, Message
@@ -33,7 +35,7 @@ log_tx = log.getChild("tx")
 log_rx = log.getChild("rx")
 
 try:
-    from socket import CMSG_SPACE
+    from socket import CMSG_LEN, CMSG_SPACE
 
     CMSG_SPACE_available = True
 except ImportError:
@@ -41,6 +43,10 @@ except ImportError:
     log.error("socket.CMSG_SPACE not available on this platform")
 
 
+# Operations on the socket.MsgFlag enum are slow, so use the plain value on
+# the receive path
+_MSG_DONTROUTE = int(socket.MSG_DONTROUTE)
+
 # Constants needed for precise handling of timestamps
 RECEIVED_TIMESTAMP_STRUCT = struct.Struct("@ll")
 RECEIVED_ANCILLARY_BUFFER_SIZE = (
@@ -48,6 +54,116 @@ RECEIVED_ANCILLARY_BUFFER_SIZE = (
 )
 
 
+# The structure definitions are taken from <sys/socket.h> and <bits/uio.h>;
+# they are needed to submit or receive multiple frames with a single
+# sendmmsg() or recvmmsg() call.
+#
+#     struct iovec {
+#         void *iov_base;
+#         size_t iov_len;
+#     };
+#
+#     struct msghdr {
+#         void *msg_name;
+#         socklen_t msg_namelen;
+#         struct iovec *msg_iov;
+#         size_t msg_iovlen;
+#         void *msg_control;
+#         size_t msg_controllen;
+#         int msg_flags;
+#     };
+#
+#     struct mmsghdr {
+#         struct msghdr msg_hdr;
+#         unsigned int msg_len;
+#     };
+class IoVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _sendmmsg = _libc.sendmmsg
+    _sendmmsg.argtypes = [
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_uint,
+        ctypes.c_int,
+    ]
+    _sendmmsg.restype = ctypes.c_int
+    _recvmmsg = _libc.recvmmsg
+    _recvmmsg.argtypes = [
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_uint,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    ]
+    _recvmmsg.restype = ctypes.c_int
+except (OSError, AttributeError, TypeError):
+    # not on Linux or with a libc that is too old
+    _sendmmsg = None
+    _recvmmsg = None
+
+# The address of a received frame (see 'struct sockaddr_can' in <linux/can.h>)
+# consists of the address family and the interface index, followed by a
+# protocol specific part of at most 16 bytes
+SOCKADDR_CAN_STRUCT = struct.Struct("@Hi")
+SOCKADDR_CAN_SIZE = SOCKADDR_CAN_STRUCT.size + 16
+
+# The control message with the timestamp of a received frame consists of a
+# 'struct cmsghdr' (see <sys/socket.h>) followed by the 'struct timespec'
+_SIZE_T_FORMAT = "Q" if ctypes.sizeof(ctypes.c_size_t) == 8 else "I"
+_LONG_FORMAT = "q" if ctypes.sizeof(ctypes.c_long) == 8 else "i"
+_CMSG_HEADER_FORMAT = f"={_SIZE_T_FORMAT}ii"
+_CMSG_PADDING = (
+    CMSG_LEN(0) - struct.calcsize(_CMSG_HEADER_FORMAT) if CMSG_SPACE_available else 0
+)
+RECEIVED_TIMESTAMP_CMSG_STRUCT = struct.Struct(
+    f"{_CMSG_HEADER_FORMAT}{_CMSG_PADDING}x{_LONG_FORMAT}{_LONG_FORMAT}"
+)
+
+# The fields of a 'struct mmsghdr' which are set by recvmmsg(), from the
+# length of the control data up to the length of the received frame
+_MSG_FLAGS_PADDING = (
+    MsgHdr.msg_flags.offset
+    - MsgHdr.msg_controllen.offset
+    - ctypes.sizeof(ctypes.c_size_t)
+)
+_MSG_LEN_PADDING = (
+    MMsgHdr.msg_len.offset - MsgHdr.msg_flags.offset - ctypes.sizeof(ctypes.c_int)
+)
+MMSGHDR_RESULT_STRUCT = struct.Struct(
+    f"={_SIZE_T_FORMAT}{_MSG_FLAGS_PADDING}xi{_MSG_LEN_PADDING}xI"
+)
+
+# The maximum number of frames the bus reads with a single recvmmsg() call,
+# which bounds the size of the receive buffers
+_RECVMMSG_MAX_FRAMES = 256
+
+
 # Setup BCM struct
 def bcm_header_factory(
     fields: list[tuple[str, type[ctypes.c_uint32] | type[ctypes.c_long]]],
@@ -131,6 +247,10 @@ BcmMsgHead = bcm_header_factory(
     ]
 )
 
+# A notification of the broadcast manager about a received frame consists of
+# the header followed by a single frame
+BCM_NOTIFICATION_SIZE = ctypes.sizeof(BcmMsgHead) + constants.CANFD_MTU
+
 
 # struct module defines a binary packing format:
 # https://docs.python.org/3/library/struct.html#struct-format-strings
@@ -269,6 +389,13 @@ def build_bcm_header(
     return ctypes.string_at(ctypes.addressof(result), ctypes.sizeof(result))
 
 
+def _split_time(value: float) -> tuple[int, int]:
+    """Given seconds as a float, return whole seconds and microseconds"""
+    seconds = int(value)
+    microseconds = int(1e6 * (value - seconds))
+    return seconds, microseconds
+
+
 def build_bcm_tx_delete_header(can_id: int, flags: int) -> bytes:
     opcode = constants.CAN_BCM_TX_DELETE
     return build_bcm_header(opcode, flags, 0, 0, 0, 0, 0, can_id, 1)
@@ -290,14 +417,8 @@ def build_bcm_transmit_header(
         # Note `TX_COUNTEVT` creates the message TX_EXPIRED when count expires
         flags |= constants.TX_COUNTEVT
 
-    def split_time(value: float) -> tuple[int, int]:
-        """Given seconds as a float, return whole seconds and microseconds"""
-        seconds = int(value)
-        microseconds = int(1e6 * (value - seconds))
-        return seconds, microseconds
-
-    ival1_seconds, ival1_usec = split_time(initial_period)
-    ival2_seconds, ival2_usec = split_time(subsequent_period)
+    ival1_seconds, ival1_usec = _split_time(initial_period)
+    ival2_seconds, ival2_usec = _split_time(subsequent_period)
 
     return build_bcm_header(
         opcode,
@@ -318,6 +439,46 @@ def build_bcm_update_header(can_id: int, msg_flags: int, nframes: int = 1) -> by
     )
 
 
+def build_bcm_rx_setup_header(
+    can_id: int, throttle: float, msg_flags: int, nframes: int = 1
+) -> bytes:
+    """Build the header of an RX_SETUP command.
+
+    Without frames, every received frame with the given CAN ID is forwarded
+    (``RX_FILTER_ID``). With a single frame, its payload is used as a mask
+    and only frames whose masked payload changed are forwarded.
+
+    :param throttle:
+        The minimum time in seconds between two forwarded frames, or 0 to
+        forward every (changed) frame immediately.
+    """
+    flags = msg_flags
+    if nframes == 0:
+        flags |= constants.RX_FILTER_ID
+    if throttle > 0:
+        # only `ival2` is set, `ival1` would enable the timeout monitoring
+        flags |= constants.SETTIMER
+
+    ival2_seconds, ival2_usec = _split_time(throttle)
+
+    return build_bcm_header(
+        constants.CAN_BCM_RX_SETUP,
+        flags,
+        0,
+        0,
+        0,
+        ival2_seconds,
+        ival2_usec,
+        can_id,
+        nframes,
+    )
+
+
+def build_bcm_rx_delete_header(can_id: int, flags: int) -> bytes:
+    opcode = constants.CAN_BCM_RX_DELETE
+    return build_bcm_header(opcode, flags, 0, 0, 0, 0, 0, can_id, 0)
+
+
 def is_frame_fd(frame: bytes):
     # According to the SocketCAN implementation the frame length
     # should indicate if the message is FD or not (not the flag value)
@@ -352,25 +513,84 @@ def create_bcm_socket(channel: str) -> socket.socket:
     return s
 
 
-def send_bcm(bcm_socket: socket.socket, data: bytes) -> int:
+def send_bcm(bcm_socket: socket.socket, data: bytes, channel: str | None = None) -> int:
     """
     Send raw frame to a BCM socket and handle errors.
+
+    :param channel:
+        The interface to address the command to, if the socket is connected
+        to all interfaces.
     """
     try:
+        if channel:
+            return bcm_socket.sendto(data, (channel,))
         return bcm_socket.send(data)
     except OSError as error:
-        base = f"Couldn't send CAN BCM frame due to OS Error: {error.strerror}"
-
-        if error.errno == errno.EINVAL:
-            specific_message = " You are probably referring to a non-existing frame."
-        elif error.errno == errno.ENETDOWN:
-            specific_message = " The CAN interface appears to be down."
-        elif error.errno == errno.EBADF:
-            specific_message = " The CAN socket appears to be closed."
-        else:
-            specific_message = ""
+        raise _bcm_error(error) from error
+
+
+def _bcm_error(error: OSError) -> can.CanOperationError:
+    base = f"Couldn't send CAN BCM frame due to OS Error: {error.strerror}"
 
-        raise can.CanOperationError(base + specific_message, error.errno) from error
+    if error.errno == errno.EINVAL:
+        specific_message = " You are probably referring to a non-existing frame."
+    elif error.errno == errno.ENETDOWN:
+        specific_message = " The CAN interface appears to be down."
+    elif error.errno == errno.EBADF:
+        specific_message = " The CAN socket appears to be closed."
+    else:
+        specific_message = ""
+
+    return can.CanOperationError(base + specific_message, error.errno)
+
+
+def send_frames(sock: socket.socket, frames: Sequence[bytes], flags: int = 0) -> int:
+    """
+    Send multiple raw frames on a socket using as few system calls as possible.
+
+    All frames are packed into one contiguous buffer and submitted with
+    :manpage:`sendmmsg(2)`, each frame being a separate datagram.
+
+    :param sock:
+        The (connected or bound) socket to send the frames on.
+    :param frames:
+        The frames to send, e.g. created by :func:`build_can_frame`.
+    :param flags:
+        Flags passed on to the system call, e.g. :data:`socket.MSG_DONTWAIT`.
+
+    :return: The number of frames that were sent, which might be less than
+        the number of given frames.
+
+    :raises NotImplementedError:
+        If :manpage:`sendmmsg(2)` is not available on this platform.
+    :raises OSError:
+        If not even the first frame could be sent.
+    """
+    if _sendmmsg is None:
+        raise NotImplementedError("sendmmsg() is not available on this platform")
+
+    count = len(frames)
+    if count == 0:
+        return 0
+
+    buffer = ctypes.create_string_buffer(b"".join(frames))
+    base_address = ctypes.addressof(buffer)
+    iovecs = (IoVec * count)()
+    headers = (MMsgHdr * count)()
+
+    offset = 0
+    for index, frame in enumerate(frames):
+        iovecs[index].iov_base = base_address + offset
+        iovecs[index].iov_len = len(frame)
+        headers[index].msg_hdr.msg_iov = ctypes.pointer(iovecs[index])
+        headers[index].msg_hdr.msg_iovlen = 1
+        offset += len(frame)
+
+    sent = _sendmmsg(sock.fileno(), ctypes.addressof(headers), count, flags)
+    if sent < 0:
+        error_number = ctypes.get_errno()
+        raise OSError(error_number, os.strerror(error_number))
+    return sent
 
 
 def _compose_arbitration_id(message: Message) -> int:
@@ -396,6 +616,11 @@ class CyclicSendTask(
         - setting of a task duration
         - modifying the data
         - stopping then subsequent restarting of the task
+
+    The messages are scheduled by the kernel, which does not report the
+    individual transmissions. Therefore, the
+    :attr:`~can.broadcastmanager.CyclicSendTaskABC.timing_stats` of this task
+    are ``None``.
     """
 
     def __init__(
@@ -522,14 +747,17 @@ class CyclicSendTask(
 
         self.messages = messages
 
+        log.debug("Sending BCM command")
+        send_bcm(self.bcm_socket, self._build_update(messages))
+
+    def _build_update(self, messages: Sequence[Message]) -> bytes:
         body = bytearray()
         header = build_bcm_update_header(
             can_id=self.task_id, msg_flags=self.flags, nframes=len(messages)
         )
         for message in messages:
             body += build_can_frame(message)
-        log.debug("Sending BCM command")
-        send_bcm(self.bcm_socket, header + body)
+        return header + body
 
     def start(self) -> None:
         """Restart a periodic task by sending TX_SETUP message to Linux kernel.
@@ -602,7 +830,9 @@ def bind_socket(sock: socket.socket, channel: str = "can0") -> None:
     log.debug("Bound socket.")
 
 
-def capture_message(sock: socket.socket, get_channel: bool = False) -> Message | None:
+def capture_message(
+    sock: socket.socket, get_channel: bool = False, nonblocking: bool = False
+) -> Message | None:
     """
     Captures a message from given socket.
 
@@ -610,26 +840,90 @@ def capture_message(sock: socket.socket, get_channel: bool = False) -> Message |
         The socket to read a message from.
     :param get_channel:
         Find out which channel the message comes from.
+    :param nonblocking:
+        Do not wait for a message if none is available right now.
 
-    :return: The received message, or None on failure.
+    :return: The received message, or None on failure or if `nonblocking`
+        was set and no message was available.
     """
     # Fetching the Arb ID, DLC and Data
     try:
         cf, ancillary_data, msg_flags, addr = sock.recvmsg(
-            constants.CANFD_MTU, RECEIVED_ANCILLARY_BUFFER_SIZE
+            constants.CANFD_MTU,
+            RECEIVED_ANCILLARY_BUFFER_SIZE,
+            socket.MSG_DONTWAIT if nonblocking else 0,
         )
         if get_channel:
             channel = addr[0] if isinstance(addr, tuple) else addr
         else:
             channel = None
     except OSError as error:
+        if nonblocking and error.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+            return None
+
         raise can.CanOperationError(
             f"Error receiving: {error.strerror}", error.errno
         ) from error
 
-    can_id, can_dlc, flags, data = dissect_can_frame(cf)
-
     # Fetching the timestamp
+    timestamp = _parse_timestamp(ancillary_data)
+
+    # Section 4.7.1: MSG_DONTROUTE: set when the received frame was created on the local host.
+    is_rx = not msg_flags & _MSG_DONTROUTE
+
+    return _build_message(cf, timestamp, channel, is_rx)
+
+
+def capture_bcm_message(
+    sock: socket.socket, get_channel: bool = False, nonblocking: bool = False
+) -> Message | None:
+    """
+    Captures a frame which the broadcast manager forwards due to an RX_SETUP
+    subscription.
+
+    Other notifications of the broadcast manager, like timeouts, are skipped.
+
+    :param sock:
+        The BCM socket to read a notification from.
+    :param get_channel:
+        Find out which channel the message comes from.
+    :param nonblocking:
+        Do not wait for a notification if none is available right now.
+
+    :return: The received message, or None if the notification did not
+        contain a frame or if `nonblocking` was set and no notification was
+        available.
+    """
+    try:
+        notification, ancillary_data, msg_flags, addr = sock.recvmsg(
+            BCM_NOTIFICATION_SIZE,
+            RECEIVED_ANCILLARY_BUFFER_SIZE,
+            socket.MSG_DONTWAIT if nonblocking else 0,
+        )
+    except OSError as error:
+        if nonblocking and error.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+            return None
+
+        raise can.CanOperationError(
+            f"Error receiving: {error.strerror}", error.errno
+        ) from error
+
+    head = BcmMsgHead.from_buffer_copy(notification)
+    if head.opcode != constants.CAN_BCM_RX_CHANGED or head.nframes != 1:
+        log_rx.debug("Skipping BCM notification with opcode %d", head.opcode)
+        return None
+
+    channel = None
+    if get_channel:
+        channel = addr[0] if isinstance(addr, tuple) else addr
+    timestamp = _parse_timestamp(ancillary_data)
+    is_rx = not msg_flags & _MSG_DONTROUTE
+    return _build_message(
+        notification[ctypes.sizeof(BcmMsgHead) :], timestamp, channel, is_rx
+    )
+
+
+def _parse_timestamp(ancillary_data: list[tuple[int, int, bytes]]) -> float:
     assert len(ancillary_data) == 1, "only requested a single extra field"
     cmsg_level, cmsg_type, cmsg_data = ancillary_data[0]
     assert (
@@ -641,7 +935,13 @@ def capture_message(sock: socket.socket, get_channel: bool = False) -> Message |
         raise can.CanOperationError(
             f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
         )
-    timestamp = seconds + nanoseconds * 1e-9
+    return seconds + nanoseconds * 1e-9
+
+
+def _build_message(
+    cf: bytes, timestamp: float, channel: str | None, is_rx: bool
+) -> Message:
+    can_id, can_dlc, flags, data = dissect_can_frame(cf)
 
     # EXT, RTR, ERR flags -> boolean attributes
     #   /* special address description flags for the CAN_ID */
@@ -655,9 +955,6 @@ def capture_message(sock: socket.socket, get_channel: bool = False) -> Message |
     bitrate_switch = bool(flags & constants.CANFD_BRS)
     error_state_indicator = bool(flags & constants.CANFD_ESI)
 
-    # Section 4.7.1: MSG_DONTROUTE: set when the received frame was created on the local host.
-    is_rx = not bool(msg_flags & socket.MSG_DONTROUTE)
-
     if is_extended_frame_format:
         # log.debug("CAN: Extended")
         # TODO does this depend on SFF or EFF?
@@ -684,6 +981,197 @@ def capture_message(sock: socket.socket, get_channel: bool = False) -> Message |
     return msg
 
 
+class MultiMessageReceiver:
+    """
+    Receives multiple frames from a raw CAN socket with a single
+    :manpage:`recvmmsg(2)` call.
+
+    The frames, their timestamps and addresses are read into buffers which are
+    allocated once and reused for every call. The messages are decoded from
+    memoryviews of these buffers, such that only the payloads are copied.
+    """
+
+    def __init__(self, sock: socket.socket, get_channel: bool = False) -> None:
+        """
+        :param sock:
+            The raw CAN socket to receive from, with nanosecond timestamps
+            enabled.
+        :param get_channel:
+            Find out which channel the messages come from.
+
+        :raises NotImplementedError:
+            If :manpage:`recvmmsg(2)` is not available on this platform.
+        """
+        if _recvmmsg is None:
+            raise NotImplementedError("recvmmsg() is not available on this platform")
+
+        self.sock = sock
+        self.get_channel = get_channel
+        self._capacity = 0
+        # the number of headers which were modified by the last call
+        self._used = 0
+        self._channels: dict[int, str] = {}
+
+    def _allocate(self, capacity: int) -> None:
+        frame_size = constants.CANFD_MTU
+        control_size = RECEIVED_ANCILLARY_BUFFER_SIZE
+        self._frames = ctypes.create_string_buffer(capacity * frame_size)
+        self._control = ctypes.create_string_buffer(capacity * control_size)
+        self._names = ctypes.create_string_buffer(capacity * SOCKADDR_CAN_SIZE)
+        self._iovecs = (IoVec * capacity)()
+        self._headers = (MMsgHdr * capacity)()
+
+        frames_address = ctypes.addressof(self._frames)
+        control_address = ctypes.addressof(self._control)
+        names_address = ctypes.addressof(self._names)
+        for index in range(capacity):
+            iovec = self._iovecs[index]
+            iovec.iov_base = frames_address + index * frame_size
+            iovec.iov_len = frame_size
+
+            header = self._headers[index].msg_hdr
+            header.msg_iov = ctypes.pointer(iovec)
+            header.msg_iovlen = 1
+            header.msg_control = control_address + index * control_size
+            header.msg_controllen = control_size
+            if self.get_channel:
+                header.msg_name = names_address + index * SOCKADDR_CAN_SIZE
+                header.msg_namelen = SOCKADDR_CAN_SIZE
+
+        self._frames_view = memoryview(self._frames).cast("B")
+        self._headers_view = memoryview(self._headers).cast("B")
+        self._capacity = capacity
+        self._used = 0
+
+    def _channel(self, offset: int) -> str | None:
+        _, ifindex = SOCKADDR_CAN_STRUCT.unpack_from(self._names, offset)
+        channel = self._channels.get(ifindex)
+        if channel is None:
+            try:
+                channel = socket.if_indextoname(ifindex)
+            except OSError:
+                return None
+            self._channels[ifindex] = channel
+        return channel
+
+    def receive(self, max_messages: int) -> list[Message]:
+        """Receive the frames which are available right now.
+
+        :param max_messages:
+            The maximum number of frames to receive. The buffers grow to
+            this size if needed.
+
+        :return: The received messages, which is empty if none were available.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading.
+        """
+        if max_messages > self._capacity:
+            self._allocate(max_messages)
+
+        # the lengths of the control data and the addresses are overwritten
+        # by the kernel and need to be reset
+        headers = self._headers
+        control_size = RECEIVED_ANCILLARY_BUFFER_SIZE
+        for index in range(self._used):
+            header = headers[index].msg_hdr
+            header.msg_controllen = control_size
+            if self.get_channel:
+                header.msg_namelen = SOCKADDR_CAN_SIZE
+
+        count = _recvmmsg(  # type: ignore[misc]
+            self.sock.fileno(),
+            ctypes.addressof(headers),
+            max_messages,
+            socket.MSG_DONTWAIT,
+            None,
+        )
+        if count < 0:
+            error_number = ctypes.get_errno()
+            self._used = 0
+            if error_number in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+            raise can.CanOperationError(
+                f"Error receiving: {os.strerror(error_number)}", error_number
+            )
+        self._used = count
+
+        # the decoding of dissect_can_frame() and capture_message() is inlined,
+        # since the function calls would take a considerable part of the time
+        frames = self._frames_view
+        control = self._control
+        results = self._headers_view
+        results_offset = MsgHdr.msg_controllen.offset
+        mmsghdr_size = ctypes.sizeof(MMsgHdr)
+        frame_size = constants.CANFD_MTU
+        unpack_frame_header = CAN_FRAME_HEADER_STRUCT.unpack_from
+        valid_data_lengths = can.util.CAN_FD_DLC
+        eff_flag = constants.CAN_EFF_FLAG
+        msgs: list[Message] = []
+        for index in range(count):
+            controllen, msg_flags, msg_len = MMSGHDR_RESULT_STRUCT.unpack_from(
+                results, index * mmsghdr_size + results_offset
+            )
+
+            # Fetching the timestamp
+            _, cmsg_level, cmsg_type, seconds, nanoseconds = (
+                RECEIVED_TIMESTAMP_CMSG_STRUCT.unpack_from(
+                    control, index * control_size
+                )
+            )
+            assert (
+                controllen > 0
+                and cmsg_level == socket.SOL_SOCKET
+                and cmsg_type == constants.SO_TIMESTAMPNS
+            ), "did not receive the requested timestamp"
+            if nanoseconds >= 1e9:
+                raise can.CanOperationError(
+                    f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
+                )
+
+            channel = (
+                self._channel(index * SOCKADDR_CAN_SIZE) if self.get_channel else None
+            )
+            # Section 4.7.1: MSG_DONTROUTE: set when the received frame was created on the local host.
+            is_rx = not msg_flags & _MSG_DONTROUTE
+
+            offset = index * frame_size
+            can_id, data_len, flags, len8_dlc = unpack_frame_header(frames, offset)
+            if msg_len != frame_size:
+                # Flags not valid in non-FD frames
+                flags = 0
+                can_dlc = data_len
+                if (
+                    data_len == constants.CAN_MAX_DLEN
+                    and constants.CAN_MAX_DLEN < len8_dlc <= constants.CAN_MAX_RAW_DLC
+                ):
+                    can_dlc = len8_dlc
+            elif data_len not in valid_data_lengths:
+                data_len = can_dlc = min(i for i in valid_data_lengths if i >= data_len)
+            else:
+                can_dlc = data_len
+
+            is_extended_id = bool(can_id & eff_flag)
+            msgs.append(
+                Message(
+                    timestamp=seconds + nanoseconds * 1e-9,
+                    channel=channel,
+                    arbitration_id=can_id & (0x1FFFFFFF if is_extended_id else 0x7FF),
+                    is_extended_id=is_extended_id,
+                    is_remote_frame=bool(can_id & constants.CAN_RTR_FLAG),
+                    is_error_frame=bool(can_id & constants.CAN_ERR_FLAG),
+                    is_fd=msg_len == frame_size,
+                    is_rx=is_rx,
+                    bitrate_switch=bool(flags & constants.CANFD_BRS),
+                    error_state_indicator=bool(flags & constants.CANFD_ESI),
+                    dlc=can_dlc,
+                    data=frames[offset + 8 : offset + 8 + data_len],
+                )
+            )
+
+        return msgs
+
+
 class SocketcanBus(BusABC):  # pylint: disable=abstract-method
     """A SocketCAN interface to CAN.
 
@@ -691,6 +1179,8 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
     available interfaces.
     """
 
+    _max_hardware_filters = constants.CAN_RAW_FILTER_MAX
+
     def __init__(
         self,
         channel: str = "",
@@ -699,6 +1189,7 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         fd: bool = False,
         can_filters: CanFilters | None = None,
         ignore_rx_error_frames=False,
+        rx_batch_size: int = 1,
         **kwargs,
     ) -> None:
         """Creates a new socketcan bus.
@@ -731,11 +1222,36 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
             See :meth:`can.BusABC.set_filters`.
         :param ignore_rx_error_frames:
             If incoming error frames should be discarded.
+        :param rx_batch_size:
+            The maximum number of frames :meth:`~can.BusABC.recv` reads with
+            a single system call. The surplus frames are returned by the
+            following calls without another system call. Frames which were
+            read ahead do not make :meth:`fileno` readable, so keep the
+            default if the bus is watched with :func:`select.select` or a
+            :class:`~can.Notifier` using a selector.
+            :meth:`~can.BusABC.recv_batch` always reads all available frames
+            with as few system calls as possible.
         """
+        if rx_batch_size < 1:
+            raise ValueError("rx_batch_size must be at least 1")
+
         self.socket = create_socket()
         self.channel = channel
         self.channel_info = f"socketcan channel '{channel}'"
         self._bcm_sockets: dict[str, socket.socket] = {}
+        self._bcm_rx_socket: socket.socket | None = None
+        self._bcm_rx_epoll: select.epoll | None = None
+        # the channel, CAN ID including the EFF flag and FD flag of each subscription
+        self._subscriptions: set[tuple[str, int, bool]] = set()
+        # the socket served last if both were readable
+        self._last_ready_socket: socket.socket | None = None
+        self._rx_batch_size = rx_batch_size
+        self._rx_queue: deque[Message] = deque()
+        self._receiver: MultiMessageReceiver | None = None
+        if _recvmmsg is not None:
+            self._receiver = MultiMessageReceiver(
+                self.socket, get_channel=channel == ""
+            )
         self._is_filtered = False
         self._task_id = 0
         self._task_id_guard = threading.Lock()
@@ -810,30 +1326,136 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         for channel, bcm_socket in self._bcm_sockets.items():
             log.debug("Closing bcm socket for channel %s", channel)
             bcm_socket.close()
+        if self._bcm_rx_socket is not None:
+            log.debug("Closing bcm socket for change subscriptions")
+            self._bcm_rx_socket.close()
+        if self._bcm_rx_epoll is not None:
+            self._bcm_rx_epoll.close()
         log.debug("Closing raw can socket")
         self.socket.close()
 
     def _recv_internal(self, timeout: float | None) -> tuple[Message | None, bool]:
+        if self._rx_queue:
+            # a frame which was read ahead by a previous call
+            return self._rx_queue.popleft(), self._is_filtered
+
+        ready_socket = self._wait_for_socket(timeout)
+        if ready_socket is None:
+            # socket wasn't readable or timeout occurred
+            return None, self._is_filtered
+
+        if ready_socket is self.socket and self._rx_batch_size > 1 and self._receiver:
+            msgs = self._receive_many(self._rx_batch_size)
+            if not msgs:
+                return None, self._is_filtered
+            self._rx_queue.extend(msgs[1:])
+            return msgs[0], self._is_filtered
+
+        msg = self._capture(ready_socket)
+        # frames forwarded by the broadcast manager are filtered by the kernel
+        return msg, ready_socket is not self.socket or self._is_filtered
+
+    def _recv_internal_batch(
+        self, max_messages: int, timeout: float | None
+    ) -> tuple[list[Message], bool]:
+        msgs: list[Message] = []
+        if self._rx_queue:
+            # the frames which were read ahead by recv() come first
+            while self._rx_queue and len(msgs) < max_messages:
+                msgs.append(self._rx_queue.popleft())
+            if self._receiver is not None and len(msgs) < max_messages:
+                msgs += self._receive_many(max_messages - len(msgs))
+            return msgs, self._is_filtered
+
+        ready_socket = self._wait_for_socket(timeout)
+        if ready_socket is None:
+            return msgs, self._is_filtered
+
+        if ready_socket is self.socket and self._receiver is not None:
+            return self._receive_many(max_messages), self._is_filtered
+
+        # recvmmsg() is not available or these are notifications of the
+        # broadcast manager
+        already_filtered = ready_socket is not self.socket or self._is_filtered
+        first_msg = self._capture(ready_socket)
+        if first_msg is None:
+            return msgs, already_filtered
+        msgs.append(first_msg)
+
+        # drain the socket without waiting for further frames
+        while len(msgs) < max_messages:
+            msg = self._capture(ready_socket, nonblocking=True)
+            if msg is None:
+                break
+            msgs.append(msg)
+
+        return msgs, already_filtered
+
+    def _receive_many(self, max_messages: int) -> list[Message]:
+        """Read up to *max_messages* available frames from the raw socket
+        with as few calls of :manpage:`recvmmsg(2)` as possible."""
+        receiver = self._receiver
+        assert receiver is not None, "recvmmsg() is not available"
+        msgs: list[Message] = []
+        while len(msgs) < max_messages:
+            count = min(max_messages - len(msgs), _RECVMMSG_MAX_FRAMES)
+            received = receiver.receive(count)
+            msgs += received
+            if len(received) < count:
+                break
+
+        if self.channel:
+            # Default to our own channel
+            for msg in msgs:
+                msg.channel = self.channel
+        return msgs
+
+    def _wait_for_socket(self, timeout: float | None) -> socket.socket | None:
+        """Wait until the raw socket or the socket of the change subscriptions
+        is readable and return it.
+
+        If both are readable, they are returned alternately, since a
+        subscription without a data mask and throttle forwards every frame.
+        """
+        bcm_rx_socket = self._bcm_rx_socket
         try:
-            # get all sockets that are ready (can be a list with a single value
-            # being self.socket or an empty list if self.socket is not ready)
-            ready_receive_sockets, _, _ = select.select([self.socket], [], [], timeout)
+            if bcm_rx_socket is None:
+                ready_receive_sockets, _, _ = select.select(
+                    [self.socket], [], [], timeout
+                )
+            else:
+                ready_receive_sockets, _, _ = select.select(
+                    [bcm_rx_socket, self.socket], [], [], timeout
+                )
         except OSError as error:
             # something bad happened (e.g. the interface went down)
             raise can.CanOperationError(
                 f"Failed to receive: {error.strerror}", error.errno
             ) from error
 
-        if ready_receive_sockets:  # not empty
-            get_channel = self.channel == ""
-            msg = capture_message(self.socket, get_channel)
-            if msg and not msg.channel and self.channel:
-                # Default to our own channel
-                msg.channel = self.channel
-            return msg, self._is_filtered
-
-        # socket wasn't readable or timeout occurred
-        return None, self._is_filtered
+        if not ready_receive_sockets:
+            return None
+        if len(ready_receive_sockets) == 1:
+            ready_socket = ready_receive_sockets[0]
+        elif self._last_ready_socket is bcm_rx_socket:
+            ready_socket = self.socket
+        else:
+            ready_socket = bcm_rx_socket
+        self._last_ready_socket = ready_socket
+        return ready_socket
+
+    def _capture(
+        self, sock: socket.socket, nonblocking: bool = False
+    ) -> Message | None:
+        get_channel = self.channel == ""
+        if sock is self.socket:
+            msg = capture_message(sock, get_channel, nonblocking)
+        else:
+            msg = capture_bcm_message(sock, get_channel, nonblocking)
+        if msg and not msg.channel and self.channel:
+            # Default to our own channel
+            msg.channel = self.channel
+        return msg
 
     def send(self, msg: Message, timeout: float | None = None) -> None:
         """Transmit a message to the CAN bus.
@@ -873,6 +1495,60 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
 
         raise can.CanOperationError("Transmit buffer full")
 
+    def send_batch(self, msgs: Sequence[Message], timeout: float | None = None) -> int:
+        """Transmit multiple messages to the CAN bus.
+
+        All messages are packed into a single buffer and submitted with
+        :manpage:`sendmmsg(2)`, which usually needs only a single system call.
+
+        :param msgs: The messages to transmit.
+        :param timeout:
+            Wait up to this many seconds for the transmit queue to be ready.
+            If not given, the call may fail immediately.
+
+        :return:
+            The number of messages that were accepted for transmission.
+
+        :raises ~can.exceptions.CanError:
+            if not even the first message could be written.
+        """
+        if _sendmmsg is None or (
+            self.channel == "" and any(msg.channel for msg in msgs)
+        ):
+            # messages need to be addressed individually or sendmmsg() is unavailable
+            return super().send_batch(msgs, timeout)
+
+        log_tx.debug("sending a batch of %d messages", len(msgs))
+        frames = [build_can_frame(msg) for msg in msgs]
+
+        started = time.time()
+        # If no timeout is given, poll for availability
+        if timeout is None:
+            timeout = 0
+        time_left = timeout
+        sent = 0
+
+        while sent < len(frames) and time_left >= 0:
+            # Wait for write availability
+            ready = select.select([], [self.socket], [], time_left)[1]
+            if not ready:
+                # Timeout
+                break
+            try:
+                sent += send_frames(self.socket, frames[sent:], socket.MSG_DONTWAIT)
+            except OSError as error:
+                if error.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    if sent:
+                        break
+                    raise can.CanOperationError(
+                        f"Failed to transmit: {error.strerror}", error.errno
+                    ) from error
+            time_left = timeout - (time.time() - started)
+
+        if sent == 0 and frames:
+            raise can.CanOperationError("Transmit buffer full")
+        return sent
+
     def _send_once(self, data: bytes, channel: str | None = None) -> int:
         try:
             if self.channel == "" and channel:
@@ -967,6 +1643,219 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
             self._bcm_sockets[channel] = create_bcm_socket(self.channel)
         return self._bcm_sockets[channel]
 
+    def modify_periodic_tasks(
+        self,
+        updates: Mapping[
+            can.broadcastmanager.ModifiableCyclicTaskABC, Message | Sequence[Message]
+        ],
+    ) -> dict[can.broadcastmanager.ModifiableCyclicTaskABC, Exception]:
+        """Update the contents of several periodic tasks at once.
+
+        The updates of all :class:`CyclicSendTask` instances sharing a BCM
+        socket are submitted with a single :manpage:`sendmmsg(2)` call, each
+        being a separate TX_SETUP command. If the kernel rejects a command,
+        the remaining commands are submitted with another call. The updates
+        of other tasks are delegated to their
+        :meth:`~can.broadcastmanager.ModifiableCyclicTaskABC.modify_data`.
+
+        :param updates:
+            The new messages of each task, with the same constraints as for
+            :meth:`CyclicSendTask.modify_data`.
+
+        :return:
+            The exception of each task which could not be updated. The
+            mapping is empty if all tasks were updated.
+        """
+        if _sendmmsg is None:
+            return super().modify_periodic_tasks(updates)
+
+        errors: dict[can.broadcastmanager.ModifiableCyclicTaskABC, Exception] = {}
+        pending: dict[
+            socket.socket, list[tuple[CyclicSendTask, Sequence[Message], bytes]]
+        ] = {}
+        others: dict[
+            can.broadcastmanager.ModifiableCyclicTaskABC, Message | Sequence[Message]
+        ] = {}
+        for task, new_messages in updates.items():
+            if not isinstance(task, CyclicSendTask):
+                others[task] = new_messages
+                continue
+            # pylint: disable=protected-access
+            try:
+                messages = task._check_and_convert_messages(new_messages)
+                task._check_modified_messages(messages)
+            except (TypeError, ValueError) as error:
+                errors[task] = error
+                continue
+            pending.setdefault(task.bcm_socket, []).append(
+                (task, messages, task._build_update(messages))
+            )
+
+        for bcm_socket, commands in pending.items():
+            log.debug("Sending %d BCM commands", len(commands))
+            index = 0
+            while index < len(commands):
+                try:
+                    sent = send_frames(
+                        bcm_socket, [command for _, _, command in commands[index:]]
+                    )
+                except OSError as error:
+                    # only the first of the remaining commands was rejected
+                    errors[commands[index][0]] = _bcm_error(error)
+                    index += 1
+                    continue
+                for task, messages, _ in commands[index : index + sent]:
+                    task.messages = messages
+                index += sent
+
+        errors.update(super().modify_periodic_tasks(others))
+        return errors
+
+    def subscribe_changes(
+        self,
+        arbitration_id: int,
+        data_mask: bytes | bytearray | Sequence[int] | None = None,
+        throttle: float | None = None,
+        is_extended_id: bool = False,
+        is_fd: bool = False,
+        channel: str | None = None,
+    ) -> None:
+        """Let the kernel forward the frames of an arbitration ID only when
+        their content changed or at a limited rate.
+
+        The subscription is set up with the RX_SETUP command of the Linux
+        Broadcast Manager, such that unchanged or too frequent frames are
+        dropped before they reach Python. The forwarded frames are returned
+        by :meth:`~can.BusABC.recv` like any other message and thus also
+        reach a :class:`~can.Notifier`:
+
+        .. code-block:: python
+
+            # forward 0x123 when the lower nibble of its second byte changes,
+            # but at most every 100 ms
+            bus.subscribe_changes(0x123, data_mask=b"\x00\x0f", throttle=0.1)
+
+        The forwarded frames are not subject to the filters of the bus. The
+        frames are still received via the raw socket as well, unless they
+        are excluded with :meth:`~can.BusABC.set_filters`.
+
+        Subscribe before adding the bus to a :class:`~can.Notifier` which
+        watches :meth:`fileno`, since it refers to a different descriptor
+        once the first subscription exists.
+
+        :param arbitration_id:
+            The arbitration ID of the frames to forward.
+        :param data_mask:
+            The bits of the payload to compare with the previous frame. A
+            frame is forwarded if any of these bits or the length of the
+            payload changed. If not given, every frame is forwarded, which
+            is mostly useful together with *throttle*.
+        :param throttle:
+            The minimum time in seconds between two forwarded frames. If a
+            frame changes within this time, the latest frame is forwarded
+            when the time has elapsed.
+        :param is_extended_id:
+            Whether the arbitration ID is an extended (29 bit) identifier.
+        :param is_fd:
+            Whether the frames are CAN FD frames, which the kernel handles
+            separately from classical frames.
+        :param channel:
+            The channel to subscribe on, if this bus receives from all
+            channels. Defaults to all channels.
+
+        :raises ValueError:
+            If *throttle* is not positive or *data_mask* is longer than a
+            payload.
+        :raises ~can.exceptions.CanOperationError:
+            If the kernel rejected the subscription.
+        """
+        if throttle is not None and throttle <= 0:
+            raise ValueError(f"throttle must be positive, got {throttle}")
+
+        can_id = arbitration_id
+        if is_extended_id:
+            can_id |= constants.CAN_EFF_FLAG
+        flags = constants.CAN_FD_FRAME if is_fd else 0
+
+        if data_mask is None:
+            data = build_bcm_rx_setup_header(can_id, throttle or 0.0, flags, 0)
+        else:
+            mask = bytes(data_mask)
+            max_length = constants.CANFD_MAX_DLEN if is_fd else constants.CAN_MAX_DLEN
+            if len(mask) > max_length:
+                raise ValueError(
+                    f"data_mask must not be longer than {max_length} bytes"
+                )
+            # a change of the payload length is a change as well
+            flags |= constants.RX_CHECK_DLC
+            mask_frame = build_can_frame(
+                Message(
+                    arbitration_id=arbitration_id,
+                    is_extended_id=is_extended_id,
+                    is_fd=is_fd,
+                    data=mask,
+                )
+            )
+            data = build_bcm_rx_setup_header(can_id, throttle or 0.0, flags)
+            data += mask_frame
+
+        address = channel if self.channel == "" else None
+        send_bcm(self._get_bcm_rx_socket(), data, address)
+        self._subscriptions.add((address or "", can_id, is_fd))
+
+    def unsubscribe_changes(
+        self,
+        arbitration_id: int,
+        is_extended_id: bool = False,
+        is_fd: bool = False,
+        channel: str | None = None,
+    ) -> None:
+        """Remove a subscription of :meth:`subscribe_changes`.
+
+        :param arbitration_id:
+            The arbitration ID of the subscription.
+        :param is_extended_id:
+            Whether the arbitration ID is an extended (29 bit) identifier.
+        :param is_fd:
+            Whether the subscription is for CAN FD frames.
+        :param channel:
+            The channel of the subscription, if this bus receives from all
+            channels.
+
+        :raises ValueError:
+            If no such subscription exists.
+        """
+        can_id = arbitration_id
+        if is_extended_id:
+            can_id |= constants.CAN_EFF_FLAG
+        address = channel if self.channel == "" else None
+
+        key = (address or "", can_id, is_fd)
+        if key not in self._subscriptions:
+            raise ValueError(
+                f"No subscription for arbitration ID 0x{arbitration_id:X} exists"
+            )
+        self._subscriptions.remove(key)
+        send_bcm(
+            self._get_bcm_rx_socket(),
+            build_bcm_rx_delete_header(can_id, constants.CAN_FD_FRAME if is_fd else 0),
+            address,
+        )
+
+    def _get_bcm_rx_socket(self) -> socket.socket:
+        if self._bcm_rx_socket is None:
+            bcm_socket = create_bcm_socket(self.channel)
+            bcm_socket.setsockopt(socket.SOL_SOCKET, constants.SO_TIMESTAMPNS, 1)
+
+            # a single descriptor which is readable if any socket is
+            epoll = select.epoll()
+            epoll.register(self.socket.fileno(), select.EPOLLIN)
+            epoll.register(bcm_socket.fileno(), select.EPOLLIN)
+
+            self._bcm_rx_epoll = epoll
+            self._bcm_rx_socket = bcm_socket
+        return self._bcm_rx_socket
+
     def _apply_filters(self, filters: can.typechecking.CanFilters | None) -> None:
         try:
             self.socket.setsockopt(
@@ -983,6 +1872,9 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
             self._is_filtered = True
 
     def fileno(self) -> int:
+        if self._bcm_rx_epoll is not None:
+            # changes forwarded by the broadcast manager arrive on another socket
+            return self._bcm_rx_epoll.fileno()
         return self.socket.fileno()
 
     @staticmethod
@@ -337,6 +337,17 @@ class SocketCanDaemonBus(can.BusABC):
                 f"Failed to receive: {exc}  {traceback.format_exc()}"
             ) from exc
 
+    def _recv_internal_batch(self, max_messages, timeout):
+        can_message, _ = self._recv_internal(timeout)
+        if can_message is None:
+            return [], False
+
+        # a single TCP read usually carries several frames, hand out all of them
+        messages = [can_message]
+        while self.__message_buffer and len(messages) < max_messages:
+            messages.append(self.__message_buffer.popleft())
+        return messages, False
+
     def _tcp_send(self, msg: str):
         log.debug(f"Sending TCP Message: '{msg}'")
         self.__socket.sendall(msg.encode("ascii"))
@@ -131,6 +131,28 @@ class UdpMulticastBus(BusABC):
         if not result:
             return None, False
 
+        return self._unpack_received(result), False
+
+    def _recv_internal_batch(
+        self, max_messages: int, timeout: float | None
+    ) -> tuple[list[Message], bool]:
+        msgs: list[Message] = []
+        result = self._multicast.recv(timeout)
+
+        while result:
+            can_message = self._unpack_received(result)
+            if can_message is not None:
+                msgs.append(can_message)
+                if len(msgs) >= max_messages:
+                    break
+            # only collect datagrams which have already arrived
+            result = self._multicast.recv(0.0)
+
+        return msgs, False
+
+    def _unpack_received(
+        self, result: tuple[bytes, IP_ADDRESS_INFO, float]
+    ) -> Message | None:
         data, _, timestamp = result
         try:
             can_message = unpack_message(
@@ -142,9 +164,9 @@ class UdpMulticastBus(BusABC):
             ) from exception
 
         if self._can_protocol is not CanProtocol.CAN_FD and can_message.is_fd:
-            return None, False
+            return None
 
-        return can_message, False
+        return can_message
 
     def send(self, msg: can.Message, timeout: float | None = None) -> None:
         if self._can_protocol is not CanProtocol.CAN_FD and msg.is_fd:
@@ -9,6 +9,7 @@ and reside in the same process will receive the same messages.
 import logging
 import queue
 import time
+from collections.abc import Sequence
 from copy import deepcopy
 from random import randint
 from threading import RLock
@@ -127,6 +128,23 @@ class VirtualBus(BusABC):
         else:
             return msg, False
 
+    def _recv_internal_batch(
+        self, max_messages: int, timeout: float | None
+    ) -> tuple[list[Message], bool]:
+        self._check_if_open()
+        try:
+            msgs = [self.queue.get(block=True, timeout=timeout)]
+        except queue.Empty:
+            return [], False
+
+        # drain whatever else is already waiting without blocking again
+        while len(msgs) < max_messages:
+            try:
+                msgs.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return msgs, False
+
     def send(self, msg: Message, timeout: float | None = None) -> None:
         self._check_if_open()
 
@@ -148,6 +166,46 @@ class VirtualBus(BusABC):
         if not all_sent:
             raise CanOperationError("Could not send message to one or more recipients")
 
+    def send_batch(self, msgs: Sequence[Message], timeout: float | None = None) -> int:
+        """Send multiple messages to all listening buses.
+
+        All messages are added to the queue of each receiver while holding
+        the lock of that queue only once. If some receivers cannot take all
+        messages in time, every receiver only gets the messages which all of
+        them can take, such that the remaining messages can be sent again.
+
+        :return:
+            The number of messages that were received by all recipients.
+        """
+        self._check_if_open()
+        if not msgs:
+            return 0
+
+        timestamps = [
+            msg.timestamp if self.preserve_timestamps else time.time() for msg in msgs
+        ]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        recipients = [
+            bus_queue
+            for bus_queue in self.channel
+            if bus_queue is not self.queue or self.receive_own_messages
+        ]
+        all_sent = _wait_for_space(recipients, len(msgs), deadline)
+        if not all_sent:
+            raise CanOperationError("Could not send message to one or more recipients")
+
+        for bus_queue in recipients:
+            msg_copies = []
+            for msg, timestamp in zip(msgs[:all_sent], timestamps, strict=False):
+                msg_copy = deepcopy(msg)
+                msg_copy.timestamp = timestamp
+                msg_copy.channel = self.channel_id
+                msg_copy.is_rx = bus_queue is not self.queue
+                msg_copies.append(msg_copy)
+            _put_all(bus_queue, msg_copies, deadline)
+
+        return all_sent
+
     def shutdown(self) -> None:
         super().shutdown()
         if self._open:
@@ -189,3 +247,66 @@ class VirtualBus(BusABC):
             {"interface": "virtual", "channel": channel}
             for channel in available_channels
         ]
+
+
+def _wait_for_space(
+    bus_queues: list["queue.Queue[Message]"], wanted: int, deadline: float | None
+) -> int:
+    """Wait until all queues have room for *wanted* messages or the deadline
+    has passed.
+
+    :return: the number of messages which every queue can take
+    """
+    while True:
+        available = wanted
+        fullest = None
+        for bus_queue in bus_queues:
+            with bus_queue.mutex:
+                if bus_queue.maxsize > 0:
+                    free = bus_queue.maxsize - len(bus_queue.queue)
+                    if free < available:
+                        available = max(free, 0)
+                        fullest = bus_queue
+        if fullest is None:
+            return wanted
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0.0:
+            return available
+        with fullest.not_full:
+            if fullest.maxsize - len(fullest.queue) <= available:
+                fullest.not_full.wait(remaining)
+
+
+def _put_all(
+    bus_queue: "queue.Queue[Message]", msgs: list[Message], deadline: float | None
+) -> int:
+    """Put all messages into a queue while acquiring its lock only once.
+
+    This mirrors :meth:`queue.Queue.put` for multiple items at once.
+
+    :return: the number of messages that were put into the queue before the
+        deadline has passed
+    """
+    put = 0
+    with bus_queue.not_full:
+        for msg in msgs:
+            # wait for free space in bounded queues, like Queue.put() does
+            while 0 < bus_queue.maxsize <= len(bus_queue.queue):
+                if deadline is None:
+                    bus_queue.not_full.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0:
+                    break
+                bus_queue.not_full.wait(remaining)
+            if 0 < bus_queue.maxsize <= len(bus_queue.queue):
+                # the queue is still full after the deadline
+                break
+            bus_queue.queue.append(msg)
+            put += 1
+
+        if put:
+            bus_queue.unfinished_tasks += put
+            bus_queue.not_empty.notify(put)
+    return put
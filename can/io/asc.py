@@ -8,7 +8,7 @@ Example .asc files:
 
 import logging
 import re
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from datetime import datetime, timezone, tzinfo
 from typing import Any, Final, Literal, TextIO
 
@@ -454,6 +454,12 @@ class ASCWriter(TextIOMessageWriter):
             logger.debug("ASCWriter: ignoring empty message")
             return
 
+        self.file.write(self._format_event(message, timestamp))
+
+    def _format_event(self, message: str, timestamp: float | None = None) -> str:
+        """Format an event as one line, preceded by the header if this is
+        the first event."""
+        header = ""
         # this is the case for the very first message:
         if not self.header_written:
             self.started = self.last_timestamp = timestamp or 0.0
@@ -461,9 +467,12 @@ class ASCWriter(TextIOMessageWriter):
             start_time = datetime.fromtimestamp(self.last_timestamp, tz=self._timezone)
             formatted_date = self._format_header_datetime(start_time)
 
-            self.file.write(f"Begin Triggerblock {formatted_date}\n")
             self.header_written = True
-            self.log_event("Start of measurement")  # caution: this is a recursive call!
+            header = (
+                f"Begin Triggerblock {formatted_date}\n"
+                # caution: this is a recursive call!
+                + self._format_event("Start of measurement")
+            )
         # Use last known timestamp if unknown
         if timestamp is None:
             timestamp = self.last_timestamp
@@ -478,9 +487,23 @@ class ASCWriter(TextIOMessageWriter):
         # Track last timestamp so the next event can compute its delta
         self.last_timestamp = timestamp
         line = self.FORMAT_EVENT.format(timestamp=written_timestamp, message=message)
-        self.file.write(line)
+        return header + line
 
     def on_message_received(self, msg: Message) -> None:
+        self.log_event(self._format_message(msg), msg.timestamp)
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        self.file.write(
+            "".join(
+                [
+                    self._format_event(self._format_message(msg), msg.timestamp)
+                    for msg in msgs
+                ]
+            )
+        )
+
+    def _format_message(self, msg: Message) -> str:
+        """Format the message part of the event line of a CAN message."""
         channel = channel2int(msg.channel)
         if channel is None:
             channel = self.channel
@@ -489,8 +512,7 @@ class ASCWriter(TextIOMessageWriter):
             channel += 1
 
         if msg.is_error_frame:
-            self.log_event(f"{channel}  ErrorFrame", msg.timestamp)
-            return
+            return f"{channel}  ErrorFrame"
         if msg.is_remote_frame:
             dtype = f"r {msg.dlc:x}"  # New after v8.5
             data: str = ""
@@ -534,4 +556,4 @@ class ASCWriter(TextIOMessageWriter):
                 dtype=dtype,
                 data=data,
             )
-        self.log_event(serialized, msg.timestamp)
+        return serialized
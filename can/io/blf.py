@@ -12,20 +12,35 @@ of uncompressed data each. This data contains the actual CAN messages and other
 objects types.
 """
 
+import concurrent.futures
 import datetime
+import io
+import json
 import logging
+import queue
 import struct
+import threading
 import time
 import zlib
-from collections.abc import Generator, Iterator
+from collections import deque
+from collections.abc import Generator, Iterator, Sequence
 from decimal import Decimal
-from typing import Any, BinaryIO, cast
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple, cast
 
+from ..frame_array import MAX_DATA_LENGTH, FrameArray, FrameFlags
 from ..message import Message
 from ..typechecking import StringPathLike
-from ..util import channel2int, dlc2len, len2dlc
+from ..util import CAN_FD_DLC, channel2int, dlc2len, len2dlc
 from .generic import BinaryIOMessageReader, BinaryIOMessageWriter
 
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
 TSystemTime = tuple[int, int, int, int, int, int, int, int]
 
 
@@ -33,6 +48,20 @@ class BLFParseError(Exception):
     """BLF file could not be parsed correctly."""
 
 
+class BLFContainerInfo(NamedTuple):
+    """An entry of the container index of a :class:`~can.BLFReader`."""
+
+    #: The position of the log container object in the file
+    offset: int
+    #: The position of the first object starting in the uncompressed data of
+    #: the container, the bytes before belong to an object of a previous container
+    data_offset: int | None
+    #: The earliest timestamp of the objects starting in the container
+    start_timestamp: float | None
+    #: The latest timestamp of the objects starting in the container
+    stop_timestamp: float | None
+
+
 LOG = logging.getLogger(__name__)
 
 # signature ("LOGG"), header size,
@@ -54,6 +83,9 @@ OBJ_HEADER_V1_STRUCT = struct.Struct("<LHHQ")
 # flags, timestamp status, object version, timestamp, (original timestamp)
 OBJ_HEADER_V2_STRUCT = struct.Struct("<LBxHQ8x")
 
+# flags, timestamp: common to both header versions
+OBJ_HEADER_TIMESTAMP_STRUCT = struct.Struct("<L4xQ")
+
 # compression method, size uncompressed
 LOG_CONTAINER_STRUCT = struct.Struct("<H6xL4x")
 
@@ -103,6 +135,64 @@ TIME_ONE_NANS = 0x00000002
 TIME_TEN_MICS_FACTOR = Decimal("1e-5")
 TIME_ONE_NANS_FACTOR = Decimal("1e-9")
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+_FRAME_OBJECT_TYPES = frozenset(
+    (CAN_MESSAGE, CAN_MESSAGE2, CAN_ERROR_EXT, CAN_FD_MESSAGE, CAN_FD_MESSAGE_64)
+)
+
+if np is not None:
+    # NumPy equivalents of the structs above for decoding many objects at once,
+    # the flags and the timestamp are at the same position in both header versions
+    _OBJ_HEADER_BASE_DTYPE = np.dtype(
+        {
+            "names": ["obj_size"],
+            "formats": ["<u4"],
+            "offsets": [8],
+            "itemsize": OBJ_HEADER_BASE_STRUCT.size,
+        }
+    )
+    _OBJ_HEADER_DTYPE = np.dtype(
+        {
+            "names": [
+                "header_size",
+                "header_version",
+                "obj_size",
+                "obj_type",
+                "flags",
+                "timestamp",
+            ],
+            "formats": ["<u2", "<u2", "<u4", "<u4", "<u4", "<u8"],
+            "offsets": [4, 6, 8, 12, 16, 24],
+            "itemsize": OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_V1_STRUCT.size,
+        }
+    )
+    _CAN_MSG_DTYPE = np.dtype(
+        {
+            "names": ["channel", "flags", "dlc", "can_id", "data"],
+            "formats": ["<u2", "u1", "u1", "<u4", ("u1", 8)],
+            "offsets": [0, 2, 3, 4, 8],
+            "itemsize": CAN_MSG_STRUCT.size,
+        }
+    )
+    _CAN_FD_MSG_DTYPE = np.dtype(
+        {
+            "names": [
+                "channel",
+                "flags",
+                "dlc",
+                "can_id",
+                "fd_flags",
+                "valid_bytes",
+                "data",
+            ],
+            "formats": ["<u2", "u1", "u1", "<u4", "u1", "u1", ("u1", 64)],
+            "offsets": [0, 2, 3, 4, 13, 14, 20],
+            "itemsize": CAN_FD_MSG_STRUCT.size,
+        }
+    )
+    _DLC_TO_LENGTH = np.array(CAN_FD_DLC, dtype=np.uint8)
+
 
 def timestamp_to_systemtime(timestamp: float | None) -> TSystemTime:
     if timestamp is None or timestamp < 631152000:
@@ -121,6 +211,24 @@ def timestamp_to_systemtime(timestamp: float | None) -> TSystemTime:
     )
 
 
+def systemtime_to_timestamp_ns(systemtime: TSystemTime) -> int:
+    """Convert a SYSTEMTIME to an exact timestamp in nanoseconds since the epoch."""
+    try:
+        t = datetime.datetime(
+            systemtime[0],
+            systemtime[1],
+            systemtime[3],
+            systemtime[4],
+            systemtime[5],
+            systemtime[6],
+            systemtime[7] * 1000,
+            tzinfo=datetime.timezone.utc,
+        )
+    except ValueError:
+        return 0
+    return (t - _EPOCH) // datetime.timedelta(microseconds=1) * 1000
+
+
 def systemtime_to_timestamp(systemtime: TSystemTime) -> float:
     try:
         t = datetime.datetime(
@@ -149,13 +257,39 @@ class BLFReader(BinaryIOMessageReader):
     def __init__(
         self,
         file: StringPathLike | BinaryIO,
+        timestamp_ns: bool = False,
+        workers: int = 0,
+        prefetch: int | None = None,
         **kwargs: Any,
     ) -> None:
         """
         :param file: a path-like object or as file-like object to read from
                      If this is a file-like object, is has to opened in binary
                      read mode, not text read mode.
+        :param timestamp_ns:
+            If True, the timestamps of the messages are integers in nanoseconds
+            since the epoch, like :func:`time.time_ns`, which preserves the full
+            precision of the file. Otherwise, they are floats in seconds.
+            This does not affect :meth:`read_arrays`.
+        :param workers:
+            The number of threads decompressing the upcoming log containers
+            while the current one is being parsed. Since :mod:`zlib` releases
+            the GIL, this speeds up reading on multi-core machines.
+            By default, the containers are decompressed on the calling thread.
+        :param prefetch:
+            The maximum number of containers being decompressed in advance
+            if *workers* is used. Defaults to twice the number of workers.
+
+        :raises ValueError:
+            If *workers* is negative or *prefetch* is smaller than one.
         """
+        if workers < 0:
+            raise ValueError("workers must not be negative")
+        if prefetch is None:
+            prefetch = 2 * workers
+        elif prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+
         super().__init__(file, mode="rb")
         data = self.file.read(FILE_HEADER_STRUCT.size)
         header = FILE_HEADER_STRUCT.unpack(data)
@@ -167,16 +301,308 @@ class BLFReader(BinaryIOMessageReader):
         self.start_timestamp = systemtime_to_timestamp(
             cast("TSystemTime", header[14:22])
         )
+        self.start_timestamp_ns = systemtime_to_timestamp_ns(
+            cast("TSystemTime", header[14:22])
+        )
         self.stop_timestamp = systemtime_to_timestamp(
             cast("TSystemTime", header[22:30])
         )
+        self.timestamp_ns = timestamp_ns
+        self.workers = workers
+        self.prefetch = prefetch
         # Read rest of header
         self.file.read(header[1] - FILE_HEADER_STRUCT.size)
         self._tail = b""
         self._pos = 0
+        # the number of bytes to skip in the next container after seeking
+        self._skip = 0
+        self._seek_timestamp: float | int | None = None
+        self._objects_offset = header[1]
+        self._container_index: list[BLFContainerInfo] | None = None
 
     def __iter__(self) -> Generator[Message, None, None]:
+        seek_timestamp, self._seek_timestamp = self._seek_timestamp, None
+        for data in self._iter_containers():
+            for msg in self._parse_container(data):
+                if seek_timestamp is not None:
+                    # skip the messages before the target of seek_time()
+                    if msg.timestamp < seek_timestamp:
+                        continue
+                    seek_timestamp = None
+                yield msg
+        self.stop()
+
+    @property
+    def container_index(self) -> list[BLFContainerInfo]:
+        """The index of all log containers in the file.
+
+        It is built by :meth:`build_container_index` on first access, unless
+        it has been loaded with :meth:`load_container_index` before.
+        """
+        if self._container_index is None:
+            self._container_index = self.build_container_index()
+        return self._container_index
+
+    def build_container_index(self) -> list[BLFContainerInfo]:
+        """Scan the file and create an index of its log containers.
+
+        Each container is decompressed once to find the timestamps of the
+        objects, but none of them are decoded. Reading only the object
+        headers is not possible: the deflate stream of a container can only
+        be decompressed from its start, and the time bounds depend on every
+        object, because the timestamps are not necessarily ordered and
+        objects may continue in the next container. The position in the file is
+        restored afterwards, so this can be called at any time.
+        Requires a seekable file.
+        """
+        position = self.file.tell()
+        self.file.seek(self._objects_offset)
+        # offset, data offset, start timestamp, stop timestamp
+        entries: list[list[Any]] = []
+        tail = b""
+        # the container in which the object in the tail starts
+        tail_owner = -1
+        try:
+            while True:
+                offset = self.file.tell()
+                data = self.file.read(OBJ_HEADER_BASE_STRUCT.size)
+                if len(data) < OBJ_HEADER_BASE_STRUCT.size:
+                    # EOF
+                    break
+                signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE_STRUCT.unpack(
+                    data
+                )
+                if signature != b"LOBJ":
+                    raise BLFParseError()
+                obj_data = self.file.read(obj_size - OBJ_HEADER_BASE_STRUCT.size)
+                # Read padding bytes
+                self.file.read(obj_size % 4)
+                if obj_type != LOG_CONTAINER:
+                    continue
+
+                method, _ = LOG_CONTAINER_STRUCT.unpack_from(obj_data)
+                decompressed = _decompress_container(
+                    method, obj_data[LOG_CONTAINER_STRUCT.size :]
+                )
+                if decompressed is None:
+                    continue
+                entry: list[Any] = [offset, None, None, None]
+                entries.append(entry)
+                start = len(tail)
+                data = b"".join((tail, decompressed))
+                objects, rest = self._scan_timestamps(data)
+                for pos, timestamp in objects:
+                    if pos >= start:
+                        owner = entry
+                        if entry[1] is None:
+                            entry[1] = pos - start
+                    else:
+                        owner = entries[tail_owner]
+                    if owner[2] is None:
+                        owner[2] = owner[3] = timestamp
+                    else:
+                        owner[2] = min(owner[2], timestamp)
+                        owner[3] = max(owner[3], timestamp)
+                if rest >= start:
+                    # the remaining object starts in this container
+                    tail_owner = len(entries) - 1
+                    if entry[1] is None:
+                        entry[1] = rest - start
+                tail = data[rest:]
+        finally:
+            self.file.seek(position)
+        return [BLFContainerInfo(*entry) for entry in entries]
+
+    def _scan_timestamps(self, data: bytes) -> tuple[list[tuple[int, float]], int]:
+        """Find the positions and timestamps of all complete objects in the data.
+
+        :return: the objects and the position of the remaining data
+        """
+        unpack_obj_header_base = OBJ_HEADER_BASE_STRUCT.unpack_from
+        unpack_obj_header_timestamp = OBJ_HEADER_TIMESTAMP_STRUCT.unpack_from
+        header_size = OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_TIMESTAMP_STRUCT.size
+        start_timestamp = self.start_timestamp
+        max_pos = len(data)
+        objects: list[tuple[int, float]] = []
+        pos = 0
+
+        while True:
+            rest = pos
+            try:
+                pos = data.index(b"LOBJ", pos, pos + 8)
+            except ValueError:
+                if pos + 8 > max_pos:
+                    # Not enough data in container
+                    return objects, rest
+                raise BLFParseError("Could not find next object") from None
+            if pos + OBJ_HEADER_BASE_STRUCT.size > max_pos:
+                return objects, rest
+            _, _, header_version, obj_size, _ = unpack_obj_header_base(data, pos)
+            next_pos = pos + obj_size
+            if next_pos > max_pos:
+                # This object continues in the next container
+                return objects, rest
+            if header_version in (1, 2) and obj_size >= header_size:
+                flags, timestamp = unpack_obj_header_timestamp(
+                    data, pos + OBJ_HEADER_BASE_STRUCT.size
+                )
+                if flags == TIME_TEN_MICS:
+                    timestamp *= 10_000
+                objects.append((pos, timestamp / 1_000_000_000 + start_timestamp))
+            pos = next_pos
+
+    def save_container_index(self, path: StringPathLike) -> None:
+        """Store the :attr:`container_index` in a sidecar file.
+
+        :param path: the path of the index file, e.g. the path of the log file
+            with an additional ``.idx`` suffix
+        """
+        index = {
+            "file_size": self.file_size,
+            "object_count": self.object_count,
+            "containers": [list(entry) for entry in self.container_index],
+        }
+        with open(path, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file)
+
+    def load_container_index(self, path: StringPathLike) -> None:
+        """Load a container index stored by :meth:`save_container_index`.
+
+        :raises ValueError: If the index does not belong to this file.
+        """
+        with open(path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        if (
+            index.get("file_size") != self.file_size
+            or index.get("object_count") != self.object_count
+        ):
+            raise ValueError(f"The container index {path} does not match the file")
+        self._container_index = [
+            BLFContainerInfo(*entry) for entry in index["containers"]
+        ]
+
+    def seek_time(self, timestamp: float) -> None:
+        """Continue reading at the given time.
+
+        The following iteration starts with the first message at or after
+        *timestamp*, assuming the objects in the file are sorted by time.
+        Only the containers from there on are read and decompressed.
+        This uses the :attr:`container_index` and requires a seekable file.
+
+        :param timestamp: the time in seconds since the epoch
+        """
+        self._seek_container(timestamp)
+        self._seek_timestamp = self._convert_timestamp(timestamp)
+
+    def iter_range(
+        self, start: float | None = None, stop: float | None = None
+    ) -> Generator[Message, None, None]:
+        """Iterate over the messages with ``start <= timestamp < stop``.
+
+        Only the log containers overlapping the time window are decompressed,
+        see :attr:`container_index`. Unlike iterating over the reader, this
+        does not close the file, so several ranges can be read one after
+        another.
+
+        :param start: the time in seconds since the epoch or None to start
+            at the beginning of the file
+        :param stop: the time in seconds since the epoch or None to read
+            until the end of the file
+        """
+        index = self.container_index
+        self._seek_container(start)
+        end_offset = None
+        if stop is not None:
+            for position, entry in enumerate(index):
+                if (
+                    entry.start_timestamp is not None
+                    and entry.start_timestamp >= stop
+                    and entry.offset > self.file.tell()
+                ):
+                    # read one more container for the objects continued there
+                    if position + 1 < len(index):
+                        end_offset = index[position + 1].offset
+                    break
+
+        lower = None if start is None else self._convert_timestamp(start)
+        upper = None if stop is None else self._convert_timestamp(stop)
+        for data in self._iter_containers(end_offset):
+            for msg in self._parse_container(data):
+                if (lower is None or msg.timestamp >= lower) and (
+                    upper is None or msg.timestamp < upper
+                ):
+                    yield msg
+
+    def _seek_container(self, timestamp: float | None) -> None:
+        """Position the file at the first container with objects at or after
+        *timestamp*."""
+        index = self.container_index
+        self._tail = b""
+        self._skip = 0
+        self._seek_timestamp = None
+        if timestamp is None:
+            self.file.seek(self._objects_offset)
+            return
+        for entry in index:
+            if entry.stop_timestamp is not None and entry.stop_timestamp >= timestamp:
+                self.file.seek(entry.offset)
+                self._skip = entry.data_offset or 0
+                return
+        self.file.seek(0, io.SEEK_END)
+
+    def _convert_timestamp(self, timestamp: float) -> float | int:
+        """Convert a timestamp in seconds to the unit of the messages."""
+        if self.timestamp_ns:
+            return round(timestamp * 1_000_000_000)
+        return timestamp
+
+    def _iter_containers(
+        self, end_offset: int | None = None
+    ) -> Generator[bytes, None, None]:
+        """Read the log containers and yield their uncompressed data.
+
+        :param end_offset: stop at the container at this position in the file
+        """
+        if not self.workers:
+            for method, container_data in self._iter_compressed_containers(end_offset):
+                data = _decompress_container(method, container_data)
+                if data is not None:
+                    yield data
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="BLFReader"
+        ) as executor:
+            pending: deque[concurrent.futures.Future[bytes | None]] = deque()
+            try:
+                for method, container_data in self._iter_compressed_containers(
+                    end_offset
+                ):
+                    pending.append(
+                        executor.submit(_decompress_container, method, container_data)
+                    )
+                    # keep the order of the containers, so that objects spanning
+                    # multiple containers are stitched together correctly
+                    while len(pending) >= self.prefetch:
+                        data = pending.popleft().result()
+                        if data is not None:
+                            yield data
+                while pending:
+                    data = pending.popleft().result()
+                    if data is not None:
+                        yield data
+            finally:
+                # the iteration might have been aborted
+                for future in pending:
+                    future.cancel()
+
+    def _iter_compressed_containers(
+        self, end_offset: int | None = None
+    ) -> Generator[tuple[int, bytes], None, None]:
+        """Read the log containers and yield their compression method and data."""
         while True:
+            if end_offset is not None and self.file.tell() >= end_offset:
+                break
             data = self.file.read(OBJ_HEADER_BASE_STRUCT.size)
             if not data:
                 # EOF
@@ -191,20 +617,12 @@ class BLFReader(BinaryIOMessageReader):
 
             if obj_type == LOG_CONTAINER:
                 method, _ = LOG_CONTAINER_STRUCT.unpack_from(obj_data)
-                container_data = obj_data[LOG_CONTAINER_STRUCT.size :]
-                if method == NO_COMPRESSION:
-                    data = container_data
-                elif method == ZLIB_DEFLATE:
-                    zobj = zlib.decompressobj()
-                    data = zobj.decompress(container_data)
-                else:
-                    # Unknown compression method
-                    LOG.warning("Unknown compression method (%d)", method)
-                    continue
-                yield from self._parse_container(data)
-        self.stop()
+                yield method, obj_data[LOG_CONTAINER_STRUCT.size :]
 
     def _parse_container(self, data: bytes) -> Iterator[Message]:
+        if self._skip:
+            data = data[self._skip :]
+            self._skip = 0
         if self._tail:
             data = b"".join((self._tail, data))
         try:
@@ -215,6 +633,229 @@ class BLFReader(BinaryIOMessageReader):
         # Save the remaining data that could not be processed
         self._tail = data[self._pos :]
 
+    def read_arrays(self, chunk_size: int = 65536) -> Iterator[FrameArray]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        chunk = FrameArray(chunk_size)
+        for data in self._iter_containers():
+            frames = self._parse_container_arrays(data)
+            start = 0
+            while start < len(frames):
+                count = min(chunk_size - len(chunk), len(frames) - start)
+                chunk.extend(frames[start : start + count])
+                start += count
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = FrameArray(chunk_size)
+        if len(chunk):
+            yield chunk
+        self.stop()
+
+    def _parse_container_arrays(self, data: bytes) -> FrameArray:
+        if self._skip:
+            data = data[self._skip :]
+            self._skip = 0
+        if self._tail:
+            data = b"".join((self._tail, data))
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        positions = self._find_objects(data, buffer)
+        # Save the remaining data that could not be processed
+        self._tail = data[self._pos :]
+        return self._decode_frame_objects(data, buffer, positions)
+
+    def _find_objects(
+        self, data: bytes, buffer: "npt.NDArray[Any]"
+    ) -> "npt.NDArray[Any]":
+        """Find the positions of all complete objects in the data.
+
+        All occurrences of the object signature are located at once. Usually
+        each of them is followed by the next one, i.e. the signature does not
+        show up within any payload. Otherwise, this falls back to following
+        the objects one by one like :meth:`_parse_data` does.
+        """
+        max_pos = len(buffer)
+        # the signature cannot overlap with itself, so this finds all of them
+        candidates = np.flatnonzero(
+            (buffer[:-3] == 0x4C)  # "L"
+            & (buffer[1:-2] == 0x4F)  # "O"
+            & (buffer[2:-1] == 0x42)  # "B"
+            & (buffer[3:] == 0x4A)  # "J"
+        )
+        complete_header = candidates + OBJ_HEADER_BASE_STRUCT.size <= max_pos
+        positions = candidates[complete_header]
+        if not len(positions) or positions[0] >= 8:
+            return self._follow_objects(data)
+
+        next_pos = positions + _gather(buffer, positions, _OBJ_HEADER_BASE_DTYPE)[
+            "obj_size"
+        ].astype(np.int64)
+        if not (
+            np.array_equal(
+                np.searchsorted(positions, next_pos[:-1]),
+                np.arange(1, len(positions)),
+            )
+            and np.all(positions[1:] < next_pos[:-1] + 8)
+        ):
+            return self._follow_objects(data)
+
+        # only the last objects may continue in the next container
+        complete = int(np.searchsorted(next_pos, max_pos, side="right"))
+        self._pos = int(next_pos[complete - 1]) if complete else 0
+        if self._pos + 8 <= max_pos and not np.any(
+            (candidates >= self._pos) & (candidates < self._pos + 8)
+        ):
+            raise BLFParseError("Could not find next object")
+        return positions[:complete]
+
+    def _follow_objects(self, data: bytes) -> "npt.NDArray[Any]":
+        """Find the positions of all complete objects one by one."""
+        unpack_obj_header_base = OBJ_HEADER_BASE_STRUCT.unpack_from
+        obj_header_base_size = OBJ_HEADER_BASE_STRUCT.size
+        max_pos = len(data)
+        positions = []
+        pos = 0
+
+        while True:
+            self._pos = pos
+            try:
+                pos = data.index(b"LOBJ", pos, pos + 8)
+            except ValueError:
+                if pos + 8 > max_pos:
+                    # Not enough data in container
+                    break
+                raise BLFParseError("Could not find next object") from None
+            if pos + obj_header_base_size > max_pos:
+                break
+            obj_size = unpack_obj_header_base(data, pos)[3]
+            next_pos = pos + obj_size
+            if next_pos > max_pos:
+                # This object continues in the next container
+                break
+            positions.append(pos)
+            pos = next_pos
+
+        return np.array(positions, dtype=np.int64)
+
+    def _decode_frame_objects(
+        self, data: bytes, buffer: "npt.NDArray[Any]", positions: "npt.NDArray[Any]"
+    ) -> FrameArray:
+        """Decode all CAN objects found by :meth:`_find_objects` at once."""
+        # skip malformed objects which are too short for the header
+        positions = positions[positions + _OBJ_HEADER_DTYPE.itemsize <= len(buffer)]
+        header = _gather(buffer, positions, _OBJ_HEADER_DTYPE)
+        for header_version in np.unique(header["header_version"]):
+            if header_version not in (1, 2):
+                LOG.warning("Unknown object header version (%d)", header_version)
+        selected = np.isin(header["obj_type"], list(_FRAME_OBJECT_TYPES)) & np.isin(
+            header["header_version"], (1, 2)
+        )
+        positions = positions[selected]
+        header = header[selected]
+        obj_types = header["obj_type"]
+        count = len(positions)
+        frames = FrameArray(count)
+        if not count:
+            return frames
+
+        factor = np.where(header["flags"] == TIME_TEN_MICS, 1e5, 1e9)
+        timestamp = header["timestamp"].astype(np.float64) / factor
+        timestamp += self.start_timestamp
+        # position of the object specific data after the header
+        positions = positions + np.where(
+            header["header_version"] == 1,
+            OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_V1_STRUCT.size,
+            OBJ_HEADER_BASE_STRUCT.size + OBJ_HEADER_V2_STRUCT.size,
+        )
+
+        can_id = np.zeros(count, dtype=np.uint32)
+        dlc = np.zeros(count, dtype=np.uint8)
+        flags = np.zeros(count, dtype=np.uint8)
+        channel = np.zeros(count, dtype=np.int64)
+        length = np.zeros(count, dtype=np.uint8)
+        payload = np.zeros((count, MAX_DATA_LENGTH), dtype=np.uint8)
+
+        selected = (obj_types == CAN_MESSAGE) | (obj_types == CAN_MESSAGE2)
+        if selected.any():
+            msgs = _gather(buffer, positions[selected], _CAN_MSG_DTYPE)
+            can_id[selected] = msgs["can_id"]
+            dlc[selected] = msgs["dlc"]
+            flags[selected] = np.where(
+                msgs["flags"] & REMOTE_FLAG, FrameFlags.REMOTE_FRAME, 0
+            ) | np.where(msgs["flags"] & DIR, 0, FrameFlags.RX)
+            channel[selected] = msgs["channel"]
+            length[selected] = np.minimum(msgs["dlc"], 8)
+            payload[selected, :8] = msgs["data"]
+
+        selected = obj_types == CAN_FD_MESSAGE
+        if selected.any():
+            msgs = _gather(buffer, positions[selected], _CAN_FD_MSG_DTYPE)
+            fd_flags = msgs["fd_flags"]
+            can_id[selected] = msgs["can_id"]
+            dlc[selected] = _DLC_TO_LENGTH[np.minimum(msgs["dlc"], 15)]
+            flags[selected] = (
+                np.where(msgs["flags"] & REMOTE_FLAG, FrameFlags.REMOTE_FRAME, 0)
+                | np.where(msgs["flags"] & DIR, 0, FrameFlags.RX)
+                | np.where(fd_flags & EDL, FrameFlags.FD, 0)
+                | np.where(fd_flags & BRS, FrameFlags.BITRATE_SWITCH, 0)
+                | np.where(fd_flags & ESI, FrameFlags.ERROR_STATE_INDICATOR, 0)
+            )
+            channel[selected] = msgs["channel"]
+            length[selected] = np.minimum(msgs["valid_bytes"], MAX_DATA_LENGTH)
+            payload[selected] = msgs["data"]
+
+        # error frames and CAN FD 64 messages are rare, decode them one by one
+        for index in np.flatnonzero(
+            (obj_types == CAN_ERROR_EXT) | (obj_types == CAN_FD_MESSAGE_64)
+        ):
+            pos = int(positions[index])
+            if obj_types[index] == CAN_ERROR_EXT:
+                members = CAN_ERROR_EXT_STRUCT.unpack_from(data, pos)
+                channel[index] = members[0]
+                dlc[index] = members[5]
+                can_id[index] = members[7]
+                flags[index] = FrameFlags.ERROR_FRAME | FrameFlags.RX
+                msg_data = members[9][: members[5]]
+            else:
+                header_size = int(header["header_size"][index])
+                obj_size = int(header["obj_size"][index])
+                members = CAN_FD_MSG_64_STRUCT.unpack_from(data, pos)
+                channel[index] = members[0]
+                dlc[index] = dlc2len(members[1])
+                valid_bytes = members[2]
+                can_id[index] = members[4]
+                fd_flags = members[6]
+                flags[index] = (
+                    (FrameFlags.REMOTE_FRAME if fd_flags & 0x0010 else 0)
+                    | (FrameFlags.FD if fd_flags & 0x1000 else 0)
+                    | (FrameFlags.BITRATE_SWITCH if fd_flags & 0x2000 else 0)
+                    | (FrameFlags.ERROR_STATE_INDICATOR if fd_flags & 0x4000 else 0)
+                    | (0 if members[12] else FrameFlags.RX)
+                )
+                # :issue:`1905`: see _parse_data()
+                data_field_length = min(
+                    valid_bytes,
+                    (members[13] or obj_size) - header_size - CAN_FD_MSG_64_STRUCT.size,
+                )
+                msg_data_offset = pos + CAN_FD_MSG_64_STRUCT.size
+                msg_data = data[msg_data_offset : msg_data_offset + data_field_length]
+            length[index] = min(len(msg_data), MAX_DATA_LENGTH)
+            payload[index, : length[index]] = np.frombuffer(
+                msg_data, dtype=np.uint8, count=length[index]
+            )
+
+        flags |= np.where(can_id & CAN_MSG_EXT, FrameFlags.EXTENDED_ID, 0).astype(
+            np.uint8
+        )
+        # clear the bytes after the data and the data of remote frames
+        length[(flags & FrameFlags.REMOTE_FRAME) != 0] = 0
+        payload[np.arange(MAX_DATA_LENGTH) >= length[:, np.newaxis]] = 0
+
+        frames.extend_columns(
+            timestamp, can_id & 0x1FFFFFFF, dlc, flags, payload, channel - 1
+        )
+        return frames
+
     def _parse_data(self, data: bytes) -> Iterator[Message]:
         """Optimized inner loop by making local copies of global variables
         and class members and hardcoding some values."""
@@ -231,6 +872,8 @@ class BLFReader(BinaryIOMessageReader):
         unpack_can_error_ext = CAN_ERROR_EXT_STRUCT.unpack_from
 
         start_timestamp = self.start_timestamp
+        start_timestamp_ns = self.start_timestamp_ns
+        timestamp_ns = self.timestamp_ns
         max_pos = len(data)
         pos = 0
 
@@ -270,9 +913,14 @@ class BLFReader(BinaryIOMessageReader):
                 pos = next_pos
                 continue
 
-            # Calculate absolute timestamp in seconds
-            factor = TIME_TEN_MICS_FACTOR if flags == 1 else TIME_ONE_NANS_FACTOR
-            timestamp = float(Decimal(timestamp) * factor) + start_timestamp
+            # Calculate the absolute timestamp, using exact integers as long as
+            # possible. The integer division is correctly rounded.
+            if flags == TIME_TEN_MICS:
+                timestamp *= 10_000
+            if timestamp_ns:
+                timestamp += start_timestamp_ns
+            else:
+                timestamp = timestamp / 1_000_000_000 + start_timestamp
 
             if obj_type in (CAN_MESSAGE, CAN_MESSAGE2):
                 channel, flags, dlc, can_id, can_data = unpack_can_msg(data, pos)
@@ -373,6 +1021,31 @@ class BLFReader(BinaryIOMessageReader):
             pos = next_pos
 
 
+def _decompress_container(method: int, container_data: bytes) -> bytes | None:
+    """Decompress the data of a log container.
+
+    :return: the uncompressed data or None if the compression method is unknown
+    """
+    if method == NO_COMPRESSION:
+        return container_data
+    if method == ZLIB_DEFLATE:
+        zobj = zlib.decompressobj()
+        return zobj.decompress(container_data)
+    # Unknown compression method
+    LOG.warning("Unknown compression method (%d)", method)
+    return None
+
+
+def _gather(
+    buffer: "npt.NDArray[Any]",
+    positions: "npt.NDArray[Any]",
+    dtype: "np.dtype[Any]",
+) -> "npt.NDArray[Any]":
+    """Read a structured record of *dtype* at each of the byte *positions*."""
+    indices = positions[:, np.newaxis] + np.arange(dtype.itemsize)
+    return buffer[indices].view(dtype)[:, 0]
+
+
 class BLFWriter(BinaryIOMessageWriter):
     """
     Logs CAN data to a Binary Logging File compatible with Vector's tools.
@@ -390,6 +1063,8 @@ class BLFWriter(BinaryIOMessageWriter):
         append: bool = False,
         channel: int = 1,
         compression_level: int = -1,
+        background: bool = False,
+        max_queued_containers: int = 4,
         **kwargs: Any,
     ) -> None:
         """
@@ -407,7 +1082,21 @@ class BLFWriter(BinaryIOMessageWriter):
             The default value is -1 (Z_DEFAULT_COMPRESSION).
             Z_DEFAULT_COMPRESSION represents a default compromise between
             speed and compression (currently equivalent to level 6).
+        :param background:
+            If True, full log containers are compressed and written by a
+            separate thread, so that :meth:`on_message_received` does not
+            block while compressing. This keeps the receive thread of a
+            :class:`~can.Notifier` responsive on busy buses.
+        :param max_queued_containers:
+            The maximum number of full containers waiting to be written if
+            *background* is used. Adding messages blocks while the queue is
+            full, which limits the memory usage if the disk is too slow.
+
+        :raises ValueError:
+            If *max_queued_containers* is smaller than one.
         """
+        if max_queued_containers < 1:
+            raise ValueError("max_queued_containers must be at least 1")
         try:
             super().__init__(file, mode="rb+" if append else "wb")
         except FileNotFoundError:
@@ -437,7 +1126,7 @@ class BLFWriter(BinaryIOMessageWriter):
                 cast("TSystemTime", header[22:30])
             )
             # Jump to the end of the file
-            self.file.seek(0, 2)
+            self.file.seek(0, io.SEEK_END)
         else:
             self.object_count = 0
             self.uncompressed_size = FILE_HEADER_SIZE
@@ -446,6 +1135,23 @@ class BLFWriter(BinaryIOMessageWriter):
             # Write a default header which will be updated when stopped
             self._write_header(FILE_HEADER_SIZE)
 
+        self._queued_size = 0
+        self._queued_size_lock = threading.Lock()
+        # the sizes of the containers written so far before and after
+        # compression, to estimate the size of the queued ones
+        self._written_uncompressed_size = 0
+        self._written_compressed_size = 0
+        self._writer_error: BaseException | None = None
+        self._writer_thread: threading.Thread | None = None
+        if background:
+            self._queue: queue.Queue[memoryview | None] = queue.Queue(
+                max_queued_containers
+            )
+            self._writer_thread = threading.Thread(
+                target=self._write_containers, name="BLFWriter", daemon=True
+            )
+            self._writer_thread.start()
+
     def _write_header(self, filesize: int) -> None:
         header = [b"LOGG", FILE_HEADER_SIZE, self.application_id, 0, 0, 0, 2, 6, 8, 1]
         # The meaning of "count of objects read" is unknown
@@ -457,6 +1163,22 @@ class BLFWriter(BinaryIOMessageWriter):
         self.file.write(b"\x00" * (FILE_HEADER_SIZE - FILE_HEADER_STRUCT.size))
 
     def on_message_received(self, msg: Message) -> None:
+        obj_type, data = self._pack_message(msg)
+        self._add_object(obj_type, data, msg.timestamp)
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        pack_message = self._pack_message
+        append_object = self._append_object
+        for msg in msgs:
+            obj_type, data = pack_message(msg)
+            append_object(obj_type, data, msg.timestamp)
+        # the batch may fill several containers
+        while self._buffer_size >= self.max_container_size and not self.file.closed:
+            self._check_writer_error()
+            self._flush()
+
+    def _pack_message(self, msg: Message) -> tuple[int, bytes]:
+        """Return the object type and the object data for a message."""
         channel = channel2int(msg.channel)
         if channel is None:
             channel = self.channel
@@ -485,8 +1207,8 @@ class BLFWriter(BinaryIOMessageWriter):
                 0,  # ext flags
                 can_data,
             )
-            self._add_object(CAN_ERROR_EXT, data, msg.timestamp)
-        elif msg.is_fd:
+            return CAN_ERROR_EXT, data
+        if msg.is_fd:
             fd_flags = EDL
             if msg.bitrate_switch:
                 fd_flags |= BRS
@@ -503,10 +1225,9 @@ class BLFWriter(BinaryIOMessageWriter):
                 len(can_data),
                 can_data,
             )
-            self._add_object(CAN_FD_MESSAGE, data, msg.timestamp)
-        else:
-            data = CAN_MSG_STRUCT.pack(channel, flags, msg.dlc, arb_id, can_data)
-            self._add_object(CAN_MESSAGE, data, msg.timestamp)
+            return CAN_FD_MESSAGE, data
+        data = CAN_MSG_STRUCT.pack(channel, flags, msg.dlc, arb_id, can_data)
+        return CAN_MESSAGE, data
 
     def log_event(self, text: str, timestamp: float | None = None) -> None:
         """Add an arbitrary message to the log file as a global marker.
@@ -532,6 +1253,15 @@ class BLFWriter(BinaryIOMessageWriter):
     def _add_object(
         self, obj_type: int, data: bytes, timestamp: float | None = None
     ) -> None:
+        self._append_object(obj_type, data, timestamp)
+        if self._buffer_size >= self.max_container_size:
+            self._check_writer_error()
+            self._flush()
+
+    def _append_object(
+        self, obj_type: int, data: bytes, timestamp: float | None = None
+    ) -> None:
+        """Append an object to the buffer without flushing it."""
         if timestamp is None:
             timestamp = self.stop_timestamp or time.time()
         if self.start_timestamp is None:
@@ -557,8 +1287,6 @@ class BLFWriter(BinaryIOMessageWriter):
 
         self._buffer_size += obj_size + padding_size
         self.object_count += 1
-        if self._buffer_size >= self.max_container_size:
-            self._flush()
 
     def _flush(self) -> None:
         """Compresses and writes data in the buffer to file."""
@@ -573,6 +1301,33 @@ class BLFWriter(BinaryIOMessageWriter):
         tail = buffer[self.max_container_size :]
         self._buffer = [tail]
         self._buffer_size = len(tail)
+        if self._writer_thread is None:
+            self._write_container(uncompressed_data)
+            return
+
+        with self._queued_size_lock:
+            self._queued_size += len(uncompressed_data)
+        self._queue.put(uncompressed_data)
+
+    def _write_containers(self) -> None:
+        """Write the queued containers until stopped, run in a separate thread."""
+        while (uncompressed_data := self._queue.get()) is not None:
+            try:
+                if self._writer_error is None:
+                    self._write_container(uncompressed_data)
+            except BaseException as exc:  # pylint: disable=broad-exception-caught
+                # keep consuming, so that producers do not block forever
+                self._writer_error = exc
+            finally:
+                with self._queued_size_lock:
+                    self._queued_size -= len(uncompressed_data)
+
+    def _check_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    def _write_container(self, uncompressed_data: "memoryview[int]") -> None:
+        """Compresses and writes a log container to file."""
         if not self.compression_level:
             data: "bytes | memoryview[int]" = uncompressed_data  # noqa: UP037
             method = NO_COMPRESSION
@@ -592,14 +1347,35 @@ class BLFWriter(BinaryIOMessageWriter):
         self.uncompressed_size += OBJ_HEADER_BASE_STRUCT.size
         self.uncompressed_size += LOG_CONTAINER_STRUCT.size
         self.uncompressed_size += len(uncompressed_data)
+        self._written_uncompressed_size += len(uncompressed_data)
+        self._written_compressed_size += len(data)
 
     def file_size(self) -> int:
-        """Return an estimate of the current file size in bytes."""
-        return self.file.tell() + self._buffer_size
+        """Return an estimate of the current file size in bytes.
+
+        The containers waiting for the background thread are accounted for
+        with the compression ratio of the containers written so far.
+        """
+        queued_size = self._queued_size
+        if self._written_uncompressed_size:
+            queued_size = (
+                queued_size
+                * self._written_compressed_size
+                // self._written_uncompressed_size
+            )
+        return self.file.tell() + queued_size + self._buffer_size
 
     def stop(self) -> None:
-        """Stops logging and closes the file."""
+        """Stops logging and closes the file.
+
+        If the background thread is used, this waits for all queued
+        containers to be written.
+        """
         self._flush()
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
         if self.file.seekable():
             filesize = self.file.tell()
             # Write header in the beginning of the file
@@ -608,3 +1384,5 @@ class BLFWriter(BinaryIOMessageWriter):
         else:
             LOG.error("Could not write BLF header since file is not seekable")
         super().stop()
+        # report a failure of the background thread after cleaning up
+        self._check_writer_error()
@@ -5,13 +5,14 @@ It is is compatible with "candump -L" from the canutils program
 """
 
 import logging
-from collections.abc import Generator
+from collections.abc import Generator, Iterator, Sequence
 from typing import Any, TextIO
 
 from can.message import Message
 
+from ..frame_array import FrameFlags
 from ..typechecking import StringPathLike
-from .generic import TextIOMessageReader, TextIOMessageWriter
+from .generic import TextIOMessageReader, TextIOMessageWriter, _Frame
 
 log = logging.getLogger("can.io.canutils")
 
@@ -23,6 +24,8 @@ CAN_ERR_DLC = 8
 CANFD_BRS = 0x01
 CANFD_ESI = 0x02
 
+_ERROR_FRAME_FLAGS = FrameFlags.EXTENDED_ID | FrameFlags.ERROR_FRAME | FrameFlags.RX
+
 
 class CanutilsLogReader(TextIOMessageReader):
     """
@@ -47,6 +50,25 @@ class CanutilsLogReader(TextIOMessageReader):
         super().__init__(file, mode="r")
 
     def __iter__(self) -> Generator[Message, None, None]:
+        for timestamp, can_id, dlc, flags, data, channel in self._iter_frames():
+            if flags & FrameFlags.ERROR_FRAME:
+                yield Message(timestamp=timestamp, is_error_frame=True)
+                continue
+            yield Message(
+                timestamp=timestamp,
+                arbitration_id=can_id,
+                is_extended_id=bool(flags & FrameFlags.EXTENDED_ID),
+                is_remote_frame=bool(flags & FrameFlags.REMOTE_FRAME),
+                is_fd=bool(flags & FrameFlags.FD),
+                is_rx=bool(flags & FrameFlags.RX),
+                bitrate_switch=bool(flags & FrameFlags.BITRATE_SWITCH),
+                error_state_indicator=bool(flags & FrameFlags.ERROR_STATE_INDICATOR),
+                dlc=dlc,
+                data=data,
+                channel=channel,
+            )
+
+    def _iter_frames(self) -> Iterator[_Frame]:
         for line in self.file:
             # skip empty lines
             temp = line.strip()
@@ -69,54 +91,33 @@ class CanutilsLogReader(TextIOMessageReader):
             else:
                 channel = channel_string
 
-            is_extended = len(can_id_string) > 3
             can_id = int(can_id_string, 16)
+            if can_id & CAN_ERR_FLAG and can_id & CAN_ERR_BUSERROR:
+                yield timestamp, 0, 0, _ERROR_FRAME_FLAGS, b"", None
+                continue
 
-            is_fd = False
-            brs = False
-            esi = False
+            flags = FrameFlags.RX if is_rx else 0
+            if len(can_id_string) > 3:
+                flags |= FrameFlags.EXTENDED_ID
 
             if data and data[0] == "#":
-                is_fd = True
+                flags |= FrameFlags.FD
                 fd_flags = int(data[1])
-                brs = bool(fd_flags & CANFD_BRS)
-                esi = bool(fd_flags & CANFD_ESI)
+                if fd_flags & CANFD_BRS:
+                    flags |= FrameFlags.BITRATE_SWITCH
+                if fd_flags & CANFD_ESI:
+                    flags |= FrameFlags.ERROR_STATE_INDICATOR
                 data = data[2:]
 
             if data and data[0].lower() == "r":
-                is_remote_frame = True
-
-                if len(data) > 1:
-                    dlc = int(data[1:])
-                else:
-                    dlc = 0
-
-                data_bin = None
+                flags |= FrameFlags.REMOTE_FRAME
+                dlc = int(data[1:]) if len(data) > 1 else 0
+                data_bin = b""
             else:
-                is_remote_frame = False
-
                 dlc = len(data) // 2
-                data_bin = bytearray()
-                for i in range(0, len(data), 2):
-                    data_bin.append(int(data[i : (i + 2)], 16))
+                data_bin = bytes.fromhex(data)
 
-            if can_id & CAN_ERR_FLAG and can_id & CAN_ERR_BUSERROR:
-                msg = Message(timestamp=timestamp, is_error_frame=True)
-            else:
-                msg = Message(
-                    timestamp=timestamp,
-                    arbitration_id=can_id & 0x1FFFFFFF,
-                    is_extended_id=is_extended,
-                    is_remote_frame=is_remote_frame,
-                    is_fd=is_fd,
-                    is_rx=is_rx,
-                    bitrate_switch=brs,
-                    error_state_indicator=esi,
-                    dlc=dlc,
-                    data=data_bin,
-                    channel=channel,
-                )
-            yield msg
+            yield timestamp, can_id & 0x1FFFFFFF, dlc, flags, data_bin, channel
 
         self.stop()
 
@@ -152,6 +153,12 @@ class CanutilsLogWriter(TextIOMessageWriter):
         self.last_timestamp: float | None = None
 
     def on_message_received(self, msg: Message) -> None:
+        self.file.write(self._format_message(msg))
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        self.file.write("".join([self._format_message(msg) for msg in msgs]))
+
+    def _format_message(self, msg: Message) -> str:
         # this is the case for the very first message:
         if self.last_timestamp is None:
             self.last_timestamp = msg.timestamp or 0.0
@@ -192,4 +199,4 @@ class CanutilsLogWriter(TextIOMessageWriter):
                 framestr += f"#{fd_flags:X}"
             framestr += f"{msg.data.hex().upper()}{eol}"
 
-        self.file.write(framestr)
+        return framestr
@@ -10,13 +10,14 @@ TODO: This module could use https://docs.python.org/2/library/csv.html#module-cs
 """
 
 from base64 import b64decode, b64encode
-from collections.abc import Generator
+from collections.abc import Generator, Iterator, Sequence
 from typing import Any, TextIO
 
 from can.message import Message
 
+from ..frame_array import FrameFlags
 from ..typechecking import StringPathLike
-from .generic import TextIOMessageReader, TextIOMessageWriter
+from .generic import TextIOMessageReader, TextIOMessageWriter, _Frame
 
 
 class CSVReader(TextIOMessageReader):
@@ -41,6 +42,18 @@ class CSVReader(TextIOMessageReader):
         super().__init__(file, mode="r")
 
     def __iter__(self) -> Generator[Message, None, None]:
+        for timestamp, can_id, dlc, flags, data, _ in self._iter_frames():
+            yield Message(
+                timestamp=timestamp,
+                is_remote_frame=bool(flags & FrameFlags.REMOTE_FRAME),
+                is_extended_id=bool(flags & FrameFlags.EXTENDED_ID),
+                is_error_frame=bool(flags & FrameFlags.ERROR_FRAME),
+                arbitration_id=can_id,
+                dlc=dlc,
+                data=data,
+            )
+
+    def _iter_frames(self) -> Iterator[_Frame]:
         # skip the header line
         try:
             next(self.file)
@@ -48,19 +61,29 @@ class CSVReader(TextIOMessageReader):
             # don't crash on a file with only a header
             return
 
+        extended_flag = int(FrameFlags.EXTENDED_ID)
+        remote_flag = int(FrameFlags.REMOTE_FRAME)
+        error_flag = int(FrameFlags.ERROR_FRAME)
+        rx_flag = int(FrameFlags.RX)
         for line in self.file:
             timestamp, arbitration_id, extended, remote, error, dlc, data = line.split(
                 ","
             )
 
-            yield Message(
-                timestamp=float(timestamp),
-                is_remote_frame=(remote == "1"),
-                is_extended_id=(extended == "1"),
-                is_error_frame=(error == "1"),
-                arbitration_id=int(arbitration_id, base=16),
-                dlc=int(dlc),
-                data=b64decode(data),
+            flags = rx_flag
+            if extended == "1":
+                flags |= extended_flag
+            if remote == "1":
+                flags |= remote_flag
+            if error == "1":
+                flags |= error_flag
+            yield (
+                float(timestamp),
+                int(arbitration_id, base=16),
+                int(dlc),
+                flags,
+                b64decode(data),
+                None,
             )
 
         self.stop()
@@ -109,6 +132,13 @@ class CSVWriter(TextIOMessageWriter):
             self.file.write("timestamp,arbitration_id,extended,remote,error,dlc,data\n")
 
     def on_message_received(self, msg: Message) -> None:
+        self.file.write(self._format_row(msg))
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        self.file.write("".join([self._format_row(msg) for msg in msgs]))
+
+    @staticmethod
+    def _format_row(msg: Message) -> str:
         row = ",".join(
             [
                 repr(msg.timestamp),  # cannot use str() here because that is rounding
@@ -120,5 +150,4 @@ class CSVWriter(TextIOMessageWriter):
                 b64encode(msg.data).decode("utf8"),
             ]
         )
-        self.file.write(row)
-        self.file.write("\n")
+        return row + "\n"
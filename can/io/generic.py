@@ -9,7 +9,7 @@ to various file formats.
 import locale
 import os
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from contextlib import AbstractContextManager
 from io import BufferedIOBase, TextIOWrapper
 from pathlib import Path
@@ -26,9 +26,10 @@ from typing import (
 
 from typing_extensions import Self
 
+from ..frame_array import FrameArray, message_flags
 from ..listener import Listener
 from ..message import Message
-from ..typechecking import FileLike, StringPathLike
+from ..typechecking import Channel, FileLike, StringPathLike
 
 if TYPE_CHECKING:
     from _typeshed import (
@@ -44,6 +45,9 @@ if TYPE_CHECKING:
 #: type parameter used in generic classes :class:`MessageReader` and :class:`MessageWriter`
 _IoTypeVar = TypeVar("_IoTypeVar", bound=FileLike)
 
+#: the raw values of a frame as passed to :meth:`can.FrameArray.append_frame`
+_Frame = tuple[float, int, int, int, bytes | bytearray, Channel | None]
+
 
 class MessageWriter(AbstractContextManager["MessageWriter"], Listener, ABC):
     """Abstract base class for all CAN message writers.
@@ -193,6 +197,55 @@ class MessageReader(AbstractContextManager["MessageReader"], Iterable[Message],
         self.stop()
         return False
 
+    def read_arrays(self, chunk_size: int = 65536) -> Iterator[FrameArray]:
+        """Read the messages in chunks of parallel arrays.
+
+        For large files this is much faster than iterating over the reader,
+        since the frames are decoded into a :class:`~can.FrameArray` without
+        creating a :class:`~can.Message` for each of them. Readers which do
+        not implement this natively fall back to iterating over the messages.
+
+        .. code-block:: python
+
+            with can.LogReader("capture.blf") as reader:
+                for frames in reader.read_arrays():
+                    analyze(frames.timestamp, frames.data)
+
+        :param chunk_size:
+            The maximum number of frames per chunk. All chunks except for the
+            last one contain exactly this many frames.
+        :return: an iterator over non-empty chunks of frames
+        :raises ValueError: if *chunk_size* is smaller than one
+        :raises NotImplementedError: if the *numpy* package is not installed
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        frames = FrameArray(chunk_size)
+        for frame in self._iter_frames():
+            frames.append_frame(*frame)
+            if len(frames) == chunk_size:
+                yield frames
+                frames = FrameArray(chunk_size)
+        if len(frames):
+            yield frames
+
+    def _iter_frames(self) -> Iterator[_Frame]:
+        """Iterate over the raw values of all frames, see :meth:`read_arrays`.
+
+        Readers may override this to parse the frames without creating
+        :class:`~can.Message` objects.
+        """
+        for msg in self:
+            yield (
+                msg.timestamp,
+                msg.arbitration_id,
+                msg.dlc,
+                message_flags(msg),
+                msg.data,
+                msg.channel,
+            )
+
 
 class FileIOMessageReader(MessageReader, Generic[_IoTypeVar]):
     """Base class for readers that operate on file descriptors.
@@ -8,7 +8,7 @@ the ASAM MDF standard (see https://www.asam.net/standards/detail/mdf/)
 import abc
 import heapq
 import logging
-from collections.abc import Generator, Iterator
+from collections.abc import Generator, Iterator, Sequence
 from datetime import datetime
 from hashlib import md5
 from io import BufferedIOBase, BytesIO
@@ -273,6 +273,69 @@ class MF4Writer(BinaryIOMessageWriter):
         self._err_buffer = np.zeros(1, dtype=ERR_DTYPE)
         self._rtr_buffer = np.zeros(1, dtype=RTR_DTYPE)
 
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        # sort the messages into the groups like on_message_received() and
+        # extend each group only once
+        groups: tuple[list[Message], list[Message], list[Message]] = ([], [], [])
+        timestamps: tuple[list[float], list[float], list[float]] = ([], [], [])
+        for msg in msgs:
+            timestamp = msg.timestamp
+            if timestamp is None:
+                timestamp = self.last_timestamp
+            else:
+                self.last_timestamp = max(self.last_timestamp, timestamp)
+
+            if msg.is_remote_frame:
+                index = 2
+            elif msg.is_error_frame:
+                index = 1
+            else:
+                index = 0
+            groups[index].append(msg)
+            timestamps[index].append(timestamp - self._start_time)
+
+        for index, (name, dtype) in enumerate(
+            (
+                ("CAN_DataFrame", STD_DTYPE),
+                ("CAN_ErrorFrame", ERR_DTYPE),
+                ("CAN_RemoteFrame", RTR_DTYPE),
+            )
+        ):
+            group = groups[index]
+            if not group:
+                continue
+
+            buffer = np.zeros(len(group), dtype=dtype)
+            # like in on_message_received(), which resets its buffers after
+            # every message, a message without a channel is written as 0
+            channels = [channel2int(msg.channel) for msg in group]
+            buffer[f"{name}.BusChannel"] = [
+                0 if channel is None else channel for channel in channels
+            ]
+            buffer[f"{name}.ID"] = [msg.arbitration_id for msg in group]
+            buffer[f"{name}.IDE"] = [msg.is_extended_id for msg in group]
+            buffer[f"{name}.Dir"] = [not msg.is_rx for msg in group]
+            if index == 2:
+                buffer[f"{name}.DLC"] = [msg.dlc for msg in group]
+            else:
+                buffer[f"{name}.DLC"] = [
+                    len2dlc(msg.dlc) if msg.is_fd else msg.dlc for msg in group
+                ]
+                buffer[f"{name}.DataLength"] = [len(msg.data) for msg in group]
+                data_bytes = buffer[f"{name}.DataBytes"]
+                for row, msg in enumerate(group):
+                    data_bytes[row, : len(msg.data)] = msg.data
+                buffer[f"{name}.ESI"] = [
+                    msg.is_fd and msg.error_state_indicator for msg in group
+                ]
+                buffer[f"{name}.BRS"] = [
+                    msg.is_fd and msg.bitrate_switch for msg in group
+                ]
+                buffer[f"{name}.EDL"] = [msg.is_fd for msg in group]
+
+            sigs = [(np.array(timestamps[index]), None), (buffer, None)]
+            self._mdf.extend(index, sigs)
+
 
 class FrameIterator(abc.ABC):
     """
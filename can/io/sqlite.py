@@ -11,12 +11,18 @@ import time
 from collections.abc import Generator, Iterator
 from typing import Any, TypeAlias
 
+from can.frame_array import MAX_DATA_LENGTH, FrameArray, FrameFlags
 from can.listener import BufferedReader
 from can.message import Message
 
 from ..typechecking import StringPathLike
 from .generic import MessageReader, MessageWriter
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
 log = logging.getLogger("can.io.sqlite")
 
 _MessageTuple: TypeAlias = "tuple[float, int, bool, bool, bool, int, memoryview[int]]"
@@ -72,6 +78,38 @@ class SqliteReader(MessageReader):
             data=data,
         )
 
+    def read_arrays(self, chunk_size: int = 65536) -> Iterator[FrameArray]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if np is None:
+            # let the frame array raise the proper exception
+            FrameArray()
+
+        # use a separate cursor so that other queries do not interfere
+        cursor = self._conn.execute(f"SELECT * FROM {self.table_name}")
+        while rows := cursor.fetchmany(chunk_size):
+            timestamp, can_id, is_extended, is_remote, is_error, dlc, data = zip(
+                *rows, strict=True
+            )
+            flags = (
+                int(FrameFlags.RX)
+                | np.array(is_extended, dtype=np.uint8) * int(FrameFlags.EXTENDED_ID)
+                | np.array(is_remote, dtype=np.uint8) * int(FrameFlags.REMOTE_FRAME)
+                | np.array(is_error, dtype=np.uint8) * int(FrameFlags.ERROR_FRAME)
+            )
+            payload = b"".join(
+                bytes(value or b"").ljust(MAX_DATA_LENGTH, b"\x00") for value in data
+            )
+            frames = FrameArray(len(rows))
+            frames.extend_columns(
+                timestamp,
+                can_id,
+                dlc,
+                flags,
+                np.frombuffer(payload, dtype=np.uint8).reshape(len(rows), -1),
+            )
+            yield frames
+
     def __len__(self) -> int:
         # this might not run in constant time
         result = self._cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
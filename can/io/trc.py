@@ -9,7 +9,7 @@ Version 1.1 will be implemented as it is most commonly used
 
 import logging
 import os
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Sequence
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from io import TextIOWrapper
@@ -416,16 +416,35 @@ class TRCWriter(TextIOMessageWriter):
         self.file.write(message + "\n")
 
     def on_message_received(self, msg: Message) -> None:
+        serialized = self._serialize(msg)
+        if serialized is not None:
+            self.log_event(serialized, msg.timestamp)
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        lines = []
+        for msg in msgs:
+            serialized = self._serialize(msg)
+            if serialized is not None:
+                if not self.header_written:
+                    self.write_header(msg.timestamp)
+                lines.append(serialized)
+        if lines:
+            lines.append("")
+            self.file.write("\n".join(lines))
+
+    def _serialize(self, msg: Message) -> str | None:
+        """Format a message as a line without the line break, or return None
+        if it cannot be logged."""
         if self.first_timestamp is None:
             self.first_timestamp = msg.timestamp
 
         if msg.is_error_frame:
             logger.warning("TRCWriter: Logging error frames is not implemented")
-            return
+            return None
 
         if msg.is_remote_frame:
             logger.warning("TRCWriter: Logging remote frames is not implemented")
-            return
+            return None
 
         channel = channel2int(msg.channel)
         if channel is None:
@@ -436,8 +455,8 @@ class TRCWriter(TextIOMessageWriter):
 
         if msg.is_fd:
             logger.warning("TRCWriter: Logging CAN FD is not implemented")
-            return
+            return None
 
         serialized = self._format_message(msg, channel)
         self.msgnr += 1
-        self.log_event(serialized, msg.timestamp)
+        return serialized
@@ -5,13 +5,23 @@ This module contains the implementation of `can.Listener` and some readers.
 import asyncio
 import warnings
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
-from queue import Empty, SimpleQueue
-from typing import Any
+from collections.abc import AsyncIterator, Sequence
+from queue import Empty, Full, Queue, SimpleQueue
+from typing import Any, Literal
 
 from can.bus import BusABC
+from can.frame_array import FrameArray
 from can.message import Message
 
+OverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
+
+def _check_buffer_arguments(maxsize: int, policy: str) -> None:
+    if maxsize < 0:
+        raise ValueError("maxsize must not be negative")
+    if policy not in ("drop_oldest", "drop_newest"):
+        raise ValueError(f"Unknown overflow policy: {policy}")
+
 
 class Listener(ABC):
     """The basic listener that can be called directly to handle some
@@ -24,6 +34,8 @@ class Listener(ABC):
         listener(msg)
         # or
         listener.on_message_received(msg)
+        # or for several messages at once
+        listener.on_messages_received(my_bus.recv_batch())
 
         # Important to ensure all outputs are flushed
         listener.stop()
@@ -36,6 +48,18 @@ class Listener(ABC):
         :param msg: the delivered message
         """
 
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        """This method is called to handle several messages at once.
+
+        The default implementation calls :meth:`on_message_received` for
+        each message. Listeners which can process a batch more efficiently,
+        e.g. with a single write to a file, override it.
+
+        :param msgs: the delivered messages in the order of reception
+        """
+        for msg in msgs:
+            self.on_message_received(msg)
+
     def __call__(self, msg: Message) -> None:
         self.on_message_received(msg)
 
@@ -80,24 +104,75 @@ class BufferedReader(Listener):  # pylint: disable=abstract-method
     an exception, see :meth:`~can.BufferedReader.on_message_received`.
 
     :attr is_stopped: ``True`` if the reader has been stopped
+    :attr dropped: The number of messages discarded because the buffer was full
     """
 
-    def __init__(self) -> None:
-        # set to "infinite" size
-        self.buffer: SimpleQueue[Message] = SimpleQueue()
+    def __init__(
+        self, maxsize: int = 0, policy: OverflowPolicy = "drop_oldest"
+    ) -> None:
+        """
+        :param maxsize:
+            The maximum number of buffered messages or 0 for an unbounded buffer.
+        :param policy:
+            What to do with a new message if the buffer is full:
+            ``"drop_oldest"`` discards the oldest buffered message and
+            ``"drop_newest"`` discards the new message.
+        :raises ValueError:
+            If *maxsize* is negative or *policy* is unknown.
+        """
+        _check_buffer_arguments(maxsize, policy)
+        self.buffer: SimpleQueue[Message] | Queue[Message]
+        if maxsize:
+            self.buffer = Queue(maxsize)
+        else:
+            # set to "infinite" size
+            self.buffer = SimpleQueue()
+        self.maxsize = maxsize
+        self.policy = policy
         self.is_stopped: bool = False
+        self.dropped = 0
 
     def on_message_received(self, msg: Message) -> None:
         """Append a message to the buffer.
 
-        :raises: BufferError
+        :raises: RuntimeError
             if the reader has already been stopped
         """
         if self.is_stopped:
             raise RuntimeError("reader has already been stopped")
+        elif self.maxsize:
+            self._put_bounded(msg)
         else:
             self.buffer.put(msg)
 
+    def _put_bounded(self, msg: Message) -> None:
+        while True:
+            try:
+                self.buffer.put_nowait(msg)
+                return
+            except Full:
+                if self.policy == "drop_newest":
+                    self.dropped += 1
+                    return
+            try:
+                self.buffer.get_nowait()
+                self.dropped += 1
+            except Empty:
+                # the consumer made room in the meantime
+                pass
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        """Append several messages to the buffer.
+
+        :raises: RuntimeError
+            if the reader has already been stopped
+        """
+        if self.is_stopped:
+            raise RuntimeError("reader has already been stopped")
+        put = self._put_bounded if self.maxsize else self.buffer.put
+        for msg in msgs:
+            put(msg)
+
     def get_message(self, timeout: float = 0.5) -> Message | None:
         """
         Attempts to retrieve the message that has been in the queue for the longest amount
@@ -116,6 +191,51 @@ class BufferedReader(Listener):  # pylint: disable=abstract-method
         except Empty:
             return None
 
+    def get_messages(
+        self, max_count: int | None = None, timeout: float = 0.5
+    ) -> list[Message]:
+        """
+        Retrieve several messages at once in FIFO order. This waits like
+        :meth:`~can.BufferedReader.get_message` for the first message and then
+        takes all messages currently in the buffer, up to *max_count*.
+
+        :param max_count: The maximum number of messages to retrieve, or None
+            to retrieve all buffered messages.
+        :param timeout: The number of seconds to wait for the first message.
+        :return: the retrieved messages, an empty list if none arrived in time.
+        :raises ValueError: if *max_count* is smaller than one
+        """
+        if max_count is not None and max_count < 1:
+            raise ValueError("max_count must be at least 1")
+        msg = self.get_message(timeout)
+        if msg is None:
+            return []
+        msgs = [msg]
+        get = self.buffer.get_nowait
+        while max_count is None or len(msgs) < max_count:
+            try:
+                msgs.append(get())
+            except Empty:
+                break
+        return msgs
+
+    def get_frame_array(self, max_count: int | None = None) -> FrameArray:
+        """
+        Drain the messages currently in the buffer into a :class:`~can.FrameArray`.
+        This method never blocks, the result may be empty.
+
+        :param max_count: The maximum number of messages to retrieve, or None
+            to retrieve all buffered messages.
+        :return: the retrieved messages in FIFO order.
+        """
+        frames = FrameArray()
+        while max_count is None or len(frames) < max_count:
+            try:
+                frames.append(self.buffer.get(block=False))
+            except Empty:
+                break
+        return frames
+
     def stop(self) -> None:
         """Prohibits any more additions to this reader."""
         self.is_stopped = True
@@ -134,9 +254,25 @@ class AsyncBufferedReader(
             print(msg)
     """
 
-    def __init__(self, **kwargs: Any) -> None:
+    def __init__(
+        self, maxsize: int = 0, policy: OverflowPolicy = "drop_oldest", **kwargs: Any
+    ) -> None:
+        """
+        :param maxsize:
+            The maximum number of buffered messages or 0 for an unbounded buffer.
+        :param policy:
+            What to do with a new message if the buffer is full, see
+            :class:`~can.BufferedReader`.
+        :raises ValueError:
+            If *maxsize* is negative or *policy* is unknown.
+        """
+        _check_buffer_arguments(maxsize, policy)
         self._is_stopped: bool = False
         self.buffer: asyncio.Queue[Message]
+        self.maxsize = maxsize
+        self.policy = policy
+        #: The number of messages discarded because the buffer was full
+        self.dropped = 0
 
         if "loop" in kwargs:
             warnings.warn(
@@ -145,7 +281,7 @@ class AsyncBufferedReader(
                 DeprecationWarning,
                 stacklevel=2,
             )
-        self.buffer = asyncio.Queue()
+        self.buffer = asyncio.Queue(maxsize)
 
     def on_message_received(self, msg: Message) -> None:
         """Append a message to the buffer.
@@ -153,7 +289,24 @@ class AsyncBufferedReader(
         Must only be called inside an event loop!
         """
         if not self._is_stopped:
-            self.buffer.put_nowait(msg)
+            self._put(msg)
+
+    def on_messages_received(self, msgs: Sequence[Message]) -> None:
+        """Append several messages to the buffer.
+
+        Must only be called inside an event loop!
+        """
+        if not self._is_stopped:
+            for msg in msgs:
+                self._put(msg)
+
+    def _put(self, msg: Message) -> None:
+        if self.buffer.full():
+            self.dropped += 1
+            if self.policy == "drop_newest":
+                return
+            self.buffer.get_nowait()
+        self.buffer.put_nowait(msg)
 
     async def get_message(self) -> Message:
         """
@@ -165,6 +318,34 @@ class AsyncBufferedReader(
         """
         return await self.buffer.get()
 
+    async def get_messages(
+        self, max_count: int | None = None, timeout: float | None = None
+    ) -> list[Message]:
+        """
+        Retrieve several messages at once when awaited for::
+
+            msgs = await reader.get_messages(100)
+
+        This waits for the first message and then takes all messages currently
+        in the buffer, up to *max_count*.
+
+        :param max_count: The maximum number of messages to retrieve, or None
+            to retrieve all buffered messages.
+        :param timeout: The number of seconds to wait for the first message,
+            or None to wait indefinitely.
+        :return: the retrieved messages, an empty list if none arrived in time.
+        :raises ValueError: if *max_count* is smaller than one
+        """
+        if max_count is not None and max_count < 1:
+            raise ValueError("max_count must be at least 1")
+        try:
+            msgs = [await asyncio.wait_for(self.buffer.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while not self.buffer.empty() and (max_count is None or len(msgs) < max_count):
+            msgs.append(self.buffer.get_nowait())
+        return msgs
+
     def __aiter__(self) -> AsyncIterator[Message]:
         return self
 
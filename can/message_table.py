@@ -0,0 +1,265 @@
+"""
+This module contains the implementation of :class:`~can.MessageTable`, a
+listener which keeps the latest frame and some timing statistics of every
+arbitration ID seen on the bus.
+"""
+
+import threading
+from collections.abc import Hashable, Iterator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .frame_array import MAX_DATA_LENGTH, FrameArray, _channel_key
+from .listener import Listener
+from .message import Message
+from .typechecking import Channel
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+def _data_difference(old: bytes | bytearray, new: bytes | bytearray) -> int:
+    """The bits which differ between two payloads as a little endian integer.
+
+    Bytes only present in one of the payloads count as changed completely.
+    """
+    difference = int.from_bytes(old, "little") ^ int.from_bytes(new, "little")
+    if len(old) != len(new):
+        short, long = sorted((len(old), len(new)))
+        difference |= (1 << 8 * long) - (1 << 8 * short)
+    return difference
+
+
+class MessageTableEntry:
+    """The state of a single arbitration ID in a :class:`~can.MessageTable`.
+
+    The periods are the differences of the message timestamps in seconds
+    and are ``None`` until the second message was received.
+    """
+
+    __slots__ = (
+        "_changed",
+        "_period_sum",
+        "count",
+        "max_period",
+        "message",
+        "min_period",
+        "period",
+    )
+
+    def __init__(self, msg: Message) -> None:
+        #: The latest message
+        self.message = msg
+        #: The number of received messages
+        self.count = 1
+        #: The time between the latest two messages
+        self.period: float | None = None
+        #: The shortest time between two messages
+        self.min_period: float | None = None
+        #: The longest time between two messages
+        self.max_period: float | None = None
+        self._period_sum = 0.0
+        # all bits of a new payload count as changed
+        self._changed = (1 << 8 * len(msg.data)) - 1
+
+    @property
+    def mean_period(self) -> float | None:
+        """The average time between two messages."""
+        if self.count < 2:
+            return None
+        return self._period_sum / (self.count - 1)
+
+    def _update(self, msg: Message) -> None:
+        previous = self.message
+        period = msg.timestamp - previous.timestamp
+        self.period = period
+        self._period_sum += period
+        if self.count == 1:
+            self.min_period = self.max_period = period
+        elif period < self.min_period:  # type: ignore[operator]
+            self.min_period = period
+        elif period > self.max_period:  # type: ignore[operator]
+            self.max_period = period
+        self.count += 1
+
+        if msg.data != previous.data:
+            self._changed |= _data_difference(previous.data, msg.data)
+        self.message = msg
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(message={self.message!r}, "
+            f"count={self.count}, period={self.period})"
+        )
+
+
+class MessageTableSnapshot(NamedTuple):
+    """The state of a :class:`~can.MessageTable` as arrays with one entry per
+    arbitration ID, in the order the IDs were first received.
+
+    Undefined periods are NaN.
+    """
+
+    #: The latest frame of each arbitration ID
+    frames: FrameArray
+    #: The number of received messages
+    counts: "npt.NDArray[Any]"
+    #: The time between the latest two messages
+    period: "npt.NDArray[Any]"
+    #: The shortest time between two messages
+    min_period: "npt.NDArray[Any]"
+    #: The longest time between two messages
+    max_period: "npt.NDArray[Any]"
+    #: The average time between two messages
+    mean_period: "npt.NDArray[Any]"
+    #: The bits of the payloads which changed since the last read, as a
+    #: matrix of 64 bytes per frame
+    changed: "npt.NDArray[Any]"
+
+
+class MessageTable(Listener):
+    """A table of the latest message per channel and arbitration ID.
+
+    Besides the latest message, the table tracks the number of received
+    messages and the cycle time of every arbitration ID::
+
+        table = can.MessageTable()
+        notifier = can.Notifier(bus, [table])
+        ...
+        entry = table.get(0x123, channel="can0")
+        if entry is not None:
+            print(entry.message.data, entry.count, entry.mean_period)
+
+    Updating the table costs a dictionary lookup and a few comparisons per
+    message, so it can be attached to a heavily loaded bus. Standard and
+    extended frames with the same arbitration ID share an entry.
+
+    The bits of the payload which changed since they were read last can be
+    retrieved by :meth:`changed_mask` or :meth:`snapshot`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[Hashable, int], MessageTableEntry] = {}
+        self._lock = threading.Lock()
+
+    def on_message_received(self, msg: Message) -> None:
+        key = (_channel_key(msg.channel), msg.arbitration_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = MessageTableEntry(msg)
+            else:
+                entry._update(msg)  # pylint: disable=protected-access
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[tuple[Hashable, int]]:
+        """Iterate over the ``(channel, arbitration_id)`` keys of the table."""
+        return iter(list(self._entries))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: tuple[Channel | None, int]) -> MessageTableEntry:
+        """Look up the entry of a ``(channel, arbitration_id)`` key.
+
+        :raises KeyError: if no message with this key was received
+        """
+        channel, arbitration_id = key
+        return self._entries[(_channel_key(channel), arbitration_id)]
+
+    def get(
+        self, arbitration_id: int, channel: Channel | None = None
+    ) -> MessageTableEntry | None:
+        """Look up the entry of an arbitration ID.
+
+        :param arbitration_id: the arbitration ID to look up
+        :param channel: the channel of the messages
+        :return: the entry or ``None`` if no such message was received
+        """
+        return self._entries.get((_channel_key(channel), arbitration_id))
+
+    def changed_mask(
+        self, arbitration_id: int, channel: Channel | None = None
+    ) -> bytes | None:
+        """Return the bits of the latest payload which changed since the
+        last call and reset them.
+
+        All bits of the payload count as changed when the arbitration ID is
+        read for the first time.
+
+        :param arbitration_id: the arbitration ID to look up
+        :param channel: the channel of the messages
+        :return:
+            A mask with the same length as the latest payload or ``None``
+            if no such message was received
+        """
+        with self._lock:
+            entry = self._entries.get((_channel_key(channel), arbitration_id))
+            if entry is None:
+                return None
+            changed = entry._changed  # pylint: disable=protected-access
+            entry._changed = 0  # pylint: disable=protected-access
+            length = len(entry.message.data)
+        return (changed & ((1 << 8 * length) - 1)).to_bytes(length, "little")
+
+    def snapshot(self, reset_changes: bool = True) -> MessageTableSnapshot:
+        """Export the table as arrays.
+
+        :param reset_changes:
+            Whether to reset the changed bits, such that the snapshot counts
+            as a read for :meth:`changed_mask`.
+
+        :raises NotImplementedError: if numpy is not installed
+        """
+        if np is None:
+            raise NotImplementedError(
+                "The numpy package was not found. Install python-can with "
+                "the optional dependency [numpy] to use MessageTable.snapshot()."
+            )
+
+        with self._lock:
+            entries = list(self._entries.values())
+            changed = []
+            for entry in entries:
+                # pylint: disable=protected-access
+                changed.append(entry._changed.to_bytes(MAX_DATA_LENGTH, "little"))
+                if reset_changes:
+                    entry._changed = 0
+            columns = [
+                (
+                    entry.count,
+                    entry.period,
+                    entry.min_period,
+                    entry.max_period,
+                    entry.mean_period,
+                )
+                for entry in entries
+            ]
+            frames = FrameArray.from_messages([entry.message for entry in entries])
+
+        statistics = np.array(
+            [[np.nan if value is None else value for value in row] for row in columns],
+            dtype=np.float64,
+        ).reshape(len(entries), 5)
+        return MessageTableSnapshot(
+            frames=frames,
+            counts=statistics[:, 0].astype(np.int64),
+            period=statistics[:, 1],
+            min_period=statistics[:, 2],
+            max_period=statistics[:, 3],
+            mean_period=statistics[:, 4],
+            changed=np.frombuffer(b"".join(changed), dtype=np.uint8).reshape(
+                len(entries), MAX_DATA_LENGTH
+            ),
+        )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
@@ -5,15 +5,19 @@ This module contains the implementation of :class:`~can.Notifier`.
 import asyncio
 import functools
 import logging
+import selectors
 import threading
 import time
+from collections import Counter, deque
 from collections.abc import Awaitable, Callable, Iterable
 from contextlib import AbstractContextManager
 from types import TracebackType
 from typing import (
     Any,
     Final,
+    Literal,
     NamedTuple,
+    cast,
 )
 
 from can.bus import BusABC
@@ -24,6 +28,18 @@ logger = logging.getLogger("can.Notifier")
 
 MessageRecipient = Listener | Callable[[Message], Awaitable[None] | None]
 
+QueuePolicy = Literal["drop_oldest", "drop_newest", "block"]
+
+# ranges of up to this many IDs are entered into the dispatch table one by one
+_MAX_EXPANDED_RANGE = 4096
+
+
+class _Subscription(NamedTuple):
+    callback: MessageRecipient
+    ids: frozenset[int]
+    id_ranges: tuple[tuple[int, int], ...]
+    extended: bool | None
+
 
 class _BusNotifierPair(NamedTuple):
     bus: "BusABC"
@@ -100,6 +116,114 @@ class _NotifierRegistry:
         return tuple(instance_list)
 
 
+class ListenerQueue:
+    """A bounded queue and a worker thread which decouple a slow listener
+    from the reception of messages.
+
+    Instances are created by :meth:`Notifier.add_listener` with ``queued=True``
+    and can be retrieved with :meth:`Notifier.get_listener_queue`.
+    """
+
+    def __init__(
+        self,
+        listener: MessageRecipient,
+        maxsize: int = 0,
+        policy: QueuePolicy = "block",
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        """
+        :param listener:
+            The listener to call from the worker thread.
+        :param maxsize:
+            The maximum number of queued messages or 0 for an unbounded queue.
+        :param policy:
+            What to do with a new message if the queue is full:
+            ``"drop_oldest"`` discards the oldest queued message,
+            ``"drop_newest"`` discards the new message and
+            ``"block"`` waits until the worker made room for it.
+        :param loop:
+            The :mod:`asyncio` event loop to schedule the coroutines returned
+            by the *listener* in.
+        :raises ValueError:
+            If *maxsize* is negative or *policy* is unknown.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        if policy not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.listener = listener
+        self.maxsize = maxsize
+        self.policy = policy
+        self._loop = loop
+
+        #: The number of messages discarded because the queue was full
+        self.dropped = 0
+        #: The maximum number of messages which have been queued at once
+        self.high_water_mark = 0
+
+        self._buffer: deque[Message] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.__class__.__qualname__} for {listener!r}"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, msg: Message) -> None:
+        """Queue a message for the listener according to the :attr:`policy`."""
+        with self._condition:
+            if self.maxsize and len(self._buffer) >= self.maxsize:
+                if self.policy == "drop_newest":
+                    self.dropped += 1
+                    return
+                if self.policy == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._buffer) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+            self._buffer.append(msg)
+            self.high_water_mark = max(self.high_water_mark, len(self._buffer))
+            self._condition.notify_all()
+
+    def qsize(self) -> int:
+        """Return the number of messages waiting for the listener."""
+        return len(self._buffer)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Let the worker deliver the remaining messages and stop it.
+
+        :param timeout: Max time in seconds to wait for the worker to finish.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer:
+                    # closed and flushed
+                    return
+                msgs = list(self._buffer)
+                self._buffer.clear()
+                self._condition.notify_all()
+            try:
+                if isinstance(self.listener, Listener):
+                    self.listener.on_messages_received(msgs)
+                else:
+                    for msg in msgs:
+                        res = self.listener(msg)
+                        if res and self._loop and asyncio.iscoroutine(res):
+                            asyncio.run_coroutine_threadsafe(res, self._loop)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Exception in queued listener %r", self.listener)
+
+
 class Notifier(AbstractContextManager["Notifier"]):
 
     _registry: Final = _NotifierRegistry()
@@ -110,6 +234,8 @@ class Notifier(AbstractContextManager["Notifier"]):
         listeners: Iterable[MessageRecipient],
         timeout: float = 1.0,
         loop: asyncio.AbstractEventLoop | None = None,
+        use_selector: bool = False,
+        max_batch_size: int = 64,
     ) -> None:
         """Manages the distribution of :class:`~can.Message` instances to listeners.
 
@@ -130,14 +256,37 @@ class Notifier(AbstractContextManager["Notifier"]):
             An optional maximum number of seconds to wait for any :class:`~can.Message`.
         :param loop:
             An :mod:`asyncio` event loop to schedule the ``listeners`` in.
+        :param use_selector:
+            If ``True`` and no *loop* is given, all buses providing a file
+            descriptor (see :meth:`~can.BusABC.fileno`) are served by a
+            single thread waiting on a :mod:`selectors` selector, instead of
+            one thread per bus. Other buses keep their own threads.
+            An exception not handled by any listener only stops the
+            reception from the failing bus.
+        :param max_batch_size:
+            The maximum number of messages read from a bus at once if a *loop*
+            is given or *use_selector* is set. Every time a bus becomes
+            readable, all available messages up to this number are delivered
+            in one go. Lower values keep other tasks of the event loop more
+            responsive.
         :raises ValueError:
-            If a passed in *bus* is already assigned to an active :class:`~can.Notifier`.
+            If a passed in *bus* is already assigned to an active :class:`~can.Notifier`
+            or *max_batch_size* is smaller than one.
         """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
         self.listeners: list[MessageRecipient] = list(listeners)
         self._bus_list: list[BusABC] = []
         self.timeout = timeout
+        self.max_batch_size = max_batch_size
         self._loop = loop
 
+        #: The number of times a batch of a certain size was received in
+        #: :mod:`asyncio` mode, i.e. a histogram of the messages per wake-up.
+        #: Useful for tuning *max_batch_size*.
+        self.batch_sizes: Counter[int] = Counter()
+
         #: Exception raised in thread
         self.exception: Exception | None = None
 
@@ -146,6 +295,20 @@ class Notifier(AbstractContextManager["Notifier"]):
 
         self._readers: list[int | threading.Thread] = []
         self._tasks: set[asyncio.Task] = set()
+        # the queues of the listeners added with queued=True, keyed by their id
+        self._queues: dict[int, ListenerQueue] = {}
+        self._subscriptions: list[_Subscription] = []
+        self._subscriptions_lock = threading.Lock()
+        # the callbacks per arbitration ID for standard and extended IDs and
+        # the large ID ranges, which are derived from the subscriptions
+        self._dispatch_table: tuple[
+            dict[int, list[MessageRecipient]], dict[int, list[MessageRecipient]]
+        ] = ({}, {})
+        self._range_table: list[tuple[int, int, bool | None, MessageRecipient]] = []
+        self._selector: selectors.BaseSelector | None = (
+            selectors.DefaultSelector() if use_selector and loop is None else None
+        )
+        self._selector_thread: threading.Thread | None = None
         _bus_list: list[BusABC] = bus if isinstance(bus, list) else [bus]
         for each_bus in _bus_list:
             self.add_bus(each_bus)
@@ -182,6 +345,17 @@ class Notifier(AbstractContextManager["Notifier"]):
             # Use bus file descriptor to watch for messages
             self._loop.add_reader(file_descriptor, self._on_message_available, bus)
             self._readers.append(file_descriptor)
+        elif self._selector is not None and file_descriptor >= 0:
+            # Watch the file descriptor in the shared selector thread
+            self._selector.register(file_descriptor, selectors.EVENT_READ, bus)
+            if self._selector_thread is None:
+                self._selector_thread = threading.Thread(
+                    target=self._selector_rx_thread,
+                    name=f"{self.__class__.__qualname__} selector",
+                )
+                self._selector_thread.daemon = True
+                self._selector_thread.start()
+                self._readers.append(self._selector_thread)
         else:
             reader_thread = threading.Thread(
                 target=self._rx_thread,
@@ -196,8 +370,12 @@ class Notifier(AbstractContextManager["Notifier"]):
         """Stop notifying Listeners when new :class:`~can.Message` objects arrive
         and call :meth:`~can.Listener.stop` on each Listener.
 
+        The messages waiting in the queues of queued listeners are delivered
+        before the listeners are stopped.
+
         :param timeout:
-            Max time in seconds to wait for receive threads to finish.
+            Max time in seconds to wait for receive threads and the workers of
+            queued listeners to finish.
             Should be longer than timeout given at instantiation.
         """
         self._stopped = True
@@ -210,7 +388,12 @@ class Notifier(AbstractContextManager["Notifier"]):
             elif self._loop:
                 # reader is a file descriptor
                 self._loop.remove_reader(reader)
-        for listener in self.listeners:
+        if self._selector is not None and self._selector_thread is None:
+            # else the selector is closed by its thread when it exits
+            self._selector.close()
+        for queue in self._queues.values():
+            queue.close(max(end_time - time.time(), 0))
+        for listener in self._all_recipients():
             if hasattr(listener, "stop"):
                 listener.stop()
 
@@ -221,18 +404,26 @@ class Notifier(AbstractContextManager["Notifier"]):
     def _rx_thread(self, bus: BusABC) -> None:
         # determine message handling callable early, not inside while loop
         if self._loop:
-            handle_message: Callable[[Message], Any] = functools.partial(
+            # hand over batches to reduce the number of event loop wake-ups
+            handle_messages: Callable[[list[Message]], Any] = functools.partial(
                 self._loop.call_soon_threadsafe,
-                self._on_message_received,  # type: ignore[arg-type]
+                self._on_messages_received,  # type: ignore[arg-type]
+            )
+            receive: Callable[[], list[Message]] = functools.partial(
+                bus.recv_batch, self.max_batch_size, self.timeout
             )
         else:
-            handle_message = self._on_message_received
+            handle_messages = self._on_messages_received
+
+            def receive() -> list[Message]:
+                msg = bus.recv(self.timeout)
+                return [msg] if msg else []
 
         while not self._stopped:
             try:
-                if msg := bus.recv(self.timeout):
+                if msgs := receive():
                     with self._lock:
-                        handle_message(msg)
+                        handle_messages(msgs)
             except Exception as exc:  # pylint: disable=broad-except
                 self.exception = exc
                 if self._loop is not None:
@@ -246,18 +437,105 @@ class Notifier(AbstractContextManager["Notifier"]):
                     # It was handled, so only log it
                     logger.debug("suppressed exception: %s", exc)
 
+    def _selector_rx_thread(self) -> None:
+        selector = cast("selectors.BaseSelector", self._selector)
+        try:
+            self._serve_selector(selector)
+        finally:
+            selector.close()
+
+    def _serve_selector(self, selector: selectors.BaseSelector) -> None:
+        while not self._stopped:
+            if not selector.get_map():
+                # all buses have failed, wait for new ones
+                time.sleep(self.timeout)
+                continue
+            for key, _ in selector.select(self.timeout):
+                bus: BusABC = key.data
+                try:
+                    # drain the available messages like in asyncio mode
+                    if msgs := bus.recv_batch(self.max_batch_size, 0):
+                        with self._lock:
+                            self._on_messages_received(msgs)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.exception = exc
+                    if self._on_error(exc):
+                        # It was handled, so only log it
+                        logger.debug("suppressed exception: %s", exc)
+                    else:
+                        # Stop watching this bus like its own thread would
+                        # have stopped, but keep serving the other buses
+                        selector.unregister(key.fileobj)
+                        logger.error(
+                            'Stopped receiving from bus "%s"',
+                            bus.channel_info,
+                            exc_info=exc,
+                        )
+
     def _on_message_available(self, bus: BusABC) -> None:
-        if msg := bus.recv(0):
-            self._on_message_received(msg)
+        # drain the available messages, but at most max_batch_size at once
+        # to avoid starving the other tasks of the event loop
+        if msgs := bus.recv_batch(self.max_batch_size, 0):
+            self._on_messages_received(msgs)
+
+    def _on_messages_received(self, msgs: list[Message]) -> None:
+        if self._loop is not None:
+            self.batch_sizes[len(msgs)] += 1
+        if len(msgs) == 1:
+            self._on_message_received(msgs[0])
+            return
+
+        queues = self._queues
+        for callback in self.listeners:
+            if queues and (queue := queues.get(id(callback))) is not None:
+                for msg in msgs:
+                    queue.put(msg)
+            elif isinstance(callback, Listener):
+                callback.on_messages_received(msgs)
+            else:
+                for msg in msgs:
+                    res = callback(msg)
+                    if res and self._loop and asyncio.iscoroutine(res):
+                        self._create_task(res)
+
+        if self._subscriptions:
+            for msg in msgs:
+                self._on_subscribed_message(msg)
 
     def _on_message_received(self, msg: Message) -> None:
+        queues = self._queues
         for callback in self.listeners:
+            if queues and (queue := queues.get(id(callback))) is not None:
+                queue.put(msg)
+                continue
             res = callback(msg)
             if res and self._loop and asyncio.iscoroutine(res):
-                # Schedule coroutine and keep a reference to the task
-                task = self._loop.create_task(res)
-                self._tasks.add(task)
-                task.add_done_callback(self._tasks.discard)
+                self._create_task(res)
+
+        if self._subscriptions:
+            self._on_subscribed_message(msg)
+
+    def _on_subscribed_message(self, msg: Message) -> None:
+        arbitration_id = msg.arbitration_id
+        for callback in self._dispatch_table[msg.is_extended_id].get(
+            arbitration_id, ()
+        ):
+            res = callback(msg)
+            if res and self._loop and asyncio.iscoroutine(res):
+                self._create_task(res)
+        for first, last, extended, callback in self._range_table:
+            if first <= arbitration_id <= last and (
+                extended is None or extended == msg.is_extended_id
+            ):
+                res = callback(msg)
+                if res and self._loop and asyncio.iscoroutine(res):
+                    self._create_task(res)
+
+    def _create_task(self, coro: Any) -> None:
+        # Schedule coroutine and keep a reference to the task
+        task = cast("asyncio.AbstractEventLoop", self._loop).create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     def _on_error(self, exc: Exception) -> bool:
         """Calls ``on_error()`` for all listeners if they implement it.
@@ -266,7 +544,7 @@ class Notifier(AbstractContextManager["Notifier"]):
         """
         was_handled = False
 
-        for listener in self.listeners:
+        for listener in self._all_recipients():
             if hasattr(listener, "on_error"):
                 try:
                     listener.on_error(exc)
@@ -277,24 +555,155 @@ class Notifier(AbstractContextManager["Notifier"]):
 
         return was_handled
 
-    def add_listener(self, listener: MessageRecipient) -> None:
+    def add_listener(
+        self,
+        listener: MessageRecipient,
+        queued: bool = False,
+        maxsize: int = 0,
+        policy: QueuePolicy = "block",
+    ) -> None:
         """Add new Listener to the notification list.
         If it is already present, it will be called two times
         each time a message arrives.
 
         :param listener: Listener to be added to the list to be notified
+        :param queued:
+            If ``True``, the messages are passed to the listener through a
+            :class:`~can.notifier.ListenerQueue` and called from its own worker
+            thread, so that a slow listener does not delay the reception.
+            Its statistics are available from :meth:`get_listener_queue`.
+        :param maxsize:
+            The maximum number of queued messages or 0 for an unbounded queue.
+            Only used if *queued* is ``True``.
+        :param policy:
+            How to handle a full queue, see :class:`~can.notifier.ListenerQueue`.
+            Only used if *queued* is ``True``.
+        :raises ValueError:
+            If *maxsize* or *policy* are invalid or a queued listener is
+            added twice.
         """
+        if queued:
+            if id(listener) in self._queues:
+                raise ValueError("The listener is already queued")
+            self._queues[id(listener)] = ListenerQueue(
+                listener, maxsize, policy, self._loop
+            )
         self.listeners.append(listener)
 
-    def remove_listener(self, listener: MessageRecipient) -> None:
+    def remove_listener(self, listener: MessageRecipient, timeout: float = 5.0) -> None:
         """Remove a listener from the notification list. This method
         throws an exception if the given listener is not part of the
         stored listeners.
 
         :param listener: Listener to be removed from the list to be notified
+        :param timeout:
+            Max time in seconds to wait for the worker of a queued listener to
+            deliver the remaining messages.
         :raises ValueError: if `listener` was never added to this notifier
         """
         self.listeners.remove(listener)
+        if listener not in self.listeners and id(listener) in self._queues:
+            self._queues.pop(id(listener)).close(timeout)
+
+    def subscribe(
+        self,
+        callback: MessageRecipient,
+        ids: Iterable[int] = (),
+        id_ranges: Iterable[tuple[int, int]] = (),
+        extended: bool | None = None,
+    ) -> None:
+        """Call a listener only for messages with certain arbitration IDs.
+
+        Unlike the listeners added with :meth:`add_listener`, which receive
+        every message, the subscribed callbacks are looked up by the
+        arbitration ID of each message. This is much faster if many listeners
+        are only interested in a few IDs each.
+
+        :param callback:
+            A :class:`~can.Listener` or a callable that receives a :class:`~can.Message`.
+        :param ids:
+            The arbitration IDs to subscribe to.
+        :param id_ranges:
+            Ranges of arbitration IDs to subscribe to, given as pairs of the
+            first and the last ID, both inclusive.
+        :param extended:
+            Only match extended IDs if ``True``, only standard IDs if ``False``
+            or both if ``None``.
+        :raises ValueError:
+            If an ID is out of range or a range ends before it starts.
+        """
+        ids = frozenset(ids)
+        id_ranges = tuple((first, last) for first, last in id_ranges)
+        for arbitration_id in ids:
+            if not 0 <= arbitration_id <= 0x1FFFFFFF:
+                raise ValueError(f"Invalid arbitration ID: {arbitration_id:#x}")
+        for first, last in id_ranges:
+            if not 0 <= first <= last <= 0x1FFFFFFF:
+                raise ValueError(f"Invalid ID range: {first:#x}-{last:#x}")
+        with self._subscriptions_lock:
+            self._subscriptions.append(
+                _Subscription(callback, ids, id_ranges, extended)
+            )
+            self._build_dispatch_table()
+
+    def unsubscribe(self, callback: MessageRecipient) -> None:
+        """Remove all subscriptions of a callback added by :meth:`subscribe`.
+
+        :raises ValueError: if `callback` was never subscribed to this notifier
+        """
+        with self._subscriptions_lock:
+            subscriptions = [
+                subscription
+                for subscription in self._subscriptions
+                if subscription.callback != callback
+            ]
+            if len(subscriptions) == len(self._subscriptions):
+                raise ValueError("The callback is not subscribed")
+            self._subscriptions = subscriptions
+            self._build_dispatch_table()
+
+    def _build_dispatch_table(self) -> None:
+        # build new tables and replace the old ones at once, since they are
+        # used by the receiving threads without holding the lock
+        dispatch_table: tuple[
+            dict[int, list[MessageRecipient]], dict[int, list[MessageRecipient]]
+        ] = ({}, {})
+        range_table = []
+        for subscription in self._subscriptions:
+            ids = set(subscription.ids)
+            for first, last in subscription.id_ranges:
+                if last - first < _MAX_EXPANDED_RANGE:
+                    ids.update(range(first, last + 1))
+                else:
+                    range_table.append(
+                        (first, last, subscription.extended, subscription.callback)
+                    )
+            for is_extended_id in (False, True):
+                if subscription.extended in (None, is_extended_id):
+                    for arbitration_id in ids:
+                        dispatch_table[is_extended_id].setdefault(
+                            arbitration_id, []
+                        ).append(subscription.callback)
+        self._dispatch_table = dispatch_table
+        self._range_table = range_table
+
+    def _all_recipients(self) -> list[MessageRecipient]:
+        """Return the listeners and the subscribed callbacks."""
+        recipients = list(self.listeners)
+        for subscription in self._subscriptions:
+            if subscription.callback not in recipients:
+                recipients.append(subscription.callback)
+        return recipients
+
+    def get_listener_queue(self, listener: MessageRecipient) -> ListenerQueue:
+        """Return the queue of a listener added with ``queued=True``.
+
+        :raises ValueError: if `listener` is not a queued listener of this notifier
+        """
+        try:
+            return self._queues[id(listener)]
+        except KeyError:
+            raise ValueError("The listener is not queued") from None
 
     @property
     def stopped(self) -> bool:
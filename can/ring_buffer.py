@@ -0,0 +1,351 @@
+"""
+This module contains the implementation of :class:`~can.RingBufferListener`,
+a flight recorder which keeps the most recent frames in memory and writes
+them to a log file when triggered.
+"""
+
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .frame_array import MAX_DATA_LENGTH, FrameArray, _channel_key, message_flags
+from .io.generic import MessageWriter
+from .io.logger import Logger
+from .listener import Listener
+from .message import Message
+from .typechecking import Channel, StringPathLike
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger("can.ring_buffer")
+
+#: A predicate deciding whether a message triggers a dump
+Trigger = Callable[[Message], bool]
+
+_ZEROS = bytes(MAX_DATA_LENGTH)
+
+
+class _Dump(NamedTuple):
+    number: int
+    timestamp: float
+    #: The length of the backlog when the dump was triggered
+    backlog_length: int
+    #: The messages received during the post trigger period
+    messages: list[Message]
+    #: Set once the post trigger period is over
+    complete: threading.Event
+
+
+def trigger_on_error_frame(msg: Message) -> bool:
+    """A trigger for :class:`~can.RingBufferListener` firing on error frames."""
+    return msg.is_error_frame
+
+
+def trigger_on_id(
+    arbitration_id: int,
+    data: bytes | None = None,
+    mask: bytes | None = None,
+    is_extended_id: bool | None = None,
+) -> Trigger:
+    """Create a trigger for :class:`~can.RingBufferListener` firing on a
+    certain arbitration ID and optionally a certain payload.
+
+    :param arbitration_id: the arbitration ID to trigger on
+    :param data:
+        The expected payload or None to accept any payload. Only the first
+        ``len(data)`` bytes are compared.
+    :param mask:
+        The bits of *data* to compare, defaults to all of them.
+    :param is_extended_id:
+        Only trigger on extended IDs if ``True``, only on standard IDs if
+        ``False`` or on both if ``None``.
+    """
+    if data is not None and mask is None:
+        mask = b"\xff" * len(data)
+
+    def trigger(msg: Message) -> bool:
+        if msg.arbitration_id != arbitration_id or msg.is_error_frame:
+            return False
+        if is_extended_id is not None and msg.is_extended_id != is_extended_id:
+            return False
+        if data is None or mask is None:
+            return True
+        if len(msg.data) < len(data):
+            return False
+        return all(
+            (byte ^ expected) & bits == 0
+            for byte, expected, bits in zip(msg.data, data, mask, strict=False)
+        )
+
+    return trigger
+
+
+class RingBufferListener(Listener):
+    """A flight recorder keeping the most recent frames in memory.
+
+    The frames are stored in preallocated NumPy arrays which are overwritten
+    in a circular fashion, so that recording costs neither allocations nor
+    disk access. When one of the *triggers* fires or :meth:`trigger` is
+    called, the recorded frames and the frames of the following
+    *post_trigger* seconds are written to a new log file by a background
+    thread, so the receiving thread neither copies the recorded frames nor
+    waits for the disk::
+
+        recorder = can.RingBufferListener(
+            "crash-{index}.blf",
+            capacity=100_000,
+            triggers=[can.ring_buffer.trigger_on_error_frame],
+            post_trigger=2.0,
+        )
+        notifier = can.Notifier(bus, [recorder])
+
+    The end of the *post_trigger* period is detected by the timestamps of
+    the following messages. A pending dump is completed by :meth:`stop` at
+    the latest. Until the background thread has copied the recorded frames,
+    new messages are kept in a list and only added to the ring afterwards.
+
+    .. note:: This requires the optional dependency `numpy`.
+    """
+
+    def __init__(
+        self,
+        target: StringPathLike | Callable[[int], MessageWriter],
+        capacity: int = 100_000,
+        duration: float | None = None,
+        triggers: Iterable[Trigger] = (),
+        post_trigger: float = 0.0,
+    ) -> None:
+        """
+        :param target:
+            Where to dump the frames: Either a file name passed to
+            :class:`can.Logger`, which may contain the placeholder ``{index}``
+            for the number of the dump, or a callable returning a
+            :class:`~can.io.generic.MessageWriter` for the given number.
+            The writer is stopped after the dump.
+        :param capacity:
+            The maximum number of frames to keep.
+        :param duration:
+            If given, only the frames of the last *duration* seconds before
+            the trigger are dumped.
+        :param triggers:
+            Predicates called with each received message. A dump is started
+            if any of them returns ``True``.
+        :param post_trigger:
+            The number of seconds after the trigger to include in the dump.
+        :raises ValueError: if *capacity* is smaller than one
+        :raises NotImplementedError: if numpy is not installed
+        """
+        if np is None:
+            raise NotImplementedError(
+                "The numpy package was not found. Install python-can with "
+                "the optional dependency [numpy] to use the RingBufferListener."
+            )
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.target = target
+        self.capacity = capacity
+        self.duration = duration
+        self.triggers = list(triggers)
+        self.post_trigger = post_trigger
+
+        #: The number of started dumps
+        self.dump_count = 0
+
+        self._timestamp = np.zeros(capacity, dtype=np.float64)
+        self._arbitration_id = np.zeros(capacity, dtype=np.uint32)
+        self._dlc = np.zeros(capacity, dtype=np.uint8)
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._channel = np.zeros(capacity, dtype=np.uint16)
+        self._data = np.zeros((capacity, MAX_DATA_LENGTH), dtype=np.uint8)
+        # writing single bytes through a memoryview is much faster than numpy
+        self._data_view = self._data.data.cast("B")
+        self._channels: list[Channel | None] = []
+        self._channel_codes: dict[Any, int] = {}
+        self._head = 0
+        self._count = 0
+        self._last_timestamp = 0.0
+
+        # the dump in its post trigger period and the end of that period
+        self._pending: tuple[_Dump, float] | None = None
+        # the number of dumps whose frames were not copied yet, the messages
+        # received meanwhile and how many of them were already recorded
+        self._frozen = 0
+        self._backlog: list[Message] = []
+        self._replayed = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[_Dump | None] = queue.Queue()
+        self._dump_thread: threading.Thread | None = None
+        self._is_stopped = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def on_message_received(self, msg: Message) -> None:
+        with self._lock:
+            if self._frozen:
+                self._backlog.append(msg)
+            else:
+                self._record(msg)
+            self._last_timestamp = msg.timestamp
+            pending = self._pending
+            if pending is not None:
+                if msg.timestamp > pending[1]:
+                    self._finish_dump()
+                else:
+                    pending[0].messages.append(msg)
+                    return
+            for trigger in self.triggers:
+                if trigger(msg):
+                    self._start_dump(msg.timestamp)
+                    break
+
+    def _record(self, msg: Message) -> None:
+        index = self._head
+        self._timestamp[index] = msg.timestamp
+        self._arbitration_id[index] = msg.arbitration_id
+        self._dlc[index] = msg.dlc
+        self._flags[index] = message_flags(msg)
+
+        channel = msg.channel
+        code = self._channel_codes.get(_channel_key(channel))
+        if code is None:
+            code = self._channel_codes[_channel_key(channel)] = len(self._channels)
+            self._channels.append(channel)
+        self._channel[index] = code
+
+        data = msg.data[:MAX_DATA_LENGTH]
+        start = index * MAX_DATA_LENGTH
+        end = start + len(data)
+        self._data_view[start:end] = data
+        self._data_view[end : start + MAX_DATA_LENGTH] = _ZEROS[len(data) :]
+
+        self._head = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def trigger(self, timestamp: float | None = None) -> None:
+        """Start a dump manually, unless one is pending already.
+
+        :param timestamp:
+            The time of the trigger, which defaults to the timestamp of
+            the latest message.
+        """
+        with self._lock:
+            if self._pending is None:
+                self._start_dump(
+                    self._last_timestamp if timestamp is None else timestamp
+                )
+
+    def snapshot(self) -> FrameArray:
+        """Return a copy of the recorded frames in chronological order."""
+        with self._lock:
+            frames = self._snapshot()
+            backlog = self._backlog[self._replayed :]
+        if backlog:
+            frames = FrameArray.concatenate([frames, FrameArray.from_messages(backlog)])
+            frames = frames[-self.capacity :]
+        return frames
+
+    def _snapshot(self) -> FrameArray:
+        order = self._order()
+        return FrameArray.from_columns(
+            self._timestamp[order],
+            self._arbitration_id[order],
+            self._dlc[order],
+            self._flags[order],
+            self._data[order],
+            self._channel[order],
+            self._channels or (None,),
+        )
+
+    def _order(self) -> "npt.NDArray[Any]":
+        """The indices of the recorded frames from the oldest to the newest."""
+        if self._count < self.capacity:
+            return np.arange(self._count)
+        return np.roll(np.arange(self.capacity), -self._head)
+
+    def _start_dump(self, timestamp: float) -> None:
+        # the frames are copied by the dump thread, until then the ring is
+        # frozen and new messages are collected in the backlog
+        dump = _Dump(
+            self.dump_count, timestamp, len(self._backlog), [], threading.Event()
+        )
+        self._frozen += 1
+        self.dump_count += 1
+        if self._dump_thread is None:
+            self._dump_thread = threading.Thread(
+                target=self._dump_frames, name="RingBufferListener", daemon=True
+            )
+            self._dump_thread.start()
+        self._queue.put(dump)
+        if self.post_trigger > 0:
+            self._pending = (dump, timestamp + self.post_trigger)
+        else:
+            dump.complete.set()
+
+    def _finish_dump(self) -> None:
+        if self._pending is None:
+            return
+        dump, _ = self._pending
+        self._pending = None
+        dump.complete.set()
+
+    def _replay(self, end: int) -> None:
+        """Record the frozen messages of the backlog up to *end*."""
+        for msg in self._backlog[self._replayed : end]:
+            self._record(msg)
+        self._replayed = max(self._replayed, end)
+
+    def _copy_frames(self, dump: _Dump) -> FrameArray:
+        """Copy the frames recorded up to the trigger of a dump."""
+        with self._lock:
+            try:
+                self._replay(dump.backlog_length)
+                frames = self._snapshot()
+            finally:
+                self._frozen -= 1
+                if not self._frozen:
+                    self._replay(len(self._backlog))
+                    self._backlog = []
+                    self._replayed = 0
+        if self.duration is not None:
+            frames = frames.select_time(start=dump.timestamp - self.duration)
+        return frames
+
+    def _dump_frames(self) -> None:
+        """Write the queued dumps until stopped, run in a separate thread."""
+        while (dump := self._queue.get()) is not None:
+            try:
+                frames = self._copy_frames(dump)
+                dump.complete.wait()
+                if callable(self.target):
+                    writer = self.target(dump.number)
+                else:
+                    writer = Logger(str(self.target).format(index=dump.number))
+                try:
+                    writer.on_messages_received(frames.to_messages())
+                    writer.on_messages_received(dump.messages)
+                finally:
+                    writer.stop()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Failed to dump the recorded frames")
+
+    def stop(self) -> None:
+        """Complete a pending dump and wait until all dumps are written."""
+        if self._is_stopped:
+            return
+        self._is_stopped = True
+        with self._lock:
+            self._finish_dump()
+        if self._dump_thread is not None:
+            self._queue.put(None)
+            self._dump_thread.join()
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from contextlib import nullcontext
 from threading import RLock
 from typing import TYPE_CHECKING, Any, cast
@@ -79,10 +80,22 @@ class ThreadSafeBus(
         with self._self_lock_recv:
             return self._self_wrapped.recv(timeout=timeout)
 
+    def recv_batch(
+        self, max_messages: int = 100, timeout: float | None = None
+    ) -> list[Message]:
+        with self._self_lock_recv:
+            return self._self_wrapped.recv_batch(
+                max_messages=max_messages, timeout=timeout
+            )
+
     def send(self, msg: Message, timeout: float | None = None) -> None:
         with self._self_lock_send:
             return self._self_wrapped.send(msg=msg, timeout=timeout)
 
+    def send_batch(self, msgs: Sequence[Message], timeout: float | None = None) -> int:
+        with self._self_lock_send:
+            return self._self_wrapped.send_batch(msgs=msgs, timeout=timeout)
+
     @property
     def filters(self) -> typechecking.CanFilters | None:
         with self._self_lock_recv:
@@ -282,6 +282,25 @@ class Back2BackTestCase(unittest.TestCase):
             delta_t = messages[-1].timestamp - messages[0].timestamp
             assert delta_t < duration + 0.05
 
+    def test_send_and_recv_batch(self):
+        messages = [can.Message(arbitration_id=i, data=[i]) for i in range(10)]
+        self.assertEqual(self.bus2.send_batch(messages, self.TIMEOUT), len(messages))
+
+        received = []
+        while len(received) < len(messages):
+            batch = self.bus1.recv_batch(max_messages=4, timeout=self.TIMEOUT)
+            if not batch:
+                break
+            self.assertLessEqual(len(batch), 4)
+            received.extend(batch)
+
+        self.assertEqual(len(received), len(messages))
+        for recv_msg, sent_msg in zip(received, messages, strict=True):
+            self._check_received_message(recv_msg, sent_msg)
+
+        # Some buses may receive their own messages. Remove them from the queue
+        self.bus2.recv_batch(max_messages=len(messages), timeout=0)
+
 
 @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "skip testing of socketcan")
 class BasicTestSocketCan(Back2BackTestCase):
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks reading BLF files which are created by scaling up the BLF files
+in ``test/data``.
+
+This is not run as part of the test suite. Run it with::
+
+    python -m test.blf_benchmark [--repeat 20000]
+"""
+
+import argparse
+import importlib.util
+import os
+import tempfile
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+import can
+from can.io import blf
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def create_log_file(path: str, repeat: int) -> int:
+    """Write the messages of all BLF files in ``test/data`` *repeat* times."""
+    messages = []
+    for filename in sorted(DATA_DIR.glob("*.blf")):
+        with can.BLFReader(filename) as reader:
+            messages.extend(reader)
+
+    count = 0
+    with can.BLFWriter(path) as writer:
+        for index in range(repeat):
+            for msg in messages:
+                msg.timestamp = 1_700_000_000 + count * 1e-4
+                msg.channel = index % 4
+                writer.on_message_received(msg)
+                count += 1
+    return count
+
+
+def benchmark_timestamp_conversion(number: int) -> None:
+    """Compare the former Decimal based conversion to the integer based one."""
+    raw_timestamp = 123_456_789_012
+    start_timestamp = 1_700_000_000.0
+    factor = blf.TIME_TEN_MICS_FACTOR
+
+    decimal_time = timeit.timeit(
+        lambda: float(Decimal(raw_timestamp) * factor) + start_timestamp,
+        number=number,
+    )
+    integer_time = timeit.timeit(
+        lambda: raw_timestamp * 10_000 / 1_000_000_000 + start_timestamp,
+        number=number,
+    )
+    print(f"timestamp conversion with Decimal: {decimal_time / number * 1e9:8.1f} ns")
+    print(f"timestamp conversion with int:     {integer_time / number * 1e9:8.1f} ns")
+
+
+def benchmark_reading(path: str, count: int) -> None:
+    def iterate(**kwargs):
+        with can.BLFReader(path, **kwargs) as reader:
+            for _ in reader:
+                pass
+
+    def read_arrays():
+        with can.BLFReader(path) as reader:
+            for _ in reader.read_arrays():
+                pass
+
+    candidates = {
+        "iterate": iterate,
+        "iterate (timestamp_ns=True)": lambda: iterate(timestamp_ns=True),
+        "iterate (workers=2)": lambda: iterate(workers=2),
+    }
+    if importlib.util.find_spec("numpy") is not None:
+        candidates["read_arrays"] = read_arrays
+
+    for name, func in candidates.items():
+        duration = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<28} {duration:7.3f} s  {count / duration / 1e6:6.2f} M frames/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20_000,
+        help="how often the messages of the test files are repeated",
+    )
+    args = parser.parse_args()
+
+    benchmark_timestamp_conversion(number=1_000_000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.blf")
+        count = create_log_file(path, args.repeat)
+        print(f"reading {count} frames ({os.path.getsize(path) / 1e6:.1f} MB)")
+        benchmark_reading(path, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -158,6 +158,78 @@ class ListenerTest(BusTest):
         a_listener.stop()
         self.assertIsNotNone(a_listener.get_message(0.1))
 
+    def testBufferedListenerReceivesBatch(self):
+        a_listener = can.BufferedReader()
+        a_listener.on_messages_received([generate_message(i) for i in range(3)])
+        for i in range(3):
+            self.assertEqual(a_listener.get_message(0.1).arbitration_id, i)
+        a_listener.stop()
+        with self.assertRaises(RuntimeError):
+            a_listener.on_messages_received([generate_message(0)])
+
+    def testBufferedListenerDropOldest(self):
+        a_listener = can.BufferedReader(maxsize=3)
+        a_listener.on_messages_received([generate_message(i) for i in range(5)])
+        a_listener(generate_message(5))
+        self.assertEqual(a_listener.dropped, 3)
+        msgs = a_listener.get_messages(timeout=0)
+        self.assertEqual([msg.arbitration_id for msg in msgs], [3, 4, 5])
+
+    def testBufferedListenerDropNewest(self):
+        a_listener = can.BufferedReader(maxsize=3, policy="drop_newest")
+        a_listener.on_messages_received([generate_message(i) for i in range(5)])
+        a_listener(generate_message(5))
+        self.assertEqual(a_listener.dropped, 3)
+        msgs = a_listener.get_messages(timeout=0)
+        self.assertEqual([msg.arbitration_id for msg in msgs], [0, 1, 2])
+
+    def testBufferedListenerInvalidArguments(self):
+        with self.assertRaises(ValueError):
+            can.BufferedReader(maxsize=-1)
+        with self.assertRaises(ValueError):
+            can.BufferedReader(policy="block")
+        with self.assertRaises(ValueError):
+            can.BufferedReader().get_messages(0)
+
+    def testBufferedListenerGetMessages(self):
+        a_listener = can.BufferedReader()
+        self.assertEqual(a_listener.get_messages(timeout=0.01), [])
+        for i in range(5):
+            a_listener(generate_message(i))
+        msgs = a_listener.get_messages(3)
+        self.assertEqual([msg.arbitration_id for msg in msgs], [0, 1, 2])
+        a_listener.stop()
+        msgs = a_listener.get_messages()
+        self.assertEqual([msg.arbitration_id for msg in msgs], [3, 4])
+        self.assertEqual(a_listener.get_messages(), [])
+
+    def testDefaultOnMessagesReceived(self):
+        received = []
+
+        class SingleMessageListener(can.Listener):
+            def on_message_received(self, msg):
+                received.append(msg)
+
+        msgs = [generate_message(i) for i in range(3)]
+        SingleMessageListener().on_messages_received(msgs)
+        self.assertEqual(received, msgs)
+
+    def testNotifierDeliversBatches(self):
+        batches = []
+
+        class BatchListener(can.Listener):
+            def on_message_received(self, msg):
+                batches.append([msg])
+
+            def on_messages_received(self, msgs):
+                batches.append(list(msgs))
+
+        notifier = can.Notifier(self.bus, [BatchListener()], 0.1)
+        notifier.stop()
+        msgs = [generate_message(i) for i in range(3)]
+        notifier._on_messages_received(msgs)
+        self.assertEqual(batches, [msgs])
+
 
 def test_deprecated_loop_arg(recwarn):
     try:
@@ -178,3 +250,24 @@ def test_deprecated_loop_arg(recwarn):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+def test_async_buffered_reader_bounded():
+    async def run_it():
+        reader = can.AsyncBufferedReader(maxsize=3)
+        reader.on_messages_received([generate_message(i) for i in range(5)])
+        assert reader.dropped == 2
+        msgs = await reader.get_messages(2)
+        assert [msg.arbitration_id for msg in msgs] == [2, 3]
+        msgs = await reader.get_messages()
+        assert [msg.arbitration_id for msg in msgs] == [4]
+        assert await reader.get_messages(timeout=0.01) == []
+
+        reader = can.AsyncBufferedReader(maxsize=3, policy="drop_newest")
+        for i in range(5):
+            reader.on_message_received(generate_message(i))
+        assert reader.dropped == 2
+        msgs = await reader.get_messages()
+        assert [msg.arbitration_id for msg in msgs] == [0, 1, 2]
+
+    asyncio.run(run_it())
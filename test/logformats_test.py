@@ -46,6 +46,11 @@ try:
 except ModuleNotFoundError:
     asammdf = None
 
+try:
+    import numpy
+except ModuleNotFoundError:
+    numpy = None
+
 
 @contextmanager
 def override_locale(category: int, locale_str: str) -> None:
@@ -369,6 +374,44 @@ class ReaderWriterTest(unittest.TestCase, ComparingMessagesTestCase, metaclass=A
 
         self.assertMessagesEqual(self.original_messages, read_messages)
 
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_read_arrays(self):
+        """testing that read_arrays() yields the same frames as iterating"""
+        with self.writer_constructor(self.test_file_name) as writer:
+            self._write_all(writer)
+
+        with self.reader_constructor(self.test_file_name) as reader:
+            read_messages = list(reader)
+        with self.reader_constructor(self.test_file_name) as reader:
+            with self.assertRaises(ValueError):
+                next(reader.read_arrays(chunk_size=0))
+        with self.reader_constructor(self.test_file_name) as reader:
+            chunks = list(reader.read_arrays(chunk_size=3))
+
+        self.assertTrue(all(len(chunk) == 3 for chunk in chunks[:-1]))
+        frames = can.FrameArray.concatenate(chunks)
+        self.assertMessagesEqual(read_messages, frames.to_messages())
+
+    def test_on_messages_received(self):
+        """testing that writing batches gives the same result as single messages"""
+        with self.writer_constructor(self.test_file_name) as writer:
+            for msg in self.original_messages:
+                writer.on_message_received(msg)
+        with self.reader_constructor(self.test_file_name) as reader:
+            expected = list(reader)
+        # some writers append to existing files
+        os.remove(self.test_file_name)
+
+        with self.writer_constructor(self.test_file_name) as writer:
+            writer.on_messages_received([])
+            for index in range(0, len(self.original_messages), 3):
+                writer.on_messages_received(self.original_messages[index : index + 3])
+        with self.reader_constructor(self.test_file_name) as reader:
+            read_messages = list(reader)
+
+        self.assertEqual(len(read_messages), len(self.original_messages))
+        self.assertMessagesEqual(expected, read_messages)
+
     def _write_all(self, writer):
         """Writes messages and insert comments here and there."""
         # Note: we make no assumptions about the length of original_messages and original_comments
@@ -849,6 +892,225 @@ class TestBlfFileFormat(ReaderWriterTest):
         with can.BLFReader(logfile) as reader:
             return list(reader)
 
+    @parameterized.expand(
+        [
+            ("test_CanMessage.blf",),
+            ("test_CanMessage2.blf",),
+            ("test_CanFdMessage.blf",),
+            ("test_CanFdMessage64.blf",),
+            ("test_CanErrorFrameExt.blf",),
+            ("issue_1905.blf",),
+        ]
+    )
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_read_arrays(self, filename):
+        logfile = os.path.join(os.path.dirname(__file__), "data", filename)
+        with can.BLFReader(logfile) as reader:
+            frames = can.FrameArray.concatenate(reader.read_arrays())
+        self.assertMessagesEqual(frames.to_messages(), self._read_log_file(filename))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_read_arrays_signature_in_payload(self):
+        messages = [
+            can.Message(timestamp=float(index), data=b"LOBJLOBJ", channel=0)
+            for index in range(100)
+        ]
+        with can.BLFWriter(self.test_file_name, max_container_size=500) as writer:
+            for msg in messages:
+                writer(msg)
+        with can.BLFReader(self.test_file_name) as reader:
+            frames = can.FrameArray.concatenate(reader.read_arrays(chunk_size=7))
+        self.assertMessagesEqual(frames.to_messages(), messages)
+
+    @parameterized.expand([(1, None), (3, 1), (4, 16)])
+    def test_workers(self, workers, prefetch):
+        messages = [
+            can.Message(timestamp=index / 10, arbitration_id=index, data=[index % 256])
+            for index in range(500)
+        ]
+        # use small containers, so that many objects span two containers
+        with can.BLFWriter(self.test_file_name, max_container_size=100) as writer:
+            for msg in messages:
+                writer(msg)
+
+        with can.BLFReader(self.test_file_name) as reader:
+            expected = list(reader)
+        with can.BLFReader(
+            self.test_file_name, workers=workers, prefetch=prefetch
+        ) as reader:
+            self.assertMessagesEqual(list(reader), expected)
+
+        if numpy is not None:
+            with can.BLFReader(self.test_file_name, workers=workers) as reader:
+                frames = can.FrameArray.concatenate(reader.read_arrays())
+            self.assertMessagesEqual(frames.to_messages(), expected)
+
+    def test_workers_invalid(self):
+        logfile = os.path.join(os.path.dirname(__file__), "data", "test_CanMessage.blf")
+        with self.assertRaises(ValueError):
+            can.BLFReader(logfile, workers=-1)
+        with self.assertRaises(ValueError):
+            can.BLFReader(logfile, workers=1, prefetch=0)
+
+    def test_workers_aborted_iteration(self):
+        with can.BLFWriter(self.test_file_name, max_container_size=100) as writer:
+            for index in range(100):
+                writer(can.Message(timestamp=index, arbitration_id=index))
+        with can.BLFReader(self.test_file_name, workers=2) as reader:
+            iterator = iter(reader)
+            self.assertEqual(next(iterator).arbitration_id, 0)
+            iterator.close()
+
+    def _write_container_test_file(self):
+        messages = [
+            can.Message(
+                timestamp=1_700_000_000 + index / 8,
+                arbitration_id=index,
+                is_fd=index % 3 == 0,
+                data=bytes([index % 256]) * (64 if index % 3 == 0 else 8),
+            )
+            for index in range(1000)
+        ]
+        # small containers, so that many objects span two of them
+        with can.BLFWriter(self.test_file_name, max_container_size=700) as writer:
+            for msg in messages:
+                writer(msg)
+        return messages
+
+    def test_container_index(self):
+        messages = self._write_container_test_file()
+        with can.BLFReader(self.test_file_name) as reader:
+            index = reader.container_index
+            self.assertGreater(len(index), 50)
+            self.assertEqual(index[0].data_offset, 0)
+            for previous, entry in zip(index, index[1:]):
+                self.assertLess(previous.offset, entry.offset)
+            # containers may only hold the end of an object of the previous one
+            index = [entry for entry in index if entry.start_timestamp is not None]
+            self.assertEqual(index[0].start_timestamp, messages[0].timestamp)
+            self.assertEqual(index[-1].stop_timestamp, messages[-1].timestamp)
+            for previous, entry in zip(index, index[1:]):
+                self.assertLess(previous.stop_timestamp, entry.start_timestamp)
+            # building the index does not disturb reading
+            self.assertEqual(len(list(reader)), len(messages))
+
+    @parameterized.expand(
+        [
+            (0, 1000, 0),
+            (None, None, 0),
+            (None, 10.25, 0),
+            (100.3, 102.1, 0),
+            (100.3, 102.1, 2),
+            (120, None, 0),
+            (-1, 0.5, 0),
+            (200, 300, 0),
+        ]
+    )
+    def test_iter_range(self, start, stop, workers):
+        messages = self._write_container_test_file()
+        if start is not None:
+            start += 1_700_000_000
+        if stop is not None:
+            stop += 1_700_000_000
+        expected = [
+            msg
+            for msg in messages
+            if (start is None or msg.timestamp >= start)
+            and (stop is None or msg.timestamp < stop)
+        ]
+        with can.BLFReader(self.test_file_name, workers=workers) as reader:
+            # several ranges can be read from the same reader
+            for _ in range(2):
+                self.assertMessagesEqual(list(reader.iter_range(start, stop)), expected)
+
+    def test_seek_time(self):
+        messages = self._write_container_test_file()
+        with can.BLFReader(self.test_file_name) as reader:
+            reader.seek_time(1_700_000_050.2)
+            self.assertMessagesEqual(list(reader), messages[402:])
+        with can.BLFReader(self.test_file_name, timestamp_ns=True) as reader:
+            reader.seek_time(1_700_000_050)
+            self.assertEqual(next(iter(reader)).timestamp, 1_700_000_050_000_000_000)
+
+    def test_save_container_index(self):
+        self._write_container_test_file()
+        index_file_name = self.test_file_name + ".idx"
+        try:
+            with can.BLFReader(self.test_file_name) as reader:
+                reader.save_container_index(index_file_name)
+                index = reader.container_index
+            with can.BLFReader(self.test_file_name) as reader:
+                reader.load_container_index(index_file_name)
+                self.assertEqual(reader.container_index, index)
+            with can.BLFWriter(self.test_file_name) as writer:
+                writer(can.Message(timestamp=1_700_000_000))
+            with can.BLFReader(self.test_file_name) as reader:
+                with self.assertRaises(ValueError):
+                    reader.load_container_index(index_file_name)
+        finally:
+            os.remove(index_file_name)
+
+    def test_on_messages_received_containers(self):
+        messages = [
+            can.Message(timestamp=index / 8, arbitration_id=index, data=[index % 256])
+            for index in range(2000)
+        ]
+        with can.BLFWriter(self.test_file_name, max_container_size=1000) as writer:
+            # a single batch fills many containers
+            writer.on_messages_received(messages)
+        with can.BLFReader(self.test_file_name) as reader:
+            self.assertMessagesEqual(list(reader), messages)
+
+    def test_background_writer(self):
+        messages = [
+            can.Message(timestamp=index / 8, arbitration_id=index, data=[index % 256])
+            for index in range(2000)
+        ]
+        headers = []
+        for background in (False, True):
+            with can.BLFWriter(
+                self.test_file_name,
+                max_container_size=1000,
+                background=background,
+                max_queued_containers=2,
+            ) as writer:
+                for msg in messages:
+                    writer(msg)
+                estimated_size = writer.file_size()
+                self.assertGreater(estimated_size, 0)
+
+            # the queued containers are estimated with their compressed size,
+            # only the unfinished container is counted uncompressed
+            self.assertLessEqual(
+                estimated_size, os.path.getsize(self.test_file_name) + 1000
+            )
+            with can.BLFReader(self.test_file_name) as reader:
+                headers.append(
+                    (reader.file_size, reader.uncompressed_size, reader.object_count)
+                )
+                self.assertMessagesEqual(list(reader), messages)
+
+        self.assertEqual(headers[0], headers[1])
+        self.assertEqual(headers[1][0], os.path.getsize(self.test_file_name))
+        self.assertEqual(headers[1][2], len(messages))
+
+    def test_background_writer_error(self):
+        writer = can.BLFWriter(
+            self.test_file_name, max_container_size=100, background=True
+        )
+        with patch.object(writer, "_write_container", side_effect=OSError("full")):
+            with self.assertRaises(OSError):
+                for index in range(1000):
+                    writer(can.Message(timestamp=index, arbitration_id=index))
+            # the file is closed nevertheless
+            with self.assertRaises(OSError):
+                writer.stop()
+        self.assertTrue(writer.file.closed)
+
+    def test_background_writer_invalid(self):
+        with self.assertRaises(ValueError):
+            can.BLFWriter(self.test_file_name, background=True, max_queued_containers=0)
+
     def test_can_message(self):
         expected = can.Message(
             timestamp=2459565876.494607,
@@ -934,6 +1196,23 @@ class TestBlfFileFormat(ReaderWriterTest):
             places=3,
         )
 
+    def test_systemtime_to_timestamp_ns(self):
+        systemtime = blf.timestamp_to_systemtime(1636485425.998908)
+        self.assertEqual(
+            blf.systemtime_to_timestamp_ns(systemtime), 1636485425999000000
+        )
+        self.assertEqual(blf.systemtime_to_timestamp_ns((0,) * 8), 0)
+
+    def test_timestamp_ns(self):
+        logfile = os.path.join(os.path.dirname(__file__), "data", "issue_1905.blf")
+        with can.BLFReader(logfile, timestamp_ns=True) as reader:
+            timestamps = [msg.timestamp for msg in reader]
+        self.assertEqual(timestamps[:2], [1735654183491113000, 1735654188490966000])
+        self.assertTrue(all(isinstance(timestamp, int) for timestamp in timestamps))
+        messages = self._read_log_file("issue_1905.blf")
+        for timestamp, msg in zip(timestamps, messages, strict=True):
+            self.assertAlmostEqual(timestamp / 1e9, msg.timestamp, delta=1e-6)
+
     def test_issue_1905(self):
         expected = can.Message(
             timestamp=1735654183.491113,
@@ -1,12 +1,51 @@
 #!/usr/bin/env python
 
 import asyncio
+import select
+import socket
+import struct
+import threading
 import time
 import unittest
 
 import can
 
 
+class SocketPairBus(can.BusABC):
+    """A bus providing a file descriptor, the messages are sent by the
+    other end of a socket pair."""
+
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+        self.channel = channel
+        self.channel_info = f"socket pair {channel}"
+        self.socket, self.remote = socket.socketpair()
+
+    def put(self, arbitration_id):
+        self.remote.send(struct.pack("<L", arbitration_id))
+
+    def _recv_internal(self, timeout):
+        readable, _, _ = select.select([self.socket], [], [], timeout)
+        if not readable:
+            return None, False
+        (arbitration_id,) = struct.unpack("<L", self.socket.recv(4))
+        if arbitration_id == 0xFFFFFFFF:
+            raise can.CanOperationError("broken")
+        msg = can.Message(arbitration_id=arbitration_id, channel=self.channel)
+        return msg, False
+
+    def send(self, msg, timeout=None):
+        raise NotImplementedError
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def shutdown(self):
+        super().shutdown()
+        self.socket.close()
+        self.remote.close()
+
+
 class NotifierTest(unittest.TestCase):
     def test_single_bus(self):
         with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
@@ -72,6 +111,220 @@ class NotifierTest(unittest.TestCase):
                 # find_instance must return the existing instance
                 self.assertEqual(can.Notifier.find_instances(bus), (notifier,))
 
+    def test_selector(self):
+        buses = [SocketPairBus(channel) for channel in range(4)]
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            reader = can.BufferedReader()
+            with can.Notifier(
+                [*buses, bus], [reader], 0.1, use_selector=True
+            ) as notifier:
+                threads = [
+                    reader
+                    for reader in notifier._readers
+                    if isinstance(reader, threading.Thread)
+                ]
+                # one thread for the selector and one for the virtual bus
+                self.assertEqual(len(threads), 2)
+
+                for index in range(10):
+                    buses[index % 4].put(index)
+                bus.send(can.Message(arbitration_id=100))
+                received = [reader.get_message(1) for _ in range(11)]
+                self.assertNotIn(None, received)
+                self.assertEqual(
+                    sorted(msg.arbitration_id for msg in received),
+                    [*range(10), 100],
+                )
+                for msg in received:
+                    if msg.arbitration_id != 100:
+                        self.assertEqual(msg.channel, msg.arbitration_id % 4)
+            self.assertTrue(notifier.stopped)
+            self.assertFalse(any(thread.is_alive() for thread in threads))
+            # the selector is closed by its thread
+            self.assertIsNone(notifier._selector.get_map())
+            self.assertEqual(can.Notifier.find_instances(buses[0]), ())
+        for each_bus in buses:
+            each_bus.shutdown()
+
+    def test_selector_error(self):
+        buses = [SocketPairBus(channel) for channel in range(2)]
+        reader = can.BufferedReader()
+        errors = []
+        reader.on_error = errors.append
+        with can.Notifier(buses, [reader], 0.1, use_selector=True) as notifier:
+            buses[0].put(0xFFFFFFFF)
+            buses[1].put(1)
+            self.assertEqual(reader.get_message(1).arbitration_id, 1)
+            time.sleep(0.1)
+            self.assertEqual(len(errors), 1)
+            self.assertIs(notifier.exception, errors[0])
+            buses[0].put(2)
+            self.assertEqual(reader.get_message(1).arbitration_id, 2)
+
+        # unhandled errors stop receiving only from the failing bus
+        reader = can.BufferedReader()
+        with can.Notifier(buses, [reader], 0.1, use_selector=True):
+            with self.assertLogs("can.Notifier", "ERROR"):
+                buses[0].put(0xFFFFFFFF)
+                time.sleep(0.2)
+            buses[0].put(3)
+            buses[1].put(4)
+            self.assertEqual(reader.get_message(1).arbitration_id, 4)
+            self.assertIsNone(reader.get_message(0.2))
+        for each_bus in buses:
+            each_bus.shutdown()
+
+    def test_subscribe(self):
+        with can.Bus("test", interface="virtual") as bus:
+            everything = []
+            some_ids = []
+            standard_range = []
+            extended_range = []
+            notifier = can.Notifier(bus, [everything.append], 0.1)
+            notifier.subscribe(some_ids.append, ids=[0x100, 0x200])
+            notifier.subscribe(
+                standard_range.append, id_ranges=[(0x300, 0x30F)], extended=False
+            )
+            notifier.subscribe(
+                extended_range.append, id_ranges=[(0x10000, 0x1FFFFFFF)], extended=True
+            )
+            messages = [
+                can.Message(arbitration_id=0x100, is_extended_id=False),
+                can.Message(arbitration_id=0x100, is_extended_id=True),
+                can.Message(arbitration_id=0x200, is_extended_id=False),
+                can.Message(arbitration_id=0x300, is_extended_id=False),
+                can.Message(arbitration_id=0x30F, is_extended_id=True),
+                can.Message(arbitration_id=0x310, is_extended_id=False),
+                can.Message(arbitration_id=0x10000, is_extended_id=True),
+                can.Message(arbitration_id=0x10000, is_extended_id=False),
+            ]
+            for msg in messages:
+                notifier._on_message_received(msg)
+            self.assertEqual(everything, messages)
+            self.assertEqual(some_ids, [messages[0], messages[1], messages[2]])
+            self.assertEqual(standard_range, [messages[3]])
+            self.assertEqual(extended_range, [messages[6]])
+
+            notifier.unsubscribe(some_ids.append)
+            notifier._on_message_received(messages[0])
+            self.assertEqual(len(some_ids), 3)
+            with self.assertRaises(ValueError):
+                notifier.unsubscribe(some_ids.append)
+            notifier.stop()
+
+    def test_subscribe_listener(self):
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            reader = can.BufferedReader()
+            with can.Notifier(bus, [], 0.1) as notifier:
+                notifier.subscribe(reader, ids=[1])
+                for arbitration_id in range(3):
+                    bus.send(can.Message(arbitration_id=arbitration_id))
+                self.assertEqual(reader.get_message(1).arbitration_id, 1)
+                self.assertIsNone(reader.get_message(0.1))
+            # subscribed listeners are stopped as well
+            self.assertTrue(reader.is_stopped)
+
+    def test_subscribe_invalid(self):
+        with can.Bus("test", interface="virtual") as bus:
+            with can.Notifier(bus, [], 0.1) as notifier:
+                with self.assertRaises(ValueError):
+                    notifier.subscribe(print, ids=[0x20000000])
+                with self.assertRaises(ValueError):
+                    notifier.subscribe(print, id_ranges=[(0x200, 0x100)])
+
+
+class ListenerQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _slow_listener(self, msg):
+        self.started.set()
+        self.release.wait(5)
+        self.received.append(msg.arbitration_id)
+
+    def _fill(self, queue, count):
+        queue.put(can.Message(arbitration_id=0))
+        # the worker is busy with the first message now
+        self.assertTrue(self.started.wait(1))
+        for index in range(1, count):
+            queue.put(can.Message(arbitration_id=index))
+
+    def test_drop_oldest(self):
+        queue = can.notifier.ListenerQueue(self._slow_listener, 2, "drop_oldest")
+        self._fill(queue, 6)
+        self.assertEqual(queue.dropped, 3)
+        self.assertEqual(queue.high_water_mark, 2)
+        self.release.set()
+        queue.close(1)
+        self.assertEqual(self.received, [0, 4, 5])
+
+    def test_drop_newest(self):
+        queue = can.notifier.ListenerQueue(self._slow_listener, 2, "drop_newest")
+        self._fill(queue, 6)
+        self.assertEqual(queue.dropped, 3)
+        self.release.set()
+        queue.close(1)
+        self.assertEqual(self.received, [0, 1, 2])
+
+    def test_block(self):
+        queue = can.notifier.ListenerQueue(self._slow_listener, 2, "block")
+        self._fill(queue, 3)
+        producer = threading.Thread(
+            target=queue.put, args=(can.Message(arbitration_id=3),)
+        )
+        producer.start()
+        producer.join(0.1)
+        self.assertTrue(producer.is_alive())
+        self.release.set()
+        producer.join(1)
+        queue.close(1)
+        self.assertEqual(self.received, [0, 1, 2, 3])
+        self.assertEqual(queue.dropped, 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            can.notifier.ListenerQueue(print, -1)
+        with self.assertRaises(ValueError):
+            can.notifier.ListenerQueue(print, 1, "drop_all")
+
+    def test_notifier(self):
+        with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+            fast = can.BufferedReader()
+            slow = can.BufferedReader()
+            slow_on_message_received = slow.on_message_received
+            slow_received = []
+
+            def on_message_received(msg):
+                time.sleep(0.01)
+                slow_received.append(msg)
+                slow_on_message_received(msg)
+
+            slow.on_message_received = on_message_received
+            notifier = can.Notifier(bus, [fast], 0.1)
+            notifier.add_listener(slow, queued=True)
+            with self.assertRaises(ValueError):
+                notifier.add_listener(slow, queued=True)
+            with self.assertRaises(ValueError):
+                notifier.get_listener_queue(fast)
+
+            for index in range(20):
+                bus.send(can.Message(arbitration_id=index))
+            # the fast listener is not delayed by the slow one
+            for index in range(20):
+                self.assertEqual(fast.get_message(0.5).arbitration_id, index)
+            self.assertLess(len(slow_received), 20)
+            self.assertGreater(notifier.get_listener_queue(slow).high_water_mark, 0)
+
+            # stopping delivers the remaining messages
+            notifier.stop()
+            self.assertEqual(
+                [slow.get_message(0).arbitration_id for _ in range(20)],
+                list(range(20)),
+            )
+            self.assertTrue(slow.is_stopped)
+
 
 class AsyncNotifierTest(unittest.TestCase):
     def test_asyncio_notifier(self):
@@ -88,6 +341,72 @@ class AsyncNotifierTest(unittest.TestCase):
 
         asyncio.run(run_it())
 
+    def test_asyncio_notifier_batches(self):
+        async def run_it():
+            bus = SocketPairBus(0)
+            reader = can.AsyncBufferedReader()
+            notifier = can.Notifier(
+                bus, [reader], 0.1, loop=asyncio.get_running_loop(), max_batch_size=4
+            )
+            # the frames pile up while the event loop is busy
+            for index in range(10):
+                bus.put(index)
+            received = [
+                await asyncio.wait_for(reader.get_message(), 0.5) for _ in range(10)
+            ]
+            self.assertEqual([msg.arbitration_id for msg in received], list(range(10)))
+            self.assertEqual(notifier.batch_sizes, {4: 2, 2: 1})
+            notifier.stop()
+            bus.shutdown()
+
+        asyncio.run(run_it())
+
+    def test_asyncio_notifier_batches_thread(self):
+        async def run_it():
+            with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+                reader = can.AsyncBufferedReader()
+                notifier = can.Notifier(
+                    bus, [reader], 0.1, loop=asyncio.get_running_loop()
+                )
+                for index in range(10):
+                    bus.send(can.Message(arbitration_id=index))
+                received = [
+                    await asyncio.wait_for(reader.get_message(), 0.5) for _ in range(10)
+                ]
+                self.assertEqual(
+                    [msg.arbitration_id for msg in received], list(range(10))
+                )
+                self.assertEqual(
+                    sum(size * count for size, count in notifier.batch_sizes.items()),
+                    10,
+                )
+                notifier.stop()
+
+        asyncio.run(run_it())
+
+    def test_asyncio_queued_listener(self):
+        async def run_it():
+            with can.Bus("test", interface="virtual", receive_own_messages=True) as bus:
+                received = asyncio.Queue()
+
+                async def listener(msg):
+                    await received.put(msg)
+
+                notifier = can.Notifier(bus, [], 0.1, loop=asyncio.get_running_loop())
+                notifier.add_listener(listener, queued=True)
+                bus.send(can.Message(arbitration_id=0x123))
+                recv_msg = await asyncio.wait_for(received.get(), 0.5)
+                self.assertEqual(recv_msg.arbitration_id, 0x123)
+                notifier.remove_listener(listener, timeout=0.5)
+                notifier.stop()
+
+        asyncio.run(run_it())
+
+    def test_invalid_max_batch_size(self):
+        with can.Bus("test", interface="virtual") as bus:
+            with self.assertRaises(ValueError):
+                can.Notifier(bus, [], max_batch_size=0)
+
 
 if __name__ == "__main__":
     unittest.main()
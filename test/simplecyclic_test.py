@@ -4,9 +4,11 @@
 This module tests cyclic send tasks.
 """
 
+import asyncio
 import gc
 import platform
 import sys
+import threading
 import time
 import traceback
 import unittest
@@ -287,6 +289,317 @@ class SimpleCyclicSendTaskTest(unittest.TestCase, ComparingMessagesTestCase):
         self.assertEqual(b"\x06\x00\x00\x00\x00\x00\x00\x00", bytes(msg_list[5].data))
         self.assertEqual(b"\x07\x00\x00\x00\x00\x00\x00\x00", bytes(msg_list[6].data))
 
+    def test_modify_periodic_tasks(self):
+        with can.interface.Bus(interface="virtual") as bus:
+            msg = can.Message(is_extended_id=False, arbitration_id=0x100, data=[0])
+            valid_task = bus.send_periodic(msg, 0.1)
+            invalid_task = bus.send_periodic(msg, 0.1)
+
+            errors = bus.modify_periodic_tasks(
+                {
+                    valid_task: can.Message(
+                        is_extended_id=False, arbitration_id=0x100, data=[1]
+                    ),
+                    invalid_task: can.Message(
+                        is_extended_id=False, arbitration_id=0x200, data=[1]
+                    ),
+                }
+            )
+            self.assertEqual(list(errors), [invalid_task])
+            self.assertIsInstance(errors[invalid_task], ValueError)
+            self.assertEqual(valid_task.messages[0].data, bytearray([1]))
+            self.assertEqual(invalid_task.messages[0].data, bytearray([0]))
+
+    def test_scheduled_tasks(self):
+        with can.interface.Bus(interface="virtual", receive_own_messages=True) as bus:
+            tasks = []
+            for task_i in range(10):
+                msg = can.Message(
+                    is_extended_id=False, arbitration_id=task_i, data=[task_i]
+                )
+                tasks.append(bus.send_periodic(msg, 0.02, scheduler=True))
+            self.assertIsInstance(
+                tasks[0], can.broadcastmanager.ScheduledCyclicSendTask
+            )
+            scheduler = bus._cyclic_scheduler
+            self.assertTrue(all(task.scheduler is scheduler for task in tasks))
+            self.assertEqual(len(bus._periodic_tasks), 10)
+
+            tasks[0].modify_data(
+                can.Message(is_extended_id=False, arbitration_id=0, data=[0xFF])
+            )
+            received = set()
+            for _ in range(100):
+                msg = bus.recv(timeout=5.0)
+                self.assertIsNotNone(msg)
+                received.add((msg.arbitration_id, bytes(msg.data)))
+            self.assertIn((0, b"\xff"), received)
+            self.assertTrue(
+                {(task_i, bytes([task_i])) for task_i in range(1, 10)} <= received
+            )
+
+            for task in tasks[::2]:
+                task.stop()
+            self.assertEqual(len(bus._periodic_tasks), 5)
+            sleep(0.05)
+            while bus.recv(timeout=0) is not None:
+                pass
+            for _ in range(20):
+                self.assertIn(bus.recv(timeout=5.0).arbitration_id % 2, (1,))
+
+        # the scheduler of the bus is stopped with it
+        self.join_threads([scheduler._thread], 5.0)
+
+    def test_scheduled_task_duration_and_restart(self):
+        with can.ThreadSafeBus(interface="virtual", receive_own_messages=True) as bus:
+            scheduler = can.broadcastmanager.CyclicScheduler()
+            msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+            task = bus.send_periodic(msg, 0.01, duration=0.1, scheduler=scheduler)
+            sleep(0.5)
+            self.assertTrue(task.stopped)
+            self.assertEqual(bus._periodic_tasks, [])
+            count = bus.queue.qsize()
+            self.assertGreater(count, 0)
+            sleep(0.1)
+            self.assertEqual(bus.queue.qsize(), count)
+
+            task.duration = None
+            task.start()
+            sleep(0.1)
+            self.assertGreater(bus.queue.qsize(), count)
+            task.stop()
+
+            scheduler.stop()
+            self.join_threads([scheduler._thread], 5.0)
+            with self.assertRaises(RuntimeError):
+                task.start()
+            self.assertTrue(task.stopped)
+
+    def test_scheduled_modifier_callback(self):
+        def increment_first_byte(msg: can.Message) -> None:
+            msg.data[0] = (msg.data[0] + 1) % 256
+
+        with can.interface.Bus(interface="virtual", receive_own_messages=True) as bus:
+            task = bus.send_periodic(
+                can.Message(is_extended_id=False, arbitration_id=0x123, data=[0]),
+                period=0.001,
+                modifier_callback=increment_first_byte,
+                scheduler=True,
+            )
+            received = [bus.recv(timeout=5.0) for _ in range(5)]
+            task.stop()
+        self.assertEqual([msg.data[0] for msg in received], [1, 2, 3, 4, 5])
+
+    def test_scheduled_task_errors(self):
+        scheduler = can.broadcastmanager.CyclicScheduler()
+        with can.interface.Bus(interface="virtual") as bus:
+            pass
+
+        # the bus has been shut down, so sending fails
+        lock = threading.Lock()
+        msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+        stopping_task = can.broadcastmanager.ScheduledCyclicSendTask(
+            bus, lock, msg, 0.01, scheduler
+        )
+        on_error_mock = MagicMock(return_value=True)
+        continuing_task = can.broadcastmanager.ScheduledCyclicSendTask(
+            bus, lock, msg, 0.01, scheduler, on_error=on_error_mock
+        )
+        sleep(0.3)
+        self.assertTrue(stopping_task.stopped)
+        self.assertFalse(continuing_task.stopped)
+        self.assertGreater(on_error_mock.call_count, 1)
+        scheduler.stop()
+        # the tasks of a stopped scheduler do not pretend to be running
+        self.assertTrue(continuing_task.stopped)
+
+    def test_scheduled_task_failing_on_error(self):
+        scheduler = can.broadcastmanager.CyclicScheduler()
+        with can.interface.Bus(interface="virtual") as bus:
+            pass
+
+        lock = threading.Lock()
+        msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+        failing_task = can.broadcastmanager.ScheduledCyclicSendTask(
+            bus, lock, msg, 0.01, scheduler, on_error=MagicMock(side_effect=KeyError)
+        )
+        on_error_mock = MagicMock(return_value=True)
+        continuing_task = can.broadcastmanager.ScheduledCyclicSendTask(
+            bus, lock, msg, 0.01, scheduler, on_error=on_error_mock
+        )
+        with self.assertLogs("can.bcm", "ERROR"):
+            sleep(0.3)
+        # only the task with the failing callback is stopped
+        self.assertTrue(failing_task.stopped)
+        self.assertFalse(continuing_task.stopped)
+        self.assertTrue(scheduler._thread.is_alive())
+        self.assertGreater(on_error_mock.call_count, 1)
+        scheduler.stop()
+
+    def test_async_tasks(self):
+        async def run(bus):
+            loop = asyncio.get_running_loop()
+            thread_count = threading.active_count()
+            tasks = []
+            for task_i in range(10):
+                msg = can.Message(
+                    is_extended_id=False, arbitration_id=task_i, data=[task_i]
+                )
+                tasks.append(bus.send_periodic(msg, 0.02, loop=loop))
+            self.assertIsInstance(tasks[0], can.broadcastmanager.AsyncCyclicSendTask)
+            self.assertEqual(threading.active_count(), thread_count)
+            self.assertEqual(len(bus._periodic_tasks), 10)
+
+            tasks[0].modify_data(
+                can.Message(is_extended_id=False, arbitration_id=0, data=[0xFF])
+            )
+            await asyncio.sleep(0.2)
+            received = set()
+            while (msg := bus.recv(timeout=0)) is not None:
+                received.add((msg.arbitration_id, bytes(msg.data)))
+            self.assertIn((0, b"\xff"), received)
+            self.assertTrue(
+                {(task_i, bytes([task_i])) for task_i in range(1, 10)} <= received
+            )
+
+            bus.stop_all_periodic_tasks()
+            await asyncio.sleep(0.05)
+            while bus.recv(timeout=0) is not None:
+                pass
+            await asyncio.sleep(0.1)
+            self.assertIsNone(bus.recv(timeout=0))
+
+        with can.interface.Bus(interface="virtual", receive_own_messages=True) as bus:
+            asyncio.run(run(bus))
+
+    def test_async_task_timing(self):
+        async def run(bus):
+            task = bus.send_periodic(
+                can.Message(is_extended_id=False, arbitration_id=0x123, data=[0]),
+                period=0.01,
+                duration=0.2,
+                loop=asyncio.get_running_loop(),
+                modifier_callback=increment_first_byte,
+            )
+            await asyncio.sleep(0.4)
+            self.assertTrue(task.stopped)
+            self.assertEqual(bus._periodic_tasks, [])
+            return task
+
+        def increment_first_byte(msg: can.Message) -> None:
+            msg.data[0] = (msg.data[0] + 1) % 256
+
+        with can.interface.Bus(interface="virtual", receive_own_messages=True) as bus:
+            asyncio.run(run(bus))
+            received = []
+            while (msg := bus.recv(timeout=0)) is not None:
+                received.append(msg)
+
+        # the due times do not drift
+        self.assertTrue(19 <= len(received) <= 21, len(received))
+        self.assertEqual(
+            [msg.data[0] for msg in received], list(range(1, len(received) + 1))
+        )
+
+    def test_async_task_from_other_thread(self):
+        loop = asyncio.new_event_loop()
+        thread = Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            with can.interface.Bus(
+                interface="virtual", receive_own_messages=True
+            ) as bus:
+                msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+                task = bus.send_periodic(msg, 0.01, loop=loop, autostart=False)
+                sleep(0.05)
+                self.assertIsNone(bus.recv(timeout=0))
+                task.start()
+                self.assertIsNotNone(bus.recv(timeout=5.0))
+                task.stop()
+                sleep(0.05)
+                while bus.recv(timeout=0) is not None:
+                    pass
+                sleep(0.05)
+                self.assertIsNone(bus.recv(timeout=0))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5.0)
+            loop.close()
+
+    def test_async_task_errors(self):
+        async def run(bus):
+            msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+            loop = asyncio.get_running_loop()
+            stopping_task = can.broadcastmanager.AsyncCyclicSendTask(
+                bus, msg, 0.01, loop
+            )
+            on_error_mock = MagicMock(return_value=True)
+            continuing_task = can.broadcastmanager.AsyncCyclicSendTask(
+                bus, msg, 0.01, loop, on_error=on_error_mock
+            )
+            await asyncio.sleep(0.1)
+            self.assertTrue(stopping_task.stopped)
+            self.assertFalse(continuing_task.stopped)
+            self.assertGreater(on_error_mock.call_count, 1)
+            continuing_task.stop()
+
+        with can.interface.Bus(interface="virtual") as bus:
+            pass
+        # the bus has been shut down, so sending fails
+        asyncio.run(run(bus))
+
+        loop = asyncio.new_event_loop()
+        with self.assertRaises(ValueError):
+            bus.send_periodic(can.Message(), 0.1, scheduler=True, loop=loop)
+        loop.close()
+
+    def test_timing_stats(self):
+        stats = can.broadcastmanager.CyclicTimingStats(0.01, lateness_bins=(0.001,))
+        self.assertIsNone(stats.mean_period)
+        stats.record(1.0, 1.0)
+        stats.record(1.01, 1.01)
+        stats.record(1.025, 1.02)
+        # restarting does not count the pause as a period
+        stats.restart()
+        stats.record(5.0, 4.98)
+        self.assertEqual(stats.count, 4)
+        self.assertAlmostEqual(stats.mean_period, 0.0125)
+        self.assertAlmostEqual(stats.min_period, 0.01)
+        self.assertAlmostEqual(stats.max_period, 0.015)
+        self.assertEqual(stats.lateness_histogram, [2, 2])
+        self.assertAlmostEqual(stats.max_lateness, 0.02)
+        self.assertEqual(stats.missed_deadlines, 1)
+
+        stats.reset()
+        self.assertEqual(stats.count, 0)
+        self.assertIsNone(stats.max_period)
+
+    def test_timing_stats_of_tasks(self):
+        async def run(bus):
+            task = bus.send_periodic(msg, 0.01, loop=asyncio.get_running_loop())
+            await asyncio.sleep(0.2)
+            task.stop()
+            return task
+
+        msg = can.Message(is_extended_id=False, arbitration_id=0x123)
+        with can.interface.Bus(interface="virtual") as bus:
+            tasks = [
+                bus.send_periodic(msg, 0.01),
+                bus.send_periodic(msg, 0.01, scheduler=True),
+                asyncio.run(run(bus)),
+            ]
+            sleep(0.2)
+            bus.stop_all_periodic_tasks()
+
+        for task in tasks:
+            with self.subTest(task=type(task).__name__):
+                stats = task.timing_stats
+                self.assertGreater(stats.count, 5)
+                self.assertLessEqual(stats.min_period, stats.mean_period)
+                self.assertLessEqual(stats.mean_period, stats.max_period)
+                self.assertAlmostEqual(stats.mean_period, 0.01, delta=0.005)
+                self.assertEqual(sum(stats.lateness_histogram), stats.count)
+
     @staticmethod
     def join_threads(threads: list[Thread], timeout: float) -> None:
         stuck_threads: list[Thread] = []
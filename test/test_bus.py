@@ -1,6 +1,8 @@
 import gc
 from unittest.mock import patch
 
+import pytest
+
 import can
 
 
@@ -21,3 +23,70 @@ def test_bus_attempts_self_cleanup(mock_shutdown):
     del bus
     gc.collect()
     mock_shutdown.assert_called()
+
+
+class _FallbackBus(can.BusABC):
+    """A bus that only implements the single message receive path."""
+
+    def __init__(self, messages, **kwargs):
+        self._messages = list(messages)
+        super().__init__(channel=None, **kwargs)
+
+    def _recv_internal(self, timeout):
+        if self._messages:
+            return self._messages.pop(0), False
+        return None, False
+
+    def send(self, msg, timeout=None):
+        if msg.arbitration_id == 0xBAD:
+            raise can.CanOperationError("cannot send")
+        self._messages.append(msg)
+
+
+@pytest.mark.parametrize(
+    ("max_messages", "expected"),
+    [(1, [0]), (3, [0, 1, 2]), (10, [0, 1, 2, 3, 4])],
+)
+def test_recv_batch_fallback(max_messages, expected):
+    messages = [can.Message(arbitration_id=i) for i in range(5)]
+    with _FallbackBus(messages) as bus:
+        received = bus.recv_batch(max_messages=max_messages, timeout=0)
+    assert [msg.arbitration_id for msg in received] == expected
+
+
+def test_recv_batch_fallback_filtered():
+    messages = [can.Message(arbitration_id=i) for i in range(5)]
+    filters = [{"can_id": 0x1, "can_mask": 0x1}]
+    with _FallbackBus(messages, can_filters=filters) as bus:
+        received = bus.recv_batch(timeout=0)
+        assert [msg.arbitration_id for msg in received] == [1, 3]
+        assert bus.recv_batch(timeout=0) == []
+
+
+def test_recv_batch_fallback_busy_filtered():
+    class _BusyBus(_FallbackBus):
+        def _recv_internal(self, timeout):
+            self.reads += 1
+            return can.Message(arbitration_id=0), False
+
+    filters = [{"can_id": 0x1, "can_mask": 0x1}]
+    with _BusyBus([], can_filters=filters) as bus:
+        bus.reads = 0
+        # the rejected messages end the batch as well
+        assert bus.recv_batch(max_messages=4, timeout=0) == []
+        assert bus.reads == 4
+
+
+def test_send_batch_fallback():
+    messages = [can.Message(arbitration_id=i) for i in range(5)]
+    with _FallbackBus([]) as bus:
+        assert bus.send_batch(messages, timeout=0.1) == 5
+        assert bus.recv_batch(timeout=0) == messages
+
+
+def test_send_batch_fallback_partial():
+    messages = [can.Message(arbitration_id=i) for i in (1, 2, 0xBAD, 3)]
+    with _FallbackBus([]) as bus:
+        assert bus.send_batch(messages) == 2
+        with pytest.raises(can.CanOperationError):
+            bus.send_batch(messages[2:])
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.BusStatistics` and the calculation of the frame
+lengths.
+"""
+
+import unittest
+
+import can
+from can.bus_statistics import frame_bit_length
+
+# an all zero standard frame without data: 34 bits including the CRC, one stuff
+# bit after every five bits and 13 bits of tail
+ZERO_FRAME_BITS = 34 + 6 + 13
+
+
+def _zero_frame(timestamp, arbitration_id=0):
+    return can.Message(
+        timestamp=timestamp, arbitration_id=arbitration_id, is_extended_id=False
+    )
+
+
+class FrameBitLengthTest(unittest.TestCase):
+    def test_classical_frames(self):
+        self.assertEqual(frame_bit_length(_zero_frame(0.0)), (ZERO_FRAME_BITS, 0))
+
+        # between no stuff bits and the worst case
+        for data in (bytes(8), b"\xff" * 8, b"\x55" * 8, bytes(range(8))):
+            for is_extended_id, minimum in ((False, 111), (True, 131)):
+                with self.subTest(data=data, is_extended_id=is_extended_id):
+                    bits, data_bits = frame_bit_length(
+                        can.Message(
+                            arbitration_id=0x7FF,
+                            data=data,
+                            is_extended_id=is_extended_id,
+                        )
+                    )
+                    self.assertEqual(data_bits, 0)
+                    self.assertGreaterEqual(bits, minimum)
+                    self.assertLessEqual(bits, minimum + (minimum - 13 - 1) // 4)
+
+    def test_remote_frame(self):
+        remote_frame = can.Message(is_remote_frame=True, is_extended_id=False, dlc=8)
+        bits, data_bits = frame_bit_length(remote_frame)
+        # no data is transmitted despite the DLC
+        self.assertGreaterEqual(bits, 47)
+        self.assertLessEqual(bits, 47 + 8)
+        self.assertEqual(data_bits, 0)
+
+    def test_fd_frames(self):
+        # 22 bits up to the DLC with a stuff bit after the FDF bit followed
+        # by 27 bits of stuff count and CRC
+        msg = can.Message(arbitration_id=0x555, is_extended_id=False, is_fd=True)
+        self.assertEqual(frame_bit_length(msg), (22 + 1 + 27 + 13, 0))
+
+        # the ESI and DLC bits following the BRS bit are stuffed
+        msg.bitrate_switch = True
+        self.assertEqual(frame_bit_length(msg), (17 + 13, 5 + 1 + 27))
+
+        # BRS, ESI and the DLC code 0b1011 of 20 bytes followed by alternating
+        # data bits need no stuff bits
+        msg.data = bytearray(b"\x55" * 20)
+        msg.dlc = 20
+        self.assertEqual(frame_bit_length(msg), (17 + 13, 5 + 160 + 32))
+
+        # the DLC code 0b1111 of 64 bytes is followed by 512 zero data bits,
+        # which need 102 stuff bits
+        msg.data = bytearray(64)
+        msg.dlc = 64
+        self.assertEqual(frame_bit_length(msg), (17 + 13, 5 + 512 + 102 + 32))
+
+    def test_error_frame(self):
+        self.assertEqual(frame_bit_length(can.Message(is_error_frame=True)), (17, 0))
+
+
+class BusStatisticsTest(unittest.TestCase):
+    def test_bus_load(self):
+        statistics = can.BusStatistics(bitrate=500_000, windows=(1.0, 0.1))
+        self.assertEqual(statistics.windows, [0.1, 1.0])
+        for index in range(20):
+            statistics(_zero_frame(index * 0.1))
+
+        snapshot = statistics.snapshot()
+        self.assertAlmostEqual(snapshot.timestamp, 1.9)
+        self.assertEqual(snapshot.frame_count, 20)
+        # the windows end with the latest frame and exclude their start
+        self.assertEqual(snapshot.frame_rate, {0.1: 10.0, 1.0: 10.0})
+        self.assertAlmostEqual(snapshot.bus_load[0.1], ZERO_FRAME_BITS / 500_000 / 0.1)
+        self.assertAlmostEqual(snapshot.bus_load[1.0], 10 * ZERO_FRAME_BITS / 500_000)
+
+    def test_long_history(self):
+        statistics = can.BusStatistics(bitrate=500_000, windows=(0.5,))
+        for index in range(20_000):
+            statistics(_zero_frame(index * 0.001))
+        snapshot = statistics.snapshot()
+        self.assertAlmostEqual(snapshot.frame_rate[0.5], 1000.0)
+        self.assertAlmostEqual(
+            snapshot.bus_load[0.5], 1000 * ZERO_FRAME_BITS / 500_000, places=6
+        )
+
+    def test_data_bitrate(self):
+        msg = can.Message(is_fd=True, bitrate_switch=True, data=bytes(64))
+        nominal_bits, data_bits = frame_bit_length(msg)
+        timing = can.BitTimingFd(
+            f_clock=80_000_000,
+            nom_brp=1,
+            nom_tseg1=119,
+            nom_tseg2=40,
+            nom_sjw=40,
+            data_brp=1,
+            data_tseg1=29,
+            data_tseg2=10,
+            data_sjw=10,
+        )
+        statistics = can.BusStatistics(timing=timing)
+        self.assertAlmostEqual(
+            statistics.frame_duration(msg),
+            nominal_bits / 500_000 + data_bits / 2_000_000,
+        )
+
+        statistics = can.BusStatistics(
+            timing=can.BitTiming(f_clock=8_000_000, brp=4, tseg1=11, tseg2=4, sjw=2)
+        )
+        self.assertAlmostEqual(
+            statistics.frame_duration(msg), (nominal_bits + data_bits) / 125_000
+        )
+
+    def test_id_timing(self):
+        statistics = can.BusStatistics(
+            bitrate=500_000, period_bins=(0.01, 0.1), jitter_bins=(-0.001, 0.001)
+        )
+        for timestamp in (0.0, 0.05, 0.1, 0.15, 0.2, 0.4):
+            statistics(_zero_frame(timestamp, 0x100))
+        statistics(_zero_frame(0.5, 0x200))
+        statistics(can.Message(timestamp=0.6, is_error_frame=True))
+
+        snapshot = statistics.snapshot()
+        self.assertEqual(snapshot.frame_count, 8)
+        self.assertEqual(set(snapshot.ids), {0x100, 0x200})
+
+        timing = snapshot.ids[0x100]
+        self.assertEqual(timing.frame_count, 6)
+        self.assertAlmostEqual(timing.mean_period, 0.08)
+        self.assertAlmostEqual(timing.min_period, 0.05)
+        self.assertAlmostEqual(timing.max_period, 0.2)
+        self.assertEqual(timing.period_histogram, (0, 4, 1))
+        # the first period has no average to compare with
+        self.assertEqual(timing.jitter_histogram, (0, 3, 1))
+
+        timing = snapshot.ids[0x200]
+        self.assertEqual(timing.frame_count, 1)
+        self.assertIsNone(timing.mean_period)
+        self.assertEqual(timing.period_histogram, (0, 0, 0))
+
+    def test_snapshot_interval(self):
+        snapshots = []
+        statistics = can.BusStatistics(
+            bitrate=500_000, snapshot_interval=1.0, on_snapshot=snapshots.append
+        )
+        for timestamp in (10.0, 10.5, 11.0, 11.5, 15.2, 15.3, 16.2):
+            statistics(_zero_frame(timestamp))
+        self.assertEqual(
+            [snapshot.timestamp for snapshot in snapshots], [11.0, 15.2, 16.2]
+        )
+        self.assertEqual(snapshots[0].frame_count, 3)
+
+        statistics.reset()
+        self.assertEqual(statistics.snapshot().frame_count, 0)
+        self.assertEqual(statistics.snapshot().ids, {})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            can.BusStatistics()
+        with self.assertRaises(ValueError):
+            can.BusStatistics(bitrate=500_000, windows=())
+        with self.assertRaises(ValueError):
+            can.BusStatistics(bitrate=500_000, snapshot_interval=0)
+        with self.assertRaises(ValueError):
+            can.BusStatistics(bitrate=500_000, period_bins=(1.0, 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
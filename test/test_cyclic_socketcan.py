@@ -568,6 +568,47 @@ class CyclicSocketCan(unittest.TestCase):
         with self.assertRaises(ValueError):
             task.modify_data(new_message)
 
+    def test_modify_periodic_tasks(self):
+        tasks = [
+            self._send_bus.send_periodic(
+                can.Message(arbitration_id=0x401 + i, data=[i], is_extended_id=False),
+                self.PERIOD,
+            )
+            for i in range(3)
+        ]
+        # the kernel rejects the update of a deleted task
+        tasks[1].stop()
+
+        errors = self._send_bus.modify_periodic_tasks(
+            {
+                task: can.Message(
+                    arbitration_id=task.arbitration_id,
+                    data=[0xFF],
+                    is_extended_id=False,
+                )
+                for task in tasks
+            }
+        )
+        self.assertEqual(list(errors), [tasks[1]])
+        self.assertIsInstance(errors[tasks[1]], can.CanOperationError)
+        self.assertEqual(tasks[0].messages[0].data, bytearray([0xFF]))
+        self.assertEqual(tasks[1].messages[0].data, bytearray([1]))
+        self.assertEqual(tasks[2].messages[0].data, bytearray([0xFF]))
+
+        # invalid updates are reported per task as well
+        errors = self._send_bus.modify_periodic_tasks({tasks[0]: None})
+        self.assertIsInstance(errors[tasks[0]], ValueError)
+
+        time.sleep(2 * self.PERIOD)
+        received = set()
+        while (msg := self._recv_bus.recv(0)) is not None:
+            received.add((msg.arbitration_id, bytes(msg.data)))
+        self.assertIn((0x401, b"\xff"), received)
+        self.assertIn((0x403, b"\xff"), received)
+        self.assertNotIn((0x402, b"\xff"), received)
+
+        self._send_bus.stop_all_periodic_tasks()
+
     def test_stop_all_periodic_tasks_and_remove_task(self):
         message_a = can.Message(
             arbitration_id=0x401,
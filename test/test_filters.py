@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+"""
+This module tests :mod:`can.filters`.
+"""
+
+import random
+import unittest
+from unittest import mock
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
+import can
+from can.filters import filter_covers, merge_filters, reduce_filters
+
+
+def _matches(filters, arbitration_id, is_extended_id):
+    for _filter in filters:
+        if "extended" in _filter and _filter["extended"] != is_extended_id:
+            continue
+        if (_filter["can_id"] ^ arbitration_id) & _filter["can_mask"] == 0:
+            return True
+    return False
+
+
+_FILTER_STRATEGY = st.fixed_dictionaries(
+    {
+        "can_id": st.integers(min_value=0, max_value=0x1FFFFFFF),
+        "can_mask": st.sampled_from([0x0, 0x700, 0x7F0, 0x7FF, 0x1FFFFFFF])
+        | st.integers(min_value=0, max_value=0x1FFFFFFF),
+    },
+    optional={"extended": st.booleans()},
+)
+
+
+class TestFilterHelpers(unittest.TestCase):
+    def test_merge_filters(self):
+        merged = merge_filters(
+            {"can_id": 0x100, "can_mask": 0x7FF, "extended": False},
+            {"can_id": 0x101, "can_mask": 0x7FF, "extended": False},
+        )
+        self.assertEqual(
+            merged, {"can_id": 0x100, "can_mask": 0x7FE, "extended": False}
+        )
+
+    def test_merge_filters_different_kinds(self):
+        merged = merge_filters(
+            {"can_id": 0x100, "can_mask": 0x7FF, "extended": False},
+            {"can_id": 0x100, "can_mask": 0x7FF, "extended": True},
+        )
+        self.assertEqual(merged, {"can_id": 0x100, "can_mask": 0x7FF})
+
+    def test_filter_covers(self):
+        outer = {"can_id": 0x100, "can_mask": 0x700}
+        inner = {"can_id": 0x123, "can_mask": 0x7FF, "extended": False}
+        self.assertTrue(filter_covers(outer, inner))
+        self.assertFalse(filter_covers(inner, outer))
+        self.assertFalse(filter_covers({**outer, "extended": True}, inner))
+
+    @settings(max_examples=100, deadline=None)
+    @given(first=_FILTER_STRATEGY, second=_FILTER_STRATEGY)
+    def test_merged_filter_covers_both(self, first, second):
+        merged = merge_filters(first, second)
+        first["can_id"] &= first["can_mask"]
+        second["can_id"] &= second["can_mask"]
+        self.assertTrue(filter_covers(merged, first))
+        self.assertTrue(filter_covers(merged, second))
+
+
+class TestReduceFilters(unittest.TestCase):
+    def test_within_budget(self):
+        filters = [{"can_id": 0x123, "can_mask": 0x7FF}]
+        reduced = reduce_filters(filters, max_filters=2)
+        self.assertIs(reduced.hardware, filters)
+        self.assertIsNone(reduced.software)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            reduce_filters([], max_filters=0)
+
+    def test_redundant_filters_are_exact(self):
+        filters = [
+            {"can_id": 0x100, "can_mask": 0x700, "extended": False},
+            {"can_id": 0x123, "can_mask": 0x7FF, "extended": False},
+            {"can_id": 0x123, "can_mask": 0x7FF, "extended": False},
+        ]
+        reduced = reduce_filters(filters, max_filters=1)
+        self.assertEqual(
+            reduced.hardware, [{"can_id": 0x100, "can_mask": 0x700, "extended": False}]
+        )
+        self.assertIsNone(reduced.software)
+
+    def test_neighbouring_ids_are_merged(self):
+        filters = [
+            {"can_id": can_id, "can_mask": 0x7FF, "extended": False}
+            for can_id in (0x100, 0x101, 0x102, 0x103, 0x500, 0x501)
+        ]
+        reduced = reduce_filters(filters, max_filters=2)
+        self.assertCountEqual(
+            reduced.hardware,
+            [
+                {"can_id": 0x100, "can_mask": 0x7FC, "extended": False},
+                {"can_id": 0x500, "can_mask": 0x7FE, "extended": False},
+            ],
+        )
+        # the two merged groups are exact, but this is not detected
+        self.assertIs(reduced.software, filters)
+
+    def test_many_exact_ids(self):
+        rng = random.Random(0)
+        filters = [
+            {"can_id": rng.getrandbits(29), "can_mask": 0x1FFFFFFF, "extended": True}
+            for _ in range(2000)
+        ]
+        for max_filters in (512, 4):
+            reduced = reduce_filters(filters, max_filters)
+            self.assertEqual(len(reduced.hardware), max_filters)
+            self.assertIs(reduced.software, filters)
+            for can_filter in filters:
+                self.assertTrue(_matches(reduced.hardware, can_filter["can_id"], True))
+
+    def test_too_many_filters_are_merged_into_one(self):
+        filters = [
+            {"can_id": can_id, "can_mask": 0x7FF, "extended": False}
+            for can_id in (0x100, 0x101, 0x104)
+        ]
+        with mock.patch("can.filters._MAX_REDUCIBLE_FILTERS", 2):
+            reduced = reduce_filters(filters, max_filters=2)
+        self.assertEqual(
+            reduced.hardware, [{"can_id": 0x100, "can_mask": 0x7FA, "extended": False}]
+        )
+        self.assertIs(reduced.software, filters)
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        filters=st.lists(_FILTER_STRATEGY, min_size=1, max_size=12),
+        max_filters=st.integers(min_value=1, max_value=4),
+        arbitration_id=st.integers(min_value=0, max_value=0x1FFFFFFF),
+        is_extended_id=st.booleans(),
+    )
+    def test_reduced_filters_are_a_superset(
+        self, filters, max_filters, arbitration_id, is_extended_id
+    ):
+        reduced = reduce_filters(filters, max_filters)
+        self.assertLessEqual(len(reduced.hardware), max_filters)
+        for can_id in (arbitration_id, filters[-1]["can_id"]):
+            if _matches(filters, can_id, is_extended_id):
+                self.assertTrue(_matches(reduced.hardware, can_id, is_extended_id))
+            elif reduced.software is None:
+                self.assertFalse(_matches(reduced.hardware, can_id, is_extended_id))
+
+
+class _LimitedFilterBus(can.BusABC):
+    """A bus with a single hardware filter, which only pretends to filter."""
+
+    _max_hardware_filters = 1
+
+    def __init__(self, messages, **kwargs):
+        self.messages = list(messages)
+        self.applied_filters = None
+        super().__init__(channel=None, **kwargs)
+
+    def _apply_filters(self, filters):
+        self.applied_filters = filters
+
+    def _recv_internal(self, timeout):
+        if self.messages:
+            return self.messages.pop(0), True
+        return None, True
+
+    def send(self, msg, timeout=None):
+        raise NotImplementedError
+
+
+class TestSetFilters(unittest.TestCase):
+    def test_reduced_filters_are_applied(self):
+        filters = [
+            {"can_id": 0x100, "can_mask": 0x7FF, "extended": False},
+            {"can_id": 0x103, "can_mask": 0x7FF, "extended": False},
+        ]
+        messages = [
+            can.Message(arbitration_id=can_id, is_extended_id=False)
+            for can_id in (0x100, 0x101, 0x103)
+        ]
+        with _LimitedFilterBus(messages, can_filters=filters) as bus:
+            self.assertEqual(
+                bus.applied_filters,
+                [{"can_id": 0x100, "can_mask": 0x7FC, "extended": False}],
+            )
+            # the false positive is removed in software
+            received = bus.recv_batch(timeout=0)
+            self.assertEqual([msg.arbitration_id for msg in received], [0x100, 0x103])
+            self.assertEqual(bus.filter_stats.rejected, 1)
+
+    def test_exact_filters_are_trusted(self):
+        filters = [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}]
+        messages = [can.Message(arbitration_id=0x101, is_extended_id=False)]
+        with _LimitedFilterBus(messages, can_filters=filters) as bus:
+            self.assertIs(bus.applied_filters, filters)
+            self.assertEqual(bus.recv(timeout=0), messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
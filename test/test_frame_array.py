@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.FrameArray`.
+"""
+
+import unittest
+
+import can
+from can.frame_array import FrameFlags, message_flags
+
+from .data.example_data import TEST_MESSAGES_CAN_FD, generate_message
+from .message_helper import ComparingMessagesTestCase
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _messages():
+    return [
+        can.Message(
+            timestamp=0.5 * index,
+            arbitration_id=0x100 + index % 4,
+            is_extended_id=bool(index % 2),
+            data=bytes(range(index % 9)),
+            channel="can0" if index % 3 else "can1",
+        )
+        for index in range(20)
+    ]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class FrameArrayTest(unittest.TestCase, ComparingMessagesTestCase):
+    def __init__(self, *args, **kwargs):
+        unittest.TestCase.__init__(self, *args, **kwargs)
+        ComparingMessagesTestCase.__init__(self)
+
+    def test_round_trip(self):
+        messages = _messages() + list(TEST_MESSAGES_CAN_FD)
+        messages += [
+            can.Message(arbitration_id=0x12, is_remote_frame=True, dlc=5),
+            can.Message(is_error_frame=True, is_rx=False),
+        ]
+        frames = can.FrameArray.from_messages(messages)
+        self.assertEqual(len(frames), len(messages))
+        self.assertMessagesEqual(frames.to_messages(), messages)
+
+    def test_columns(self):
+        frames = can.FrameArray.from_messages(_messages())
+        self.assertEqual(frames.timestamp.dtype, np.float64)
+        self.assertEqual(frames.arbitration_id.dtype, np.uint32)
+        self.assertEqual(frames.dlc.dtype, np.uint8)
+        self.assertEqual(frames.flags.dtype, np.uint8)
+        self.assertEqual(frames.data.shape, (20, 64))
+        self.assertEqual(frames.channels, ["can1", "can0"])
+        self.assertEqual(frames.dlc[8], 8)
+        self.assertEqual(list(frames.data[8, :10]), [0, 1, 2, 3, 4, 5, 6, 7, 0, 0])
+        self.assertTrue(frames.is_extended_id[1])
+        self.assertFalse(frames.is_extended_id[2])
+
+    def test_growth(self):
+        frames = can.FrameArray(capacity=1)
+        for _ in range(100):
+            frames.append(generate_message(0x42))
+        self.assertEqual(len(frames), 100)
+        self.assertGreaterEqual(frames.capacity, 100)
+        self.assertTrue(np.all(frames.arbitration_id == 0x42))
+
+    def test_append_frame(self):
+        frames = can.FrameArray()
+        frames.append_frame(1.5, 0x123, 3, FrameFlags.RX, b"\x01\x02\x03", "vcan0")
+        self.assertMessageEqual(
+            frames[0],
+            can.Message(
+                timestamp=1.5,
+                arbitration_id=0x123,
+                is_extended_id=False,
+                data=b"\x01\x02\x03",
+                channel="vcan0",
+            ),
+        )
+
+    def test_message_flags(self):
+        msg = can.Message(is_fd=True, bitrate_switch=True, is_rx=False)
+        self.assertEqual(
+            message_flags(msg),
+            FrameFlags.EXTENDED_ID | FrameFlags.FD | FrameFlags.BITRATE_SWITCH,
+        )
+
+    def test_indexing(self):
+        messages = _messages()
+        frames = can.FrameArray.from_messages(messages)
+        self.assertMessageEqual(frames[-1], messages[-1])
+        with self.assertRaises(IndexError):
+            frames[20]
+        self.assertMessagesEqual(frames[2:5].to_messages(), messages[2:5])
+        self.assertMessagesEqual(
+            frames[[3, 1]].to_messages(), [messages[3], messages[1]]
+        )
+        with self.assertRaises(IndexError):
+            frames[np.ones(3, dtype=bool)]
+
+    def test_select_ids(self):
+        messages = _messages()
+        frames = can.FrameArray.from_messages(messages)
+        selected = frames.select_ids([0x101, 0x103])
+        self.assertMessagesEqual(
+            selected.to_messages(),
+            [msg for msg in messages if msg.arbitration_id in (0x101, 0x103)],
+        )
+        self.assertEqual(len(frames.select_ids([0x101], is_extended_id=False)), 0)
+
+    def test_select_time(self):
+        messages = _messages()
+        frames = can.FrameArray.from_messages(messages)
+        selected = frames.select_time(1.0, 3.0)
+        self.assertMessagesEqual(selected.to_messages(), messages[2:6])
+        self.assertEqual(len(frames.select_time(start=9.0)), 2)
+        self.assertEqual(len(frames.select_time(stop=0.0)), 0)
+
+    def test_concatenate(self):
+        first = can.FrameArray.from_messages(
+            [can.Message(arbitration_id=1, channel="a")]
+        )
+        second = can.FrameArray.from_messages(
+            [
+                can.Message(arbitration_id=2, channel="b"),
+                can.Message(arbitration_id=3, channel="a"),
+            ]
+        )
+        joined = can.FrameArray.concatenate([first, second, can.FrameArray()])
+        self.assertEqual(list(joined.arbitration_id), [1, 2, 3])
+        self.assertEqual([msg.channel for msg in joined], ["a", "b", "a"])
+
+    def test_from_columns(self):
+        frames = can.FrameArray.from_columns(
+            timestamp=[0.0, 1.0],
+            arbitration_id=[0x10, 0x20],
+            dlc=[2, 1],
+            flags=[FrameFlags.RX, FrameFlags.RX | FrameFlags.EXTENDED_ID],
+            data=[[1, 2], [3, 0]],
+            channels=["can0"],
+        )
+        self.assertMessagesEqual(
+            frames.to_messages(),
+            [
+                can.Message(
+                    timestamp=0.0,
+                    arbitration_id=0x10,
+                    is_extended_id=False,
+                    data=[1, 2],
+                    channel="can0",
+                ),
+                can.Message(
+                    timestamp=1.0, arbitration_id=0x20, data=[3], channel="can0"
+                ),
+            ],
+        )
+
+    def test_buffered_reader(self):
+        reader = can.BufferedReader()
+        messages = _messages()
+        for msg in messages:
+            reader(msg)
+        self.assertMessagesEqual(
+            reader.get_frame_array(max_count=5).to_messages(), messages[:5]
+        )
+        self.assertMessagesEqual(reader.get_frame_array().to_messages(), messages[5:])
+        self.assertEqual(len(reader.get_frame_array()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
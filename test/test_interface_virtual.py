@@ -34,6 +34,54 @@ class TestMessageFiltering(unittest.TestCase):
         assert r.arbitration_id == EXAMPLE_MSG1.arbitration_id
         assert r.data == EXAMPLE_MSG1.data
 
+    def test_recv_batch(self):
+        for i in range(5):
+            self.node1.send(Message(arbitration_id=i))
+        msgs = self.node2.recv_batch(max_messages=3, timeout=0.1)
+        assert [msg.arbitration_id for msg in msgs] == [0, 1, 2]
+        msgs = self.node2.recv_batch(max_messages=10, timeout=0.1)
+        assert [msg.arbitration_id for msg in msgs] == [3, 4]
+
+    def test_recv_batch_timeout(self):
+        assert self.node2.recv_batch(timeout=0.01) == []
+
+    def test_recv_batch_filtered(self):
+        self.node2.set_filters([{"can_id": 0x2, "can_mask": 0x7FF}])
+        for i in range(5):
+            self.node1.send(Message(arbitration_id=i))
+        msgs = self.node2.recv_batch(timeout=0.1)
+        assert [msg.arbitration_id for msg in msgs] == [2]
+
+    def test_recv_batch_invalid_max_messages(self):
+        with self.assertRaises(ValueError):
+            self.node2.recv_batch(max_messages=0)
+
+    def test_send_batch(self):
+        msgs = [Message(arbitration_id=i) for i in range(5)]
+        assert self.node1.send_batch(msgs) == 5
+        received = self.node2.recv_batch(timeout=0.1)
+        assert [msg.arbitration_id for msg in received] == [0, 1, 2, 3, 4]
+        assert all(msg.is_rx for msg in received)
+
+    def test_send_batch_empty(self):
+        assert self.node1.send_batch([]) == 0
+
+    def test_send_batch_bounded_queue(self):
+        with Bus("test", interface="virtual", rx_queue_size=3) as node3:
+            msgs = [Message(arbitration_id=i) for i in range(5)]
+            assert self.node1.send_batch(msgs, timeout=0.01) == 3
+            received = node3.recv_batch(timeout=0.1)
+            assert [msg.arbitration_id for msg in received] == [0, 1, 2]
+            # the other recipients only got what every recipient got
+            received = self.node2.recv_batch(timeout=0.1)
+            assert [msg.arbitration_id for msg in received] == [0, 1, 2]
+
+            # retrying with the remaining messages delivers no duplicates
+            assert self.node1.send_batch(msgs[3:], timeout=0.01) == 2
+            for node in (self.node2, node3):
+                received = node.recv_batch(timeout=0.1)
+                assert [msg.arbitration_id for msg in received] == [3, 4]
+
 
 if __name__ == "__main__":
     unittest.main()
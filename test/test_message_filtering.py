@@ -6,6 +6,9 @@ This module tests :meth:`can.BusABC._matches_filters`.
 
 import unittest
 
+import hypothesis.strategies as st
+from hypothesis import given, settings
+
 from can import Bus, Message
 
 from .data.example_data import TEST_ALL_MESSAGES
@@ -17,6 +20,35 @@ MATCH_EXAMPLE = [{"can_id": 0x123, "can_mask": 0x1FFFFFFF, "extended": True}]
 
 MATCH_ONLY_HIGHEST = [{"can_id": 0xFFFFFFFF, "can_mask": 0x1FFFFFFF, "extended": True}]
 
+MATCH_STANDARD_IDS = [
+    {"can_id": can_id, "can_mask": 0x7FF, "extended": False}
+    for can_id in range(0x100, 0x200)
+]
+
+
+def _reference_matches(filters, msg):
+    """The straightforward implementation of the filter semantics."""
+    for _filter in filters:
+        if "extended" in _filter and _filter["extended"] != msg.is_extended_id:
+            continue
+        if (_filter["can_id"] ^ msg.arbitration_id) & _filter["can_mask"] == 0:
+            return True
+    return False
+
+
+_FILTER_STRATEGY = st.lists(
+    st.fixed_dictionaries(
+        {
+            "can_id": st.integers(min_value=0, max_value=0x1FFFFFFF),
+            "can_mask": st.sampled_from([0x0, 0x7F0, 0x7FF, 0x1FFFFF00, 0x1FFFFFFF])
+            | st.integers(min_value=0, max_value=0x1FFFFFFF),
+        },
+        optional={"extended": st.booleans()},
+    ),
+    min_size=1,
+    max_size=10,
+)
+
 
 class TestMessageFiltering(unittest.TestCase):
     def setUp(self):
@@ -46,6 +78,66 @@ class TestMessageFiltering(unittest.TestCase):
         self.assertFalse(self.bus._matches_filters(EXAMPLE_MSG))
         self.assertTrue(self.bus._matches_filters(HIGHEST_MSG))
 
+    def test_match_many_standard_ids(self):
+        self.bus.set_filters(MATCH_STANDARD_IDS)
+        for can_id, expected in ((0x100, True), (0x1FF, True), (0x200, False)):
+            msg = Message(arbitration_id=can_id, is_extended_id=False)
+            self.assertEqual(self.bus._matches_filters(msg), expected)
+        self.assertFalse(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x100, is_extended_id=True)
+            )
+        )
+
+    def test_match_without_extended_key(self):
+        # a filter without "extended" applies to both kinds of identifiers
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF}])
+        self.assertTrue(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x123, is_extended_id=False)
+            )
+        )
+        self.assertTrue(self.bus._matches_filters(EXAMPLE_MSG))
+        self.assertTrue(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x1000123, is_extended_id=True)
+            )
+        )
+
+    def test_filter_stats(self):
+        self.bus.filter_stats.reset()
+        self.bus.set_filters(None)
+        self.bus._matches_filters(EXAMPLE_MSG)
+        self.assertEqual(self.bus.filter_stats.accepted, 0)
+
+        self.bus.set_filters(MATCH_EXAMPLE)
+        self.bus._matches_filters(EXAMPLE_MSG)
+        self.bus._matches_filters(HIGHEST_MSG)
+        self.bus._matches_filters(HIGHEST_MSG)
+        self.assertEqual(self.bus.filter_stats.accepted, 1)
+        self.assertEqual(self.bus.filter_stats.rejected, 2)
+        self.bus.filter_stats.reset()
+        self.assertEqual(self.bus.filter_stats.accepted, 0)
+        self.assertEqual(self.bus.filter_stats.rejected, 0)
+
+    @settings(max_examples=200, deadline=None)
+    @given(
+        filters=_FILTER_STRATEGY,
+        arbitration_id=st.integers(min_value=0, max_value=0x1FFFFFFF),
+        is_extended_id=st.booleans(),
+    )
+    def test_same_as_reference(self, filters, arbitration_id, is_extended_id):
+        msg = Message(arbitration_id=arbitration_id, is_extended_id=is_extended_id)
+        self.bus.set_filters(filters)
+        self.assertEqual(
+            self.bus._matches_filters(msg), _reference_matches(filters, msg)
+        )
+        # also check the identifier of a filter, which is likely to match
+        msg.arbitration_id = filters[0]["can_id"]
+        self.assertEqual(
+            self.bus._matches_filters(msg), _reference_matches(filters, msg)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
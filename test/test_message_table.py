@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.MessageTable`.
+"""
+
+import unittest
+
+import can
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MessageTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = can.MessageTable()
+
+    def _receive(self, timestamp, arbitration_id, data, channel="can0"):
+        self.table(
+            can.Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                data=data,
+                channel=channel,
+            )
+        )
+
+    def test_statistics(self):
+        for timestamp in (1.0, 1.1, 1.3, 1.4):
+            self._receive(timestamp, 0x100, b"\x01")
+        self._receive(1.0, 0x200, b"\x02")
+
+        self.assertEqual(len(self.table), 2)
+        entry = self.table.get(0x100, channel="can0")
+        self.assertEqual(entry.count, 4)
+        self.assertEqual(entry.message.timestamp, 1.4)
+        self.assertAlmostEqual(entry.period, 0.1)
+        self.assertAlmostEqual(entry.min_period, 0.1)
+        self.assertAlmostEqual(entry.max_period, 0.2)
+        self.assertAlmostEqual(entry.mean_period, 0.4 / 3)
+
+        entry = self.table["can0", 0x200]
+        self.assertEqual(entry.count, 1)
+        self.assertIsNone(entry.period)
+        self.assertIsNone(entry.mean_period)
+
+    def test_channels(self):
+        self._receive(1.0, 0x100, b"\x01", channel="can0")
+        self._receive(1.0, 0x100, b"\x02", channel="can1")
+        self.assertEqual(list(self.table), [("can0", 0x100), ("can1", 0x100)])
+        self.assertIn(("can1", 0x100), self.table)
+        self.assertEqual(self.table.get(0x100, channel="can1").message.data, b"\x02")
+        self.assertIsNone(self.table.get(0x100))
+        with self.assertRaises(KeyError):
+            self.table[None, 0x100]
+
+    def test_changed_mask(self):
+        self.assertIsNone(self.table.changed_mask(0x100))
+        self._receive(1.0, 0x100, b"\x01\x02", channel=None)
+        # everything is new at first
+        self.assertEqual(self.table.changed_mask(0x100), b"\xff\xff")
+        self.assertEqual(self.table.changed_mask(0x100), b"\x00\x00")
+
+        self._receive(1.1, 0x100, b"\x01\x03", channel=None)
+        self._receive(1.2, 0x100, b"\x11\x03", channel=None)
+        self.assertEqual(self.table.changed_mask(0x100), b"\x10\x01")
+
+        # bytes appended to the payload count as changed
+        self._receive(1.3, 0x100, b"\x11\x03\x00", channel=None)
+        self.assertEqual(self.table.changed_mask(0x100), b"\x00\x00\xff")
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_snapshot(self):
+        self._receive(1.0, 0x100, b"\x01")
+        self._receive(1.5, 0x100, b"\x03")
+        self._receive(2.0, 0x200, b"\x02\x02")
+
+        snapshot = self.table.snapshot()
+        self.assertEqual(len(snapshot.frames), 2)
+        np.testing.assert_array_equal(snapshot.frames.arbitration_id, [0x100, 0x200])
+        np.testing.assert_array_equal(snapshot.frames.timestamp, [1.5, 2.0])
+        np.testing.assert_array_equal(snapshot.counts, [2, 1])
+        np.testing.assert_array_equal(snapshot.period, [0.5, np.nan])
+        np.testing.assert_array_equal(snapshot.mean_period, [0.5, np.nan])
+        np.testing.assert_array_equal(
+            snapshot.frames.data[:, :3], [[3, 0, 0], [2, 2, 0]]
+        )
+        np.testing.assert_array_equal(
+            snapshot.changed[:, :3], [[255, 0, 0], [255, 255, 0]]
+        )
+
+        # the snapshot counts as a read
+        self.assertFalse(self.table.snapshot().changed.any())
+        self.assertEqual(self.table.changed_mask(0x100, channel="can0"), b"\x00")
+
+    def test_clear(self):
+        self._receive(1.0, 0x100, b"\x01")
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.RingBufferListener`.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+import can
+from can.ring_buffer import trigger_on_error_frame, trigger_on_id
+
+from .data.example_data import TEST_MESSAGES_CAN_FD
+from .message_helper import ComparingMessagesTestCase
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _messages(count=20):
+    return [
+        can.Message(
+            timestamp=0.25 * index,
+            arbitration_id=index,
+            is_extended_id=bool(index % 2),
+            data=bytes(range(index % 9)),
+            channel="can0" if index % 3 else "can1",
+        )
+        for index in range(count)
+    ]
+
+
+class CollectingWriter(can.Listener):
+    def __init__(self):
+        self.messages = []
+        self.stopped = False
+
+    def on_message_received(self, msg):
+        self.messages.append(msg)
+
+    def stop(self):
+        self.stopped = True
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class RingBufferListenerTest(unittest.TestCase, ComparingMessagesTestCase):
+    def __init__(self, *args, **kwargs):
+        unittest.TestCase.__init__(self, *args, **kwargs)
+        ComparingMessagesTestCase.__init__(self)
+
+    def setUp(self):
+        self.writers = []
+
+    def _create_writer(self, index):
+        self.assertEqual(index, len(self.writers))
+        writer = CollectingWriter()
+        self.writers.append(writer)
+        return writer
+
+    def test_snapshot(self):
+        messages = _messages() + TEST_MESSAGES_CAN_FD
+        recorder = can.RingBufferListener(self._create_writer, capacity=8)
+        for count, msg in enumerate(messages, start=1):
+            recorder(msg)
+            self.assertEqual(len(recorder), min(count, 8))
+            # the oldest frames are overwritten
+            self.assertMessagesEqual(
+                recorder.snapshot().to_messages(), messages[max(count - 8, 0) : count]
+            )
+        recorder.stop()
+        self.assertEqual(self.writers, [])
+
+    def test_trigger(self):
+        messages = _messages()
+        recorder = can.RingBufferListener(
+            self._create_writer,
+            capacity=5,
+            triggers=[trigger_on_id(10)],
+            post_trigger=1.0,
+        )
+        for msg in messages:
+            recorder(msg)
+        recorder.stop()
+
+        self.assertEqual(len(self.writers), 1)
+        self.assertTrue(self.writers[0].stopped)
+        # the recorded frames up to the trigger and the following second
+        self.assertMessagesEqual(self.writers[0].messages, messages[6:15])
+
+    def test_trigger_without_post_trigger(self):
+        messages = _messages()
+        recorder = can.RingBufferListener(
+            self._create_writer, triggers=[trigger_on_id(3), trigger_on_id(7)]
+        )
+        for msg in messages:
+            recorder(msg)
+        recorder.stop()
+
+        self.assertEqual(len(self.writers), 2)
+        self.assertMessagesEqual(self.writers[0].messages, messages[:4])
+        self.assertMessagesEqual(self.writers[1].messages, messages[:8])
+
+    def test_duration(self):
+        messages = _messages()
+        recorder = can.RingBufferListener(self._create_writer, duration=1.0)
+        for msg in messages:
+            recorder(msg)
+        recorder.trigger()
+        recorder.stop()
+        # the frames at and after 4.75 - 1.0 seconds
+        self.assertMessagesEqual(self.writers[0].messages, messages[-5:])
+
+    def test_pending_dump_is_completed_by_stop(self):
+        messages = _messages()
+        recorder = can.RingBufferListener(self._create_writer, post_trigger=100.0)
+        recorder.trigger(0.0)
+        for msg in messages:
+            recorder(msg)
+        recorder.stop()
+        self.assertMessagesEqual(self.writers[0].messages, messages)
+
+    def test_frames_are_copied_by_dump_thread(self):
+        messages = _messages()
+        release = threading.Event()
+
+        def create_writer(index):
+            if index == 0:
+                # keep the dump thread busy with the first dump
+                self.assertTrue(release.wait(5))
+            return self._create_writer(index)
+
+        recorder = can.RingBufferListener(
+            create_writer, capacity=8, triggers=[trigger_on_id(3), trigger_on_id(7)]
+        )
+        for msg in messages:
+            recorder(msg)
+        # the frames received while the second dump waits for its copy
+        # are not lost
+        self.assertMessagesEqual(recorder.snapshot().to_messages(), messages[-8:])
+        release.set()
+        recorder.stop()
+
+        self.assertEqual(len(self.writers), 2)
+        self.assertMessagesEqual(self.writers[0].messages, messages[:4])
+        self.assertMessagesEqual(self.writers[1].messages, messages[:8])
+        self.assertMessagesEqual(recorder.snapshot().to_messages(), messages[-8:])
+
+    def test_dump_to_file(self):
+        messages = _messages()
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = can.RingBufferListener(
+                os.path.join(directory, "dump-{index}.csv"),
+                triggers=[trigger_on_error_frame],
+            )
+            for msg in messages:
+                recorder(msg)
+            recorder(can.Message(timestamp=10.0, is_error_frame=True))
+            recorder.trigger()
+            recorder.stop()
+
+            for index in range(2):
+                with can.CSVReader(
+                    os.path.join(directory, f"dump-{index}.csv")
+                ) as reader:
+                    read_messages = list(reader)
+                self.assertEqual(len(read_messages), len(messages) + 1)
+                self.assertTrue(read_messages[-1].is_error_frame)
+
+    def test_trigger_on_id(self):
+        trigger = trigger_on_id(0x100, b"\x01\xf0", b"\xff\xf0", is_extended_id=False)
+        self.assertTrue(
+            trigger(
+                can.Message(
+                    arbitration_id=0x100, data=b"\x01\xf5\x00", is_extended_id=False
+                )
+            )
+        )
+        self.assertFalse(
+            trigger(
+                can.Message(
+                    arbitration_id=0x100, data=b"\x02\xf5", is_extended_id=False
+                )
+            )
+        )
+        self.assertFalse(
+            trigger(
+                can.Message(arbitration_id=0x100, data=b"\x01", is_extended_id=False)
+            )
+        )
+        self.assertFalse(
+            trigger(
+                can.Message(arbitration_id=0x100, data=b"\x01\xf5", is_extended_id=True)
+            )
+        )
+        self.assertFalse(
+            trigger(
+                can.Message(
+                    arbitration_id=0x101, data=b"\x01\xf5", is_extended_id=False
+                )
+            )
+        )
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            can.RingBufferListener(self._create_writer, capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ Test functions in `can.interfaces.socketcan.socketcan`.
 """
 
 import ctypes
+import socket
 import struct
 import sys
 import unittest
@@ -13,19 +14,34 @@ from unittest.mock import patch
 
 import can
 from can.interfaces.socketcan.constants import (
+    CAN_BCM_RX_CHANGED,
+    CAN_BCM_RX_DELETE,
+    CAN_BCM_RX_SETUP,
+    CAN_BCM_RX_TIMEOUT,
     CAN_BCM_TX_DELETE,
     CAN_BCM_TX_SETUP,
+    CAN_FD_FRAME,
+    RX_FILTER_ID,
     SETTIMER,
+    SO_TIMESTAMPNS,
     STARTTIMER,
     TX_COUNTEVT,
 )
 from can.interfaces.socketcan.socketcan import (
     BcmMsgHead,
+    CyclicSendTask,
+    MultiMessageReceiver,
+    SocketcanBus,
     bcm_header_factory,
     build_bcm_header,
+    build_bcm_rx_delete_header,
+    build_bcm_rx_setup_header,
     build_bcm_transmit_header,
     build_bcm_tx_delete_header,
     build_bcm_update_header,
+    build_can_frame,
+    capture_bcm_message,
+    send_frames,
 )
 
 from .config import IS_LINUX, IS_PYPY, TEST_INTERFACE_SOCKETCAN
@@ -362,6 +378,165 @@ class SocketCANTest(unittest.TestCase):
         self.assertEqual(can_id, result.can_id)
         self.assertEqual(1, result.nframes)
 
+    def test_build_bcm_rx_setup_header_filter_id(self):
+        can_id = 0x401
+        bcm_buffer = build_bcm_rx_setup_header(
+            can_id=can_id, throttle=1.5, msg_flags=CAN_FD_FRAME, nframes=0
+        )
+        result = BcmMsgHead.from_buffer_copy(bcm_buffer)
+
+        self.assertEqual(CAN_BCM_RX_SETUP, result.opcode)
+        # without a mask frame, every frame passes, but only every 1.5 seconds
+        self.assertEqual(CAN_FD_FRAME | RX_FILTER_ID | SETTIMER, result.flags)
+        self.assertEqual(0, result.count)
+        self.assertEqual(0, result.ival1_tv_sec)
+        self.assertEqual(0, result.ival1_tv_usec)
+        self.assertEqual(1, result.ival2_tv_sec)
+        self.assertEqual(500000, result.ival2_tv_usec)
+        self.assertEqual(can_id, result.can_id)
+        self.assertEqual(0, result.nframes)
+
+    def test_build_bcm_rx_setup_header_mask(self):
+        can_id = 0x401
+        flags = 0
+        bcm_buffer = build_bcm_rx_setup_header(
+            can_id=can_id, throttle=0, msg_flags=flags
+        )
+        result = BcmMsgHead.from_buffer_copy(bcm_buffer)
+
+        self.assertEqual(CAN_BCM_RX_SETUP, result.opcode)
+        self.assertEqual(flags, result.flags)
+        self.assertEqual(0, result.ival2_tv_sec)
+        self.assertEqual(0, result.ival2_tv_usec)
+        self.assertEqual(can_id, result.can_id)
+        self.assertEqual(1, result.nframes)
+
+    def test_build_bcm_rx_delete_header(self):
+        can_id = 0x401
+        flags = 0
+        bcm_buffer = build_bcm_rx_delete_header(can_id=can_id, flags=flags)
+        result = BcmMsgHead.from_buffer_copy(bcm_buffer)
+
+        self.assertEqual(CAN_BCM_RX_DELETE, result.opcode)
+        self.assertEqual(flags, result.flags)
+        self.assertEqual(can_id, result.can_id)
+        self.assertEqual(0, result.nframes)
+
+    @unittest.skipUnless(IS_LINUX, "Only run on Linux")
+    def test_capture_bcm_message(self):
+        frame = build_can_frame(
+            can.Message(arbitration_id=0x123, is_extended_id=False, data=[1, 2])
+        )
+        timeout = build_bcm_header(CAN_BCM_RX_TIMEOUT, 0, 0, 0, 0, 0, 0, 0x123, 0)
+        changed = build_bcm_header(CAN_BCM_RX_CHANGED, 0, 0, 0, 0, 0, 0, 0x123, 1)
+
+        # any datagram socket will do for checking the parsing of notifications
+        sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with sender, receiver:
+            receiver.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+            sender.send(timeout)
+            sender.send(changed + frame)
+
+            # notifications without a frame are skipped
+            self.assertIsNone(capture_bcm_message(receiver))
+            msg = capture_bcm_message(receiver)
+            self.assertEqual(msg.arbitration_id, 0x123)
+            self.assertFalse(msg.is_extended_id)
+            self.assertEqual(msg.data, bytearray([1, 2]))
+            self.assertGreater(msg.timestamp, 0)
+            self.assertIsNone(capture_bcm_message(receiver, nonblocking=True))
+
+    @unittest.skipUnless(IS_LINUX, "recvmmsg() is only available on Linux")
+    def test_multi_message_receiver(self):
+        messages = [
+            can.Message(arbitration_id=0x123, is_extended_id=False, data=[1, 2, 3]),
+            can.Message(arbitration_id=0x1FFFFFFF, is_extended_id=True),
+            can.Message(
+                arbitration_id=0x7FF, is_extended_id=False, is_remote_frame=True, dlc=4
+            ),
+            can.Message(
+                arbitration_id=0x100,
+                is_extended_id=False,
+                is_fd=True,
+                bitrate_switch=True,
+                data=range(64),
+            ),
+        ]
+
+        # any datagram socket will do for checking the decoding of the frames
+        sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with sender, receiver:
+            receiver.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+            multi_receiver = MultiMessageReceiver(receiver)
+            self.assertEqual(multi_receiver.receive(10), [])
+
+            for msg in messages:
+                sender.send(build_can_frame(msg))
+            # the buffers are reused and grow on demand
+            received = multi_receiver.receive(1) + multi_receiver.receive(10)
+            self.assertEqual(multi_receiver.receive(10), [])
+
+        self.assertEqual(len(received), len(messages))
+        for msg, received_msg in zip(messages, received, strict=True):
+            self.assertTrue(
+                msg.equals(received_msg, timestamp_delta=None, check_channel=False),
+                f"{msg} != {received_msg}",
+            )
+            self.assertGreater(received_msg.timestamp, 0)
+
+    @unittest.skipUnless(IS_LINUX, "recvmmsg() is only available on Linux")
+    def test_multi_message_receiver_unavailable(self):
+        with patch("can.interfaces.socketcan.socketcan._recvmmsg", None):
+            with self.assertRaises(NotImplementedError):
+                MultiMessageReceiver(socket.socket())
+
+    @unittest.skipUnless(IS_LINUX, "sendmmsg() is only available on Linux")
+    def test_send_frames(self):
+        messages = [
+            can.Message(arbitration_id=0x123, data=[1, 2, 3]),
+            can.Message(arbitration_id=0x1FFFFFFF, is_extended_id=True),
+            can.Message(arbitration_id=0x7FF, is_fd=True, data=range(64)),
+        ]
+        frames = [build_can_frame(msg) for msg in messages]
+
+        # any datagram socket will do for checking that every frame is sent on its own
+        sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with sender, receiver:
+            self.assertEqual(send_frames(sender, frames), len(frames))
+            for frame in frames:
+                self.assertEqual(receiver.recv(128), frame)
+            self.assertEqual(send_frames(sender, []), 0)
+
+    def test_cyclic_send_task_has_no_timing_stats(self):
+        # the kernel does not report the individual transmissions
+        task = CyclicSendTask(
+            socket.socket(), 1, can.Message(arbitration_id=0x123), 0.1, autostart=False
+        )
+        task.bcm_socket.close()
+        self.assertIsNone(task.timing_stats)
+
+    @unittest.skipUnless(IS_LINUX, "Only run on Linux")
+    def test_wait_for_socket_alternates(self):
+        bus = SocketcanBus.__new__(SocketcanBus)
+        raw_sender, bus.socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        bcm_sender, bus._bcm_rx_socket = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM
+        )
+        bus._last_ready_socket = None
+        try:
+            self.assertIsNone(bus._wait_for_socket(0))
+            raw_sender.send(b"raw")
+            self.assertIs(bus._wait_for_socket(0), bus.socket)
+            # both sockets stay readable, but neither one is served twice
+            bcm_sender.send(b"bcm")
+            ready = [bus._wait_for_socket(0) for _ in range(4)]
+            self.assertEqual(
+                ready, [bus._bcm_rx_socket, bus.socket, bus._bcm_rx_socket, bus.socket]
+            )
+        finally:
+            for sock in (raw_sender, bus.socket, bcm_sender, bus._bcm_rx_socket):
+                sock.close()
+
     @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
     def test_bus_creation_can(self):
         bus = can.Bus(interface="socketcan", channel="vcan0", fd=False)
@@ -372,6 +547,78 @@ class SocketCANTest(unittest.TestCase):
         bus = can.Bus(interface="socketcan", channel="vcan0", fd=True)
         self.assertEqual(bus.protocol, can.CanProtocol.CAN_FD)
 
+    @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+    def test_receive_many(self):
+        messages = [
+            can.Message(arbitration_id=index, is_extended_id=False, data=[index])
+            for index in range(20)
+        ]
+        for recvmmsg in (True, False):
+            with (
+                self.subTest(recvmmsg=recvmmsg),
+                patch.object(
+                    can.interfaces.socketcan.socketcan,
+                    "_recvmmsg",
+                    can.interfaces.socketcan.socketcan._recvmmsg if recvmmsg else None,
+                ),
+                can.Bus(interface="socketcan", channel="vcan0") as sender,
+                can.Bus(
+                    interface="socketcan", channel="vcan0", rx_batch_size=8
+                ) as receiver,
+            ):
+                self.assertEqual(receiver._receiver is not None, recvmmsg)
+                for msg in messages:
+                    sender.send(msg)
+
+                received = [receiver.recv(timeout=1.0) for _ in range(5)]
+                received += receiver.recv_batch(10, timeout=1.0)
+                while len(received) < len(messages):
+                    received += receiver.recv_batch(100, timeout=1.0)
+
+                self.assertEqual(
+                    [msg.arbitration_id for msg in received], list(range(20))
+                )
+                self.assertEqual([msg.data[0] for msg in received], list(range(20)))
+                self.assertTrue(all(msg.channel == "vcan0" for msg in received))
+                self.assertIsNone(receiver.recv(timeout=0.1))
+
+    @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+    def test_subscribe_changes(self):
+        with (
+            can.Bus(interface="socketcan", channel="vcan0") as sender,
+            can.Bus(
+                interface="socketcan",
+                channel="vcan0",
+                can_filters=[{"can_id": 0x7FF, "can_mask": 0x7FF, "extended": False}],
+            ) as receiver,
+        ):
+            receiver.subscribe_changes(0x123, data_mask=b"\x0f")
+            for data in (b"\x01", b"\x11", b"\x12", b"\x12\x00"):
+                sender.send(
+                    can.Message(arbitration_id=0x123, is_extended_id=False, data=data)
+                )
+
+            # the first frame, the change of the masked bits and of the length
+            received = receiver.recv_batch(10, timeout=1.0)
+            while (msg := receiver.recv(timeout=0.1)) is not None:
+                received.append(msg)
+            self.assertEqual(
+                [msg.data for msg in received], [b"\x01", b"\x12", b"\x12\x00"]
+            )
+            self.assertTrue(all(msg.channel == "vcan0" for msg in received))
+
+            receiver.unsubscribe_changes(0x123)
+            sender.send(can.Message(arbitration_id=0x123, is_extended_id=False))
+            self.assertIsNone(receiver.recv(timeout=0.1))
+            with self.assertRaises(ValueError):
+                receiver.unsubscribe_changes(0x123)
+
+            # classical and CAN FD frames are subscribed separately
+            receiver.subscribe_changes(0x123)
+            with self.assertRaises(ValueError):
+                receiver.unsubscribe_changes(0x123, is_fd=True)
+            receiver.unsubscribe_changes(0x123)
+
     @unittest.skipUnless(IS_LINUX and IS_PYPY, "Only test when run on Linux with PyPy")
     def test_pypy_socketcan_support(self):
         """Wait for PyPy raw CAN socket support